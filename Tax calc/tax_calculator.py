@@ -1,41 +1,80 @@
-import tkinter as tk
-import ttkbootstrap as ttk
-from ttkbootstrap.constants import *
-from tkinter import messagebox
+from taxlib.startup import timer as startup_timer
+
+with startup_timer.phase("tkinter + ttkbootstrap", kind="import"):
+    import tkinter as tk
+    import ttkbootstrap as ttk
+    from ttkbootstrap.constants import *
+    from tkinter import messagebox
+    from tkinter import filedialog
 import math
-import time
+import os
+import sys
 from datetime import datetime
-import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import matplotlib.animation as animation
-from tkinter import filedialog
-
-# Export helpers
-try:
-    from taxlib.export import export_report_pdf, export_report_excel
-except Exception:
-    # If import fails during development/test, define placeholders to avoid runtime error
-    def export_report_pdf(results, path):
-        raise RuntimeError("report export not available")
-    def export_report_excel(results, path):
-        raise RuntimeError("export not available")
+from statistics import NormalDist
 
 # Import business logic from taxlib module
-from taxlib import (
-    calculate_individual_tax,
-    calculate_corporate_tax,
-    validate_pan,
-    get_pan_entity_type,
-    save_pan_data_db,
-    get_pan_data_db
-)
-from taxlib import config as app_config
-from taxlib import i18n
+with startup_timer.phase("taxlib", kind="import"):
+    from taxlib import (
+        calculate_pan_results,
+        compare_regimes,
+        validate_pan,
+        get_pan_entity_type,
+        save_pan_data_db,
+        get_pan_data_db
+    )
+    from taxlib import config as app_config
+    from taxlib import i18n
+    from taxlib.jobs import JobManager, JobCancelled, DONE, FAILED
+    from taxlib.dashboard import DashboardManager
+    from taxlib.frames import FrameClock, linear
+    from taxlib.live import LiveCalculator
+    from taxlib.rates import rate_table
+    from taxlib.deductions import allowed_deductions, savings_headroom
+    from taxlib.loans import loan_inputs
+    from taxlib import instrument, profiling
+
+# Heavy modules are imported on first use (see _load_charting / _load_export)
+# so the input form appears without waiting for numpy, matplotlib, reportlab
+# and openpyxl to load.
+Figure = None
+FigureCanvasTkAgg = None
+charts = None
+_export = None
+
+
+def _load_charting():
+    """Import matplotlib (TkAgg) and the dashboard charts the first time a dashboard opens."""
+    global Figure, FigureCanvasTkAgg, charts
+    if FigureCanvasTkAgg is None:
+        with startup_timer.phase("load charting"):
+            Figure = startup_timer.import_module("matplotlib.figure").Figure
+            FigureCanvasTkAgg = startup_timer.import_module("matplotlib.backends.backend_tkagg").FigureCanvasTkAgg
+            charts = startup_timer.import_module("taxlib.charts")
+
+
+def _load_export():
+    """Import the report exporters (reportlab, openpyxl) on first export."""
+    global _export
+    if _export is None:
+        with startup_timer.phase("load export"):
+            _export = startup_timer.import_module("taxlib.export")
+    return _export
+
+
+def _clear_render_cache():
+    """Drop cached export renders (nothing is cached before the first export)."""
+    if _export is not None:
+        _export.render_cache.clear()
 
 # ------------------- SMOOTH ANIMATION SYSTEM -------------------
-class SmoothAnimator:
-    def __init__(self):
+class SmoothAnimator(FrameClock):
+    """The app's single frame clock (see taxlib.frames.FrameClock).
+
+    Number tweens, slide-ins and dashboard charts all advance from one
+    ``after`` loop that only runs while something is animating.
+    """
+    def __init__(self, fps=60):
+        super().__init__(lambda ms, callback: app.after(ms, callback), fps=fps)
         self.animation_queue = []
     
     def add_step(self, callback, delay=0):
@@ -51,24 +90,13 @@ def animate_number(widget, target, duration=800, prefix="₹"):
     current_text = widget.cget("text")
     start = float(current_text.replace(prefix, "").replace(",", "") or 0)
     
-    steps = 40
-    step_time = max(10, duration // steps)
-    
-    def ease_out_quad(t):
-        return t * (2 - t)
-    
-    def update(step):
-        progress = step / steps
-        eased = ease_out_quad(progress)
+    def update(eased):
         current_val = start + (target - start) * eased
         widget.config(text=f"{prefix}{int(current_val):,}")
-        
-        if step < steps:
-            widget.after(step_time, lambda: update(step + 1))
-        else:
-            widget.config(text=f"{prefix}{int(target):,}")
     
-    update(0)
+    # Keyed by widget: a new value replaces a tween still running on the label
+    animator.tween(duration, update, key=("number", str(widget)),
+                   on_done=lambda: widget.config(text=f"{prefix}{int(target):,}"))
 
 def slide_in(widget, duration=400):
     """Smooth slide-in animation for frames"""
@@ -76,37 +104,42 @@ def slide_in(widget, duration=400):
     widget.place(x=1000, y=original_info.get('y', 0))
     widget.update()
     
-    steps = 20
-    step_time = duration // steps
     target_x = int(original_info.get('x', 0))
     
-    def animate(step):
-        progress = step / steps
-        current_x = 1000 + (target_x - 1000) * progress
-        widget.place(x=int(current_x))
-        
-        if step < steps:
-            widget.after(step_time, lambda: animate(step + 1))
-        else:
-            widget.place(x=target_x)
+    def update(progress):
+        widget.place(x=int(1000 + (target_x - 1000) * progress))
     
-    animate(0)
+    animator.tween(duration, update, ease=linear, key=("slide", str(widget)),
+                   on_done=lambda: widget.place(x=target_x))
 
 # ------------------- COMPLETE MATPLOTLIB DASHBOARD -------------------
 class CompleteDashboard:
-    def __init__(self, steps, emi, entity_type):
+    def __init__(self, steps, emi, entity_type, age=30, employment_type="Salaried", regime="new"):
         self.steps = steps
         self.emi = emi
         self.entity_type = entity_type
+        self.age = age
+        self.employment_type = employment_type
+        self.regime = regime
         self.current_tab = 0
         self.animations = []
-        
+        self.closed = False
+        # Figures are built on a tab's first visit (see ensure_tab)
+        self.fig1 = self.fig2 = self.fig3 = self.fig4 = None
+        self.canvas1 = self.canvas2 = self.canvas3 = self.canvas4 = None
+        self._built_tabs = set()
+        # Layout work only happens for the visible tab; others are marked dirty
+        self._layouts = {}
+        self._layout_dirty = set()
+        
+        _load_charting()
         self.create_complete_dashboard()
     
     def create_complete_dashboard(self):
         self.window = ttk.Toplevel(title="📊 Complete Financial Dashboard")
         self.window.geometry("1400x900")
         self.window.minsize(800, 600)
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
         
         # Make window responsive and maximize by default
         self.window.state('zoomed')  # Maximize on Windows
@@ -155,12 +188,18 @@ class CompleteDashboard:
 
         ttk.Label(mode_frame, text="Chart Type:", font=("Segoe UI", 10)).pack(side="left", padx=(0,6))
         ttk.OptionMenu(mode_frame, self.chart_mode_var, "Pie", "Pie", "Bar", "Line").pack(side="left")
-        # Redraw charts when mode changes
+        # Redraw charts when mode changes (cached export renders are stale now)
+        def _on_mode_change(*args):
+            _clear_render_cache()
+            if self.current_tab == 0 and 0 in self._built_tabs:
+                self.animate_income_tab()
+            else:
+                self.refresh_layout()
         try:
-            self.chart_mode_var.trace_add('write', lambda *args: self.refresh_layout())
+            self.chart_mode_var.trace_add('write', _on_mode_change)
         except Exception:
             # Older tkinter may use trace
-            self.chart_mode_var.trace('w', lambda *args: self.refresh_layout())
+            self.chart_mode_var.trace('w', _on_mode_change)
         
         # Create notebook for tabs
         self.notebook = ttk.Notebook(self.window, bootstyle="primary")
@@ -173,10 +212,11 @@ class CompleteDashboard:
         self.window.grid_rowconfigure(1, weight=1)
         self.window.grid_columnconfigure(0, weight=1)
         
-        # Create complete tabs
+        # Create the (empty) tabs; each builds its figure when first shown
         self.create_income_tab()
         self.create_tax_tab()
         self.create_insights_tab()
+        self.create_whatif_tab()
         
         # Force layout update after window is fully rendered
         # Also bind to Configure so we can refresh when the window geometry settles
@@ -192,41 +232,48 @@ class CompleteDashboard:
         """Trigger complete chart animations when tab changes"""
         current_tab = self.notebook.index(self.notebook.select())
         self.current_tab = current_tab
+        self.ensure_tab(current_tab)
         
-        # Stop any existing animations
-        for anim in self.animations:
-            if hasattr(anim, 'event_source') and anim.event_source:
-                anim.event_source.stop()
+        # Finish any running animation (charts jump to their final state)
+        self.stop_animations()
+        if current_tab in self._layout_dirty:
+            self.refresh_tab(current_tab)
         
         # Start complete animations for current tab
         self.window.after(300, self.animate_current_tab)
     
     def refresh_layout(self):
-        """Force layout refresh for all figures when window is fully rendered"""
+        """Refresh the layout of the visible figure once the window geometry settles.
+
+        Hidden tabs are only marked dirty and refreshed when next shown.
+        """
         try:
             # ensure geometry/layout tasks are processed
             self.window.update_idletasks()
-            if hasattr(self, 'fig1') and self.fig1:
-                self.fig1.tight_layout()
-                try:
-                    self.canvas1.draw_idle()
-                except Exception:
-                    self.canvas1.draw()
-            if hasattr(self, 'fig2') and self.fig2:
-                self.fig2.tight_layout()
-                try:
-                    self.canvas2.draw_idle()
-                except Exception:
-                    self.canvas2.draw()
-            if hasattr(self, 'fig3') and self.fig3:
-                self.fig3.tight_layout()
-                try:
-                    self.canvas3.draw_idle()
-                except Exception:
-                    self.canvas3.draw()
+            self._layout_dirty.update(i for i in self._built_tabs if i != self.current_tab)
+            self.refresh_tab(self.current_tab)
         except Exception as e:
             pass  # Ignore any layout errors
 
+    def refresh_tab(self, index):
+        """Apply the (cached) layout of tab `index` and redraw it if it changed."""
+        if index not in self._built_tabs:
+            return
+        self._layout_dirty.discard(index)
+        if self._layouts[index].apply(self._layout_key(index)):
+            canvas = self._canvas(index)
+            try:
+                canvas.draw_idle()
+            except Exception:
+                canvas.draw()
+
+    def _layout_key(self, index):
+        # The income tab's tick labels depend on the chart mode
+        return self.chart_mode_var.get() if index == 0 else None
+
+    def _canvas(self, index):
+        return (self.canvas1, self.canvas2, self.canvas3, self.canvas4)[index]
+
     def on_configure(self, event):
         """Debounced configure handler to refresh layout after resizing/zoom events."""
         try:
@@ -238,15 +285,16 @@ class CompleteDashboard:
         self._config_after_id = self.window.after(200, self.refresh_layout)
     
     def create_income_tab(self):
-        tab1 = ttk.Frame(self.notebook)
-        self.notebook.add(tab1, text="💰 Income Distribution")
+        self.tab1 = ttk.Frame(self.notebook)
+        self.notebook.add(self.tab1, text="💰 Income Distribution")
         
         # Make tab responsive
-        tab1.grid_rowconfigure(0, weight=1)
-        tab1.grid_columnconfigure(0, weight=1)
-        
+        self.tab1.grid_rowconfigure(0, weight=1)
+        self.tab1.grid_columnconfigure(0, weight=1)
+    
+    def build_income_tab(self):
         # Create figure with responsive size
-        self.fig1 = plt.Figure(figsize=(16, 10), dpi=80)
+        self.fig1 = Figure(figsize=(16, 10), dpi=80)
         self.fig1.patch.set_facecolor('#f8f9fa')
         
         # Create subplots
@@ -255,148 +303,23 @@ class CompleteDashboard:
         self.ax1_3 = self.fig1.add_subplot(233)
         self.ax1_4 = self.fig1.add_subplot(212)
         
-        self.canvas1 = FigureCanvasTkAgg(self.fig1, tab1)
+        self.canvas1 = FigureCanvasTkAgg(self.fig1, self.tab1)
         self.canvas1.get_tk_widget().grid(row=0, column=0, sticky="nsew", padx=5, pady=5)
-        
-        tab1.grid_rowconfigure(0, weight=1)
-        tab1.grid_columnconfigure(0, weight=1)
+        self._layouts[0] = charts.LayoutCache(self.fig1)
     
     def animate_income_tab(self):
         """Complete animations for income tab"""
-        gross = self.steps["gross"]
-        deductions = self.steps["deductions"]
-        tax = self.steps["total"]
-        take_home = max(0, gross - deductions - tax - self.emi)
-        
-        # Clear all axes
-        for ax in [self.ax1_1, self.ax1_2, self.ax1_3, self.ax1_4]:
-            ax.clear()
-        
-        # Data for animations
-        values = [deductions, tax, self.emi, take_home]
-        labels = ['Deductions', 'Tax', 'EMI', 'Net Income']
-        colors = ['#FF6B6B', '#4ECDC4', '#FFD93D', '#6BCF7F']
-        
-        # 1. Main Pie Chart - Income Distribution
-        def animate_main_pie(frame):
-            self.ax1_1.clear()
-            mode = getattr(self, 'chart_mode_var', tk.StringVar(value='Pie')).get()
-            if frame <= len(values):
-                current_values = [v if i < frame else 0.1 for i, v in enumerate(values)]
-                if mode == 'Pie':
-                    wedges, texts, autotexts = self.ax1_1.pie(
-                        current_values, labels=labels, colors=colors,
-                        autopct=lambda p: f'{p:.1f}%' if p > 1 else '',
-                        startangle=90, shadow=True
-                    )
-                    for autotext in autotexts:
-                        autotext.set_color('white')
-                        autotext.set_fontweight('bold')
-                    self.ax1_1.set_title('Income Distribution (Pie)', fontsize=14, fontweight='bold', pad=20)
-                elif mode == 'Bar':
-                    bars = self.ax1_1.bar(labels, current_values, color=colors, alpha=0.9)
-                    self.ax1_1.set_title('Income Distribution (Bar)', fontsize=14, fontweight='bold', pad=20)
-                    for bar, amount in zip(bars, current_values):
-                        if amount > 0:
-                            self.ax1_1.text(bar.get_x() + bar.get_width()/2., bar.get_height() + bar.get_height()*0.01,
-                                            f'₹{amount:,.0f}', ha='center', va='bottom', fontweight='bold')
-                else:  # Line
-                    self.ax1_1.plot(labels, current_values, 'o-', color='#4361EE', linewidth=2)
-                    self.ax1_1.set_title('Income Distribution (Line)', fontsize=14, fontweight='bold', pad=20)
-            return []
-        
-        # 2. Monthly Breakdown
-        monthly_takehome = take_home / 12
-        monthly_emi = self.emi
-        monthly_remaining = monthly_takehome - monthly_emi
-        monthly_data = [monthly_takehome, monthly_emi, monthly_remaining]
-        monthly_labels = ['Monthly Income', 'Monthly EMI', 'Disposable Income']
-        monthly_colors = ['#27AE60', '#E74C3C', '#3498DB']
-        
-        def animate_monthly_pie(frame):
-            self.ax1_2.clear()
-            if frame <= len(monthly_data):
-                current_values = [v if i < frame else 0.1 for i, v in enumerate(monthly_data)]
-                wedges, texts, autotexts = self.ax1_2.pie(
-                    current_values, labels=monthly_labels, colors=monthly_colors,
-                    autopct=lambda p: f'{p:.1f}%' if p > 1 else '',
-                    startangle=90, wedgeprops=dict(width=0.3)
-                )
-                self.ax1_2.set_title('Monthly Cash Flow', fontsize=14, fontweight='bold', pad=20)
-            return []
-        
-        # 3. Tax Efficiency
-        tax_efficiency = ((gross - tax) / gross * 100) if gross > 0 else 0
-        efficiency_data = [tax, gross - tax]
-        efficiency_labels = ['Tax Paid', 'Remaining Income']
-        efficiency_colors = ['#E74C3C', '#27AE60']
-        
-        def animate_efficiency(frame):
-            self.ax1_3.clear()
-            if frame <= 2:
-                current_values = efficiency_data[:frame] + [0.1] * (2 - frame)
-                wedges, texts, autotexts = self.ax1_3.pie(
-                    current_values, colors=efficiency_colors,
-                    autopct=lambda p: f'{p:.1f}%' if p > 1 else '',
-                    startangle=90
-                )
-                self.ax1_3.set_title(f'Tax Efficiency: {tax_efficiency:.1f}%', fontsize=14, fontweight='bold', pad=20)
-            return []
-        
-        # 4. Complete Bar Chart
-        categories = ['Gross Income', 'Deductions', 'Tax Paid', 'Monthly EMI', 'Net Take-home']
-        amounts = [gross, deductions, tax, self.emi, take_home]
-        bar_colors = ['#4361EE', '#FF6B6B', '#4ECDC4', '#FFD93D', '#6BCF7F']
-        
-        def animate_complete_bar(frame):
-            self.ax1_4.clear()
-            if frame > 0:
-                mode = getattr(self, 'chart_mode_var', tk.StringVar(value='Pie')).get()
-                current_categories = categories[:frame]
-                current_amounts = amounts[:frame]
-                current_colors = bar_colors[:frame]
-
-                if mode == 'Bar':
-                    bars = self.ax1_4.bar(current_categories, current_amounts, color=current_colors, alpha=0.8)
-                    self.ax1_4.set_title('Complete Financial Overview', fontsize=14, fontweight='bold', pad=20)
-                    self.ax1_4.tick_params(axis='x', rotation=15)
-                    self.ax1_4.grid(True, alpha=0.3)
-
-                    # Add value labels
-                    for bar, amount in zip(bars, current_amounts):
-                        height = bar.get_height()
-                        self.ax1_4.text(bar.get_x() + bar.get_width()/2., height + height*0.01,
-                                f'₹{amount:,.0f}', ha='center', va='bottom', fontweight='bold')
-                elif mode == 'Pie':
-                    vals = current_amounts if frame == len(amounts) else [v if i < frame else 0.1 for i, v in enumerate(amounts)]
-                    self.ax1_4.pie(vals, labels=categories, colors=bar_colors, startangle=90, autopct=lambda p: f'{p:.1f}%' if p>1 else '')
-                    self.ax1_4.set_title('Complete Financial Overview (Pie)', fontsize=14, fontweight='bold', pad=20)
-                else:  # Line
-                    self.ax1_4.plot(current_categories, current_amounts, 'o-', color='#6BCF7F', linewidth=2)
-                    self.ax1_4.set_title('Complete Financial Overview (Line)', fontsize=14, fontweight='bold', pad=20)
-            return []
-        
-        # Create all animations
-        ani1 = animation.FuncAnimation(self.fig1, animate_main_pie, frames=len(values)+1, interval=400, repeat=False)
-        ani2 = animation.FuncAnimation(self.fig1, animate_monthly_pie, frames=len(monthly_data)+1, interval=400, repeat=False)
-        ani3 = animation.FuncAnimation(self.fig1, animate_efficiency, frames=3, interval=400, repeat=False)
-        ani4 = animation.FuncAnimation(self.fig1, animate_complete_bar, frames=len(amounts)+1, interval=500, repeat=False)
-        
-        self.animations.extend([ani1, ani2, ani3, ani4])
-        self.fig1.tight_layout()
-        try:
-            self.canvas1.draw_idle()
-        except Exception:
-            self.canvas1.draw()
+        self.play(0, self.tab_tracks(0))
     
     def create_tax_tab(self):
-        tab2 = ttk.Frame(self.notebook)
-        self.notebook.add(tab2, text="📈 Tax Analysis")
-        
-        tab2.grid_rowconfigure(0, weight=1)
-        tab2.grid_columnconfigure(0, weight=1)
+        self.tab2 = ttk.Frame(self.notebook)
+        self.notebook.add(self.tab2, text="📈 Tax Analysis")
         
-        self.fig2 = plt.Figure(figsize=(16, 10), dpi=80)
+        self.tab2.grid_rowconfigure(0, weight=1)
+        self.tab2.grid_columnconfigure(0, weight=1)
+    
+    def build_tax_tab(self):
+        self.fig2 = Figure(figsize=(16, 10), dpi=80)
         self.fig2.patch.set_facecolor('#f8f9fa')
         
         # Create 2x2 grid for tax analysis
@@ -405,165 +328,23 @@ class CompleteDashboard:
         self.ax2_3 = self.fig2.add_subplot(223)
         self.ax2_4 = self.fig2.add_subplot(224)
         
-        self.canvas2 = FigureCanvasTkAgg(self.fig2, tab2)
+        self.canvas2 = FigureCanvasTkAgg(self.fig2, self.tab2)
         self.canvas2.get_tk_widget().grid(row=0, column=0, sticky="nsew", padx=5, pady=5)
-        
-        tab2.grid_rowconfigure(0, weight=1)
-        tab2.grid_columnconfigure(0, weight=1)
+        self._layouts[1] = charts.LayoutCache(self.fig2)
     
     def animate_tax_tab(self):
-        """Complete animations for tax tab - WITH CORRECTED SLABS"""
-        gross = self.steps["gross"]
-        tax = self.steps["total"]
-        taxable = self.steps["taxable"]
-        
-        # Clear all axes
-        for ax in [self.ax2_1, self.ax2_2, self.ax2_3, self.ax2_4]:
-            ax.clear()
-        
-        # 1. Tax Breakdown - USING CORRECT SLABS
-        slab_data = []
-        slab_labels = []
-        slab_colors = []
-        
-        if self.entity_type == "Individual":
-            # CORRECT TAX SLABS for New Regime 2024-25
-            slabs = [
-                (300_000, 0.00),     # 0-3L: 0%
-                (300_000, 0.05),     # 3L-6L: 5%
-                (400_000, 0.10),     # 6L-10L: 10%
-                (500_000, 0.15),     # 10L-15L: 15%
-                (float('inf'), 0.20) # Above 15L: 20%
-            ]
-            
-            # Calculate actual slab-wise amounts
-            rem = taxable
-            slab_amounts = []
-            slab_percentages = ["0%", "5%", "10%", "15%", "20%"]
-            
-            for size, rate in slabs:
-                if rem <= 0:
-                    slab_amounts.append(0)
-                    continue
-                part = min(rem, size)
-                slab_amounts.append(part)
-                rem -= part
-            
-            slab_data = slab_amounts
-            slab_labels = [f'0-3L\n0%', f'3L-6L\n5%', f'6L-10L\n10%', f'10L-15L\n15%', f'15L+\n20%']
-            slab_colors = ['#27AE60', '#F39C12', '#E74C3C', '#8E44AD', '#3498DB']
-        else:
-            slab_data = [taxable]
-            slab_labels = [f'Corporate Tax\n{22 if gross <= 5000000 else 30}%']
-            slab_colors = ['#3498DB']
-        
-        def animate_tax_breakdown(frame):
-            self.ax2_1.clear()
-            if frame > 0:
-                current_data = slab_data[:frame]
-                current_labels = slab_labels[:frame]
-                current_colors = slab_colors[:frame]
-                
-                bars = self.ax2_1.bar(current_labels, current_data, color=current_colors, alpha=0.8)
-                self.ax2_1.set_title('Tax Slab Distribution', fontsize=14, fontweight='bold', pad=20)
-                self.ax2_1.set_ylabel('Amount (₹)', fontweight='bold')
-                self.ax2_1.grid(True, alpha=0.3)
-                
-                for bar, amount in zip(bars, current_data):
-                    if amount > 0:  # Only show labels for non-zero amounts
-                        height = bar.get_height()
-                        self.ax2_1.text(bar.get_x() + bar.get_width()/2., height + height*0.01,
-                                f'₹{amount:,.0f}', ha='center', va='bottom', fontweight='bold', fontsize=8)
-            return []
-        
-        # 2. Tax Rate Comparison
-        tax_rates = [0, 5, 10, 15, 20]  # CORRECT RATES
-        actual_rate = (tax / taxable * 100) if taxable > 0 else 0
-        
-        def animate_rate_comparison(frame):
-            self.ax2_2.clear()
-            if frame > 0:
-                current_rates = tax_rates[:frame]
-                current_labels = ['0%', '5%', '10%', '15%', '20%'][:frame]
-                
-                bars = self.ax2_2.bar(current_labels, current_rates, color='lightblue', alpha=0.6)
-                if frame == len(tax_rates):
-                    self.ax2_2.axhline(y=actual_rate, color='red', linestyle='--', linewidth=3, 
-                                   label=f'Your Effective Rate: {actual_rate:.1f}%')
-                    self.ax2_2.legend()
-                self.ax2_2.set_title('Tax Rate Comparison', fontsize=14, fontweight='bold', pad=20)
-                self.ax2_2.set_ylabel('Tax Rate (%)', fontweight='bold')
-                self.ax2_2.set_ylim(0, 25)  # Set reasonable y-axis limit
-                self.ax2_2.grid(True, alpha=0.3)
-            return []
-        
-        # 3. Tax vs Income - USING CORRECTED FUNCTION
-        income_levels = np.linspace(300000, 2000000, 8)
-        tax_levels = [calculate_individual_tax(inc, 50000, 30)[0] for inc in income_levels]
-        
-        def animate_tax_curve(frame):
-            self.ax2_3.clear()
-            if frame > 0:
-                current_income = income_levels[:frame]
-                current_tax = tax_levels[:frame]
-                
-                self.ax2_3.plot(current_income, current_tax, 'o-', linewidth=3, color='#E74C3C')
-                self.ax2_3.set_title('Tax vs Income', fontsize=14, fontweight='bold', pad=20)
-                self.ax2_3.set_xlabel('Income (₹)', fontweight='bold')
-                self.ax2_3.set_ylabel('Tax (₹)', fontweight='bold')
-                self.ax2_3.grid(True, alpha=0.3)
-                
-                # Add current user's point
-                if frame == len(income_levels):
-                    self.ax2_3.plot(gross, tax, 'ro', markersize=10, label='Your Position')
-                    self.ax2_3.legend()
-            return []
-        
-        # 4. Tax Components
-        components = ['Basic Tax', 'Rebate', 'Cess', 'Total Tax']
-        component_values = [self.steps["tax_before"], self.steps["rebate"], self.steps["cess"], self.steps["total"]]
-        component_colors = ['#3498DB', '#27AE60', '#F39C12', '#E74C3C']
-        
-        def animate_components(frame):
-            self.ax2_4.clear()
-            if frame > 0:
-                current_values = component_values[:frame]
-                current_labels = components[:frame]
-                current_colors = component_colors[:frame]
-                
-                bars = self.ax2_4.bar(current_labels, current_values, color=current_colors, alpha=0.8)
-                self.ax2_4.set_title('Tax Components', fontsize=14, fontweight='bold', pad=20)
-                self.ax2_4.set_ylabel('Amount (₹)', fontweight='bold')
-                self.ax2_4.grid(True, alpha=0.3)
-                
-                for bar, amount in zip(bars, current_values):
-                    height = bar.get_height()
-                    if amount > 0:  # Only show labels for non-zero amounts
-                        self.ax2_4.text(bar.get_x() + bar.get_width()/2., height + 1000,
-                                f'₹{amount:,.0f}', ha='center', va='bottom', fontweight='bold')
-            return []
-        
-        # Create all animations
-        ani1 = animation.FuncAnimation(self.fig2, animate_tax_breakdown, frames=len(slab_data)+1, interval=400, repeat=False)
-        ani2 = animation.FuncAnimation(self.fig2, animate_rate_comparison, frames=len(tax_rates)+1, interval=400, repeat=False)
-        ani3 = animation.FuncAnimation(self.fig2, animate_tax_curve, frames=len(income_levels)+1, interval=300, repeat=False)
-        ani4 = animation.FuncAnimation(self.fig2, animate_components, frames=len(components)+1, interval=400, repeat=False)
-        
-        self.animations.extend([ani1, ani2, ani3, ani4])
-        self.fig2.tight_layout()
-        try:
-            self.canvas2.draw_idle()
-        except Exception:
-            self.canvas2.draw()
+        """Complete animations for tax tab"""
+        self.play(1, self.tab_tracks(1))
     
     def create_insights_tab(self):
-        tab3 = ttk.Frame(self.notebook)
-        self.notebook.add(tab3, text="💡 Financial Insights")
-        
-        tab3.grid_rowconfigure(0, weight=1)
-        tab3.grid_columnconfigure(0, weight=1)
+        self.tab3 = ttk.Frame(self.notebook)
+        self.notebook.add(self.tab3, text="💡 Financial Insights")
         
-        self.fig3 = plt.Figure(figsize=(16, 10), dpi=80)
+        self.tab3.grid_rowconfigure(0, weight=1)
+        self.tab3.grid_columnconfigure(0, weight=1)
+    
+    def build_insights_tab(self):
+        self.fig3 = Figure(figsize=(16, 10), dpi=80)
         self.fig3.patch.set_facecolor('#f8f9fa')
         
         # Create 2x2 grid for insights
@@ -572,126 +353,155 @@ class CompleteDashboard:
         self.ax3_3 = self.fig3.add_subplot(223)
         self.ax3_4 = self.fig3.add_subplot(224)
         
-        self.canvas3 = FigureCanvasTkAgg(self.fig3, tab3)
+        self.canvas3 = FigureCanvasTkAgg(self.fig3, self.tab3)
         self.canvas3.get_tk_widget().grid(row=0, column=0, sticky="nsew", padx=5, pady=5)
-        
-        tab3.grid_rowconfigure(0, weight=1)
-        tab3.grid_columnconfigure(0, weight=1)
+        self._layouts[2] = charts.LayoutCache(self.fig3)
     
     def animate_insights_tab(self):
         """Complete animations for insights tab"""
-        gross = self.steps["gross"]
-        deductions = self.steps["deductions"]
-        tax = self.steps["total"]
-        take_home = max(0, gross - deductions - tax - self.emi)
-        
-        # Clear all axes
-        for ax in [self.ax3_1, self.ax3_2, self.ax3_3, self.ax3_4]:
-            ax.clear()
-        
-        # 1. Savings Potential
-        current_savings = deductions
-        max_possible = min(gross * 0.3, 150000)
-        potential = max(0, max_possible - current_savings)
-        
-        savings_data = [current_savings, potential]
-        savings_labels = ['Current Savings', 'Additional Potential']
-        savings_colors = ['#3498DB', '#F39C12']
-        
-        def animate_savings(frame):
-            self.ax3_1.clear()
-            if frame > 0:
-                current_data = savings_data[:frame]
-                current_labels = savings_labels[:frame]
-                current_colors = savings_colors[:frame]
-                
-                bars = self.ax3_1.bar(current_labels, current_data, color=current_colors, alpha=0.8)
-                self.ax3_1.set_title('Tax Savings Potential', fontsize=14, fontweight='bold', pad=20)
-                self.ax3_1.set_ylabel('Amount (₹)', fontweight='bold')
-                self.ax3_1.grid(True, alpha=0.3)
-                
-                for bar, amount in zip(bars, current_data):
-                    height = bar.get_height()
-                    self.ax3_1.text(bar.get_x() + bar.get_width()/2., height + 1000,
-                            f'₹{amount:,.0f}', ha='center', va='bottom', fontweight='bold')
-            return []
-        
-        # 2. Investment Recommendations
-        investment_options = ['PPF', 'NPS', 'ELSS', 'Health Insurance', 'Home Loan']
-        investment_impact = [150000, 50000, 150000, 25000, 200000]
-        investment_colors = ['#27AE60', '#3498DB', '#E74C3C', '#9B59B6', '#F39C12']
-        
-        def animate_investments(frame):
-            self.ax3_2.clear()
-            if frame <= len(investment_impact):
-                current_values = investment_impact[:frame] + [0.1] * (len(investment_impact) - frame)
-                current_labels = investment_options[:frame]
-                current_colors = investment_colors[:frame]
-                
-                wedges, texts, autotexts = self.ax3_2.pie(
-                    current_values, labels=current_labels, colors=current_colors,
-                    autopct=lambda p: f'{p:.0f}' if p > 1 else '',
-                    startangle=90
-                )
-                self.ax3_2.set_title('Recommended Investments', fontsize=14, fontweight='bold', pad=20)
-            return []
-        
-        # 3. Monthly Budget
-        monthly_data = [take_home/12, self.emi, (take_home/12 - self.emi)]
-        monthly_labels = ['Monthly Income', 'Monthly EMI', 'Disposable Income']
-        monthly_colors = ['#27AE60', '#E74C3C', '#3498DB']
-        
-        def animate_budget(frame):
-            self.ax3_3.clear()
-            if frame <= len(monthly_data):
-                current_values = monthly_data[:frame] + [0.1] * (len(monthly_data) - frame)
-                wedges, texts, autotexts = self.ax3_3.pie(
-                    current_values, labels=monthly_labels, colors=monthly_colors,
-                    autopct=lambda p: f'{p:.1f}%' if p > 1 else '',
-                    startangle=90
-                )
-                self.ax3_3.set_title('Monthly Budget', fontsize=14, fontweight='bold', pad=20)
-            return []
-        
-        # 4. Yearly Projection
-        months = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
-        monthly_income = [take_home/12] * 12
-        cumulative_income = np.cumsum(monthly_income)
+        self.play(2, self.tab_tracks(2))
+    
+    def create_whatif_tab(self):
+        self.tab4 = ttk.Frame(self.notebook)
+        self.notebook.add(self.tab4, text="🗺️ What-If")
         
-        def animate_projection(frame):
-            self.ax3_4.clear()
-            if frame > 0:
-                current_months = months[:frame]
-                current_cumulative = cumulative_income[:frame]
-                
-                self.ax3_4.plot(current_months, current_cumulative, 'o-', linewidth=3, color='#27AE60')
-                self.ax3_4.fill_between(current_months, current_cumulative, alpha=0.3, color='#27AE60')
-                self.ax3_4.set_title('Yearly Income Projection', fontsize=14, fontweight='bold', pad=20)
-                self.ax3_4.set_ylabel('Cumulative Income (₹)', fontweight='bold')
-                self.ax3_4.grid(True, alpha=0.3)
-            return []
+        self.tab4.grid_rowconfigure(0, weight=1)
+        self.tab4.grid_columnconfigure(0, weight=1)
+    
+    def build_whatif_tab(self):
+        self.fig4 = Figure(figsize=(16, 10), dpi=80)
+        self.fig4.patch.set_facecolor('#f8f9fa')
         
-        # Create all animations
-        ani1 = animation.FuncAnimation(self.fig3, animate_savings, frames=len(savings_data)+1, interval=400, repeat=False)
-        ani2 = animation.FuncAnimation(self.fig3, animate_investments, frames=len(investment_impact)+1, interval=400, repeat=False)
-        ani3 = animation.FuncAnimation(self.fig3, animate_budget, frames=len(monthly_data)+1, interval=400, repeat=False)
-        ani4 = animation.FuncAnimation(self.fig3, animate_projection, frames=len(months)+1, interval=300, repeat=False)
+        # Two heatmaps side by side (each draws its own colorbar)
+        self.ax4_1 = self.fig4.add_subplot(121)
+        self.ax4_2 = self.fig4.add_subplot(122)
         
-        self.animations.extend([ani1, ani2, ani3, ani4])
-        self.fig3.tight_layout()
-        try:
-            self.canvas3.draw_idle()
-        except Exception:
-            self.canvas3.draw()
+        self.canvas4 = FigureCanvasTkAgg(self.fig4, self.tab4)
+        self.canvas4.get_tk_widget().grid(row=0, column=0, sticky="nsew", padx=5, pady=5)
+        self._layouts[3] = charts.LayoutCache(self.fig4)
+    
+    def animate_whatif_tab(self):
+        """Reveal the what-if heatmaps"""
+        self.play(3, self.tab_tracks(3))
+    
+    def tab_tracks(self, index):
+        """Chart tracks of tab `index` for the current results."""
+        if index == 0:
+            return charts.income_tracks([self.ax1_1, self.ax1_2, self.ax1_3, self.ax1_4],
+                                        self.steps, self.emi, self.chart_mode_var.get())
+        if index == 1:
+            return charts.tax_tracks([self.ax2_1, self.ax2_2, self.ax2_3, self.ax2_4],
+                                     self.steps, self.entity_type, self.age, self.regime)
+        if index == 2:
+            return charts.insights_tracks([self.ax3_1, self.ax3_2, self.ax3_3, self.ax3_4],
+                                          self.steps, self.emi, self.age, self.employment_type,
+                                          self.entity_type)
+        return charts.whatif_tracks([self.ax4_1, self.ax4_2], self.steps, self.emi, self.entity_type, self.age)
+    
+    def play(self, index, tracks):
+        """Play `tracks` on the figure of tab `index`, replacing any running animation.
+
+        Artists are created once and updated in place; frames are blitted
+        over a cached background (see taxlib.charts.BlitAnimation).
+        """
+        self.stop_animations()
+        anim = charts.BlitAnimation(self._canvas(index), tracks)
+        anim.setup()
+        self._layouts[index].apply(self._layout_key(index))
+        self._layout_dirty.discard(index)
+        # Frames come from the app's frame clock, not a timer per figure
+        anim.start(timer=False)
+        animator.add(anim.advance, key=("dashboard", id(self)))
+        self.animations.append(anim)
+    
+    def stop_animations(self, redraw=True):
+        for anim in self.animations:
+            anim.stop(redraw=redraw)
+        self.animations.clear()
+    
+    def ensure_tab(self, index):
+        """Build the figure and canvas of tab `index` if it has not been shown yet."""
+        if index in self._built_tabs:
+            return
+        with instrument.span("dashboard.tab"):
+            (self.build_income_tab, self.build_tax_tab, self.build_insights_tab, self.build_whatif_tab)[index]()
+        self._built_tabs.add(index)
     
+    @profiling.profiled("animate_current_tab")
     def animate_current_tab(self):
         """Animate the currently active tab"""
+        if self.closed:
+            return
+        self.ensure_tab(self.current_tab)
         if self.current_tab == 0:
             self.animate_income_tab()
         elif self.current_tab == 1:
             self.animate_tax_tab()
         elif self.current_tab == 2:
             self.animate_insights_tab()
+        elif self.current_tab == 3:
+            self.animate_whatif_tab()
+    
+    # ---- lifecycle (see taxlib.dashboard.DashboardManager) ----
+    def update(self, results):
+        """Show new results in this window, reusing its figures and axes."""
+        self.steps = results["steps"]
+        self.emi = results["emi"]
+        self.entity_type = results["entity"]
+        self.age = results["age"]
+        self.employment_type = results["employment_type"]
+        self.regime = results["regime"]
+        self.stop_animations(redraw=False)
+        for layout in self._layouts.values():
+            layout.invalidate()
+        # Hidden tabs get their final charts now (exports read every built
+        # figure) and are laid out when next shown
+        for index in self._built_tabs - {self.current_tab}:
+            anim = charts.BlitAnimation(self._canvas(index), self.tab_tracks(index))
+            anim.setup()
+            anim.stop(redraw=False)
+            self._layout_dirty.add(index)
+        self.animate_current_tab()
+    
+    def show(self):
+        self.window.deiconify()
+        self.window.lift()
+        self.window.focus_force()
+    
+    def tab_figures(self):
+        """(tab index, figure) of the tabs built so far."""
+        return [(i, f) for i, f in enumerate((self.fig1, self.fig2, self.fig3, self.fig4)) if f is not None]
+
+    def figures(self):
+        """The figures built so far."""
+        return [f for _, f in self.tab_figures()]
+    
+    def close(self):
+        """Stop animations, release the figures and destroy the window."""
+        if self.closed:
+            return
+        self.closed = True
+        self.stop_animations(redraw=False)
+        try:
+            if self._config_after_id:
+                self.window.after_cancel(self._config_after_id)
+        except Exception:
+            pass
+        # Variable traces are held by Tcl and would keep this object alive
+        for var in (self.chart_mode_var, self.lang_var):
+            try:
+                for modes, cbname in var.trace_info():
+                    var.trace_remove(modes, cbname)
+            except Exception:
+                pass
+        for fig in self.figures():
+            fig.clear()
+        self.fig1 = self.fig2 = self.fig3 = self.fig4 = None
+        self.canvas1 = self.canvas2 = self.canvas3 = self.canvas4 = None
+        self._layouts.clear()
+        self._layout_dirty.clear()
+        self._built_tabs.clear()
+        self.window.destroy()
 
 # ------------------- MODERN UI COMPONENTS -------------------
 class ModernCard(ttk.Frame):
@@ -713,6 +523,137 @@ class ModernCard(ttk.Frame):
         self.content = ttk.Frame(self)
         self.content.pack(fill="both", expand=True)
 
+# ------------------- CUSTOM INPUT WITH DROPDOWN -------------------
+class FlexibleInput(ttk.Frame):
+    """Entry field with Frame-based dropdown for preset values"""
+    def __init__(self, parent, variable, presets, **kwargs):
+        super().__init__(parent, **kwargs)
+        self.variable = variable
+        self.presets = presets
+        self.dropdown_open = False
+        self.root = parent
+        
+        # Find root window
+        w = parent
+        while hasattr(w, 'master') and w.master:
+            w = w.master
+        self.root_window = w
+        
+        # Container for entry and dropdown button
+        input_container = ttk.Frame(self)
+        input_container.pack(fill="x", expand=True)
+        
+        # Manual entry field
+        self.entry = ttk.Entry(input_container, textvariable=variable, font=("Segoe UI", 10), width=20)
+        self.entry.pack(side="left", fill="both", expand=True, padx=(0, 8))
+        
+        # Dropdown button
+        self.dropdown_btn = ttk.Button(
+            input_container, 
+            text="▼", 
+            width=3,
+            command=self.toggle_dropdown,
+            bootstyle="secondary-outline"
+        )
+        self.dropdown_btn.pack(side="left")
+        
+        # Create hidden dropdown frame (will be placed dynamically)
+        self.dropdown_frame = tk.Frame(self.root_window, bg="white", relief="solid", borderwidth=1)
+        
+        # Listbox for presets
+        scrollbar = ttk.Scrollbar(self.dropdown_frame)
+        scrollbar.pack(side="right", fill="y")
+        
+        self.listbox = tk.Listbox(
+            self.dropdown_frame, 
+            font=("Segoe UI", 10),
+            yscrollcommand=scrollbar.set,
+            height=6,
+            width=20,
+            relief="flat"
+        )
+        self.listbox.pack(side="left", fill="both", expand=True)
+        scrollbar.config(command=self.listbox.yview)
+        
+        # Populate listbox
+        for preset in presets:
+            self.listbox.insert(tk.END, preset)
+        
+        # Bind selection
+        self.listbox.bind("<Button-1>", self.on_select)
+        self.listbox.bind("<Return>", self.on_select)
+        self.listbox.bind("<Escape>", lambda e: self.close_dropdown())
+        
+        # Bind entry focus loss
+        self.entry.bind("<FocusOut>", lambda e: self.after(100, self.close_dropdown_safe))
+        
+        # Bind root window click to close dropdown
+        self.root_window.bind("<Button-1>", self.on_root_click, add=True)
+    
+    def toggle_dropdown(self):
+        if self.dropdown_open:
+            self.close_dropdown()
+        else:
+            self.open_dropdown()
+    
+    def open_dropdown(self):
+        if self.dropdown_open:
+            return
+        
+        self.dropdown_open = True
+        
+        # Get entry position
+        x = self.entry.winfo_rootx()
+        y = self.entry.winfo_rooty() + self.entry.winfo_height() + 2
+        width = self.entry.winfo_width() + self.dropdown_btn.winfo_width() + 8
+        
+        # Place dropdown frame absolutely on root window
+        self.dropdown_frame.place(x=x, y=y, width=width, height=140)
+        self.listbox.focus()
+    
+    def close_dropdown(self):
+        self.dropdown_open = False
+        self.dropdown_frame.place_forget()
+    
+    def close_dropdown_safe(self):
+        if self.dropdown_open:
+            self.close_dropdown()
+    
+    def on_root_click(self, event):
+        # Close dropdown if click is outside the entry/button/dropdown
+        if self.dropdown_open:
+            if not (self.entry.winfo_ismapped() or self.dropdown_btn.winfo_ismapped()):
+                return
+            
+            # Check if click is within entry, button, or dropdown
+            entry_x0 = self.entry.winfo_rootx()
+            entry_x1 = entry_x0 + self.entry.winfo_width()
+            btn_x0 = self.dropdown_btn.winfo_rootx()
+            btn_x1 = btn_x0 + self.dropdown_btn.winfo_width()
+            
+            dropdown_x0 = self.dropdown_frame.winfo_rootx()
+            dropdown_x1 = dropdown_x0 + self.dropdown_frame.winfo_width()
+            
+            entry_y0 = self.entry.winfo_rooty()
+            entry_y1 = entry_y0 + self.entry.winfo_height()
+            
+            dropdown_y0 = self.dropdown_frame.winfo_rooty()
+            dropdown_y1 = dropdown_y0 + self.dropdown_frame.winfo_height()
+            
+            click_in_entry = (entry_x0 <= event.x_root <= entry_x1 and entry_y0 <= event.y_root <= entry_y1)
+            click_in_btn = (btn_x0 <= event.x_root <= btn_x1 and entry_y0 <= event.y_root <= entry_y1)
+            click_in_dropdown = (dropdown_x0 <= event.x_root <= dropdown_x1 and dropdown_y0 <= event.y_root <= dropdown_y1)
+            
+            if not (click_in_entry or click_in_btn or click_in_dropdown):
+                self.close_dropdown()
+    
+    def on_select(self, event):
+        selection = self.listbox.curselection()
+        if selection:
+            value = self.listbox.get(selection[0])
+            self.variable.set(value)
+            self.close_dropdown()
+
 # ------------------- MODERN UI LOGIC -------------------
 animator = SmoothAnimator()
 
@@ -723,6 +664,7 @@ def on_pan_change(event=None):
         entity_type = get_pan_entity_type(pan)
         entity_label.config(text=f"🏢 {entity_type}", bootstyle="success")
         btn_calculate.config(state="normal")
+        _on_input_change()
     else:
         entry_pan.configure(bootstyle="danger")
         entity_label.config(text="❌ Invalid PAN", bootstyle="danger")
@@ -737,53 +679,113 @@ def autofill_pan(event=None):
         emi_var.set(str(data.get("emi","")))
         age_var.set(str(data.get("age","30")))
 
-def calculate_tax():
+def _read_inputs():
+    """Return (pan, income, deductions, emi, age, employment type) from the form.
+
+    Raises ValueError if a numeric field does not parse.
+    """
     pan = entry_pan.get().strip().upper()
-    if not validate_pan(pan):
+    return (pan, float(income_var.get()), float(deduction_var.get()), float(emi_var.get()),
+            int(age_var.get()), employment_type_var.get())
+
+
+# The form calculates under the New Regime (the Old Regime is shown for comparison)
+REGIME = "new"
+
+# Spread of self-employed income (lognormal sigma) shown as a tax range
+INCOME_UNCERTAINTY = 0.25
+UNCERTAINTY_SAMPLES = 20_000
+
+
+def _income_range(results):
+    """Tax and take-home range when income is uncertain (self-employed)."""
+    from taxlib.simulation import simulate
+    steps = results["steps"]
+    sim = simulate("lognormal", {"median": steps["gross"], "sigma": INCOME_UNCERTAINTY},
+                   UNCERTAINTY_SAMPLES, steps["deductions"], results["emi"], results["age"], seed=0)
+    # 5th and 95th percentiles of the lognormal income itself
+    spread = math.exp(NormalDist().inv_cdf(0.95) * INCOME_UNCERTAINTY)
+    return {
+        "sigma": INCOME_UNCERTAINTY,
+        "income_p5": steps["gross"] / spread, "income_p95": steps["gross"] * spread,
+        "tax_p5": sim.tax[5], "tax_p95": sim.tax[95],
+        "take_home_p5": sim.take_home[5], "take_home_p95": sim.take_home[95],
+        "slab_chances": sim.slab_probability,
+    }
+
+
+@profiling.profiled("calculate_tax.worker")
+def _compute_results(pan, income, deductions, emi, age, emp_type, save=False):
+    """Calculate one result and, with `save`, store the inputs for autofill.
+    Runs on the recalculation worker thread.
+
+    Only an explicit Calculate saves; live recalculations see half-typed
+    values and must not leave them in the database."""
+    with instrument.span("calculation"):
+        results = calculate_pan_results(pan, income, deductions, emi, age, emp_type, REGIME)
+        if results["entity"] == "Individual" and emp_type == "Self Employed" and income > 0:
+            results["income_range"] = _income_range(results)
+    if save:
+        with instrument.span("db.save"):
+            save_pan_data_db(pan, income, deductions, emi, age)
+    return results
+
+
+@profiling.profiled("calculate_tax")
+def calculate_tax():
+    with instrument.span("validation"):
+        pan = entry_pan.get().strip().upper()
+        valid_pan = validate_pan(pan)
+        try:
+            inputs = _read_inputs()
+        except ValueError:
+            inputs = None
+    if not valid_pan:
         messagebox.showerror("Error", "Please enter a valid PAN number")
         return
-
-    try:
-        income = float(income_var.get())
-        deductions = float(deduction_var.get())
-        emi = float(emi_var.get())
-        age = int(age_var.get())
-    except ValueError:
+    if inputs is None:
         messagebox.showerror("Error", "Please enter valid numeric values")
         return
 
-    # DEBUG: Print what we're getting
-    entity = get_pan_entity_type(pan)
-    emp_type = employment_type_var.get()
-    print(f"DEBUG: Entity={entity}, Employment Type='{emp_type}'")
-    print(f"DEBUG: Income={income}, Deductions={deductions}, Age={age}")
+    # Calculation and DB save run on the worker; _show_results gets the result
+    loading_label.config(text="⏳ Calculating...")
+    recalc.request(*inputs, True, delay_ms=0)
 
-    # Perform calculation directly (no queuing)
-    if entity == "Individual":
-        print("DEBUG: Using Individual tax calculation")
-        total_tax, slab, steps = calculate_individual_tax(income, deductions, age, emp_type)
-    else:
-        print("DEBUG: Using Corporate tax calculation")
-        total_tax, slab, steps = calculate_corporate_tax(income, deductions, entity)
-    
-    print(f"DEBUG: Calculated Tax={total_tax}")
-    print(f"DEBUG: Slab details={slab}")
-    
-    take_home = income - deductions - total_tax - emi
-    save_pan_data_db(pan, income, deductions, emi, age)
+
+def _on_input_change(*args):
+    """Live mode: recalculate (debounced, in the background) as fields change."""
+    if not live_var.get():
+        return
+    with instrument.span("validation"):
+        if not validate_pan(entry_pan.get().strip().upper()):
+            return
+        try:
+            inputs = _read_inputs()
+        except ValueError:
+            return  # still typing
+    recalc.request(*inputs)
+
+
+def _on_live_toggle():
+    app_config.set('live_recalc', bool(live_var.get()))
+    _on_input_change()
+
+
+def _on_calc_error(error):
+    loading_label.config(text=f"❌ Calculation failed: {error}")
+
+
+def _show_results(results):
+    """Show the latest calculation result (UI thread)."""
+    total_tax = results["total_tax"]
+    take_home = results["take_home"]
     
     # Store results
-    app.calc_results = {
-        "total_tax": total_tax,
-        "take_home": take_home,
-        "steps": steps,
-        "slab": slab,
-        "emi": emi,
-        "pan": pan,
-        "entity": entity,
-        "age": age,
-        "employment_type": emp_type
-    }
+    app.calc_results = results
+    # Figures rendered for the previous result must not be reused by exports
+    _clear_render_cache()
+    # An open dashboard shows the new result in place
+    dashboards.push(results)
     
     # Animate quick results
     animate_number(lbl_tax, total_tax, 600)
@@ -809,17 +811,19 @@ def update_efficiency_metrics():
     if hasattr(app, 'calc_results'):
         steps = app.calc_results["steps"]
         gross = steps["gross"]
-        tax = steps["total"]
         deductions = steps["deductions"]
         
-        # Calculate actual efficiency
-        tax_efficiency = ((gross - tax) / gross * 100) if gross > 0 else 0
-        savings_potential = max(0, 150000 - deductions)  # Max section 80C limit
+        # Share of gross income kept after tax
+        effective = rate_table(app.calc_results["entity"], deductions).effective(gross)
+        tax_efficiency = (1 - effective) * 100 if gross > 0 else 0
+        savings_potential = savings_headroom(deductions, "old", app.calc_results["employment_type"],
+                                             app.calc_results["age"], income=gross)
         
         # Update efficiency labels
         efficiency_labels[0].config(text=f"{tax_efficiency:.1f}%")
         efficiency_labels[1].config(text=f"₹{savings_potential:,.0f}")
 
+@instrument.timed("details.render")
 def update_details_text(results):
     steps = results["steps"]
     emp_type = results.get("employment_type", "Salaried")
@@ -852,6 +856,35 @@ def update_details_text(results):
         f"  💰 TOTAL TAX: ₹{steps['total']:,.2f}",
         f"  🏠 Monthly EMI: ₹{results['emi']:,.2f}",
         f"  💵 NET TAKE-HOME: ₹{results['take_home']:,.2f}",
+    ])
+
+    if results["entity"] == "Individual":
+        regimes = compare_regimes(steps["gross"], steps["deductions"], results["age"])
+        detail_lines.extend([
+            "",
+            "⚖️ REGIME COMPARISON:",
+            "-" * 30,
+            f"  Old Regime Tax: ₹{regimes.old_tax:,.2f}",
+            f"  New Regime Tax: ₹{regimes.new_tax:,.2f}",
+            f"  ✅ {regimes.cheaper.title()} Regime saves ₹{regimes.difference:,.2f}"
+            if regimes.difference else "  Both regimes cost the same",
+        ])
+
+    income_range = results.get("income_range")
+    if income_range:
+        detail_lines.extend([
+            "",
+            f"🎲 IF INCOME VARIES (lognormal, σ={income_range['sigma']:g}):",
+            "-" * 30,
+            f"  Income (5th–95th percentile): ₹{income_range['income_p5']:,.0f} – ₹{income_range['income_p95']:,.0f}",
+            f"  Tax (5th–95th percentile): ₹{income_range['tax_p5']:,.0f} – ₹{income_range['tax_p95']:,.0f}",
+            f"  Take-home: ₹{income_range['take_home_p5']:,.0f} – ₹{income_range['take_home_p95']:,.0f}",
+        ])
+        for label, chance in income_range["slab_chances"].items():
+            if 0.01 <= chance <= 0.99:
+                detail_lines.append(f"  Chance of reaching the {label} slab: {chance:.0%}")
+
+    detail_lines.extend([
         "",
         f"📅 Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')}"
     ])
@@ -862,6 +895,77 @@ def update_details_text(results):
     txt_details.config(state="disabled")
 
 
+def _dashboard_figs():
+    """Return (open dashboard, render cache key), or (None, None)."""
+    dash = dashboards.current
+    if dash is None or not dash.tab_figures():
+        return None, None
+    return dash, _load_export().figure_cache_key(app.calc_results, dash.chart_mode_var.get())
+
+
+def _on_export_job_update(job):
+    """Show progress of the running export in the status line."""
+    pending = len(export_jobs.jobs)
+    if pending:
+        text = f"⏳ {job.label}: {job.progress:.0%}"
+        if pending > 1:
+            text += f" ({pending - 1} more queued)"
+        loading_label.config(text=text)
+    btn_cancel_export.config(state="normal" if pending else "disabled")
+
+
+def _on_export_done(job, kind, save_path):
+    if job.state == DONE:
+        loading_label.config(text=f"✅ {kind} report saved.")
+        messagebox.showinfo("Exported", f"{kind} report saved to: {save_path}")
+    elif job.state == FAILED:
+        loading_label.config(text=f"❌ {kind} export failed.")
+        messagebox.showerror("Export Error", f"Failed to export {kind}: {job.error}")
+    else:
+        loading_label.config(text=f"⏹ {kind} export cancelled.")
+
+
+def _submit_export(kind, exporter_name, save_path, operation):
+    """Queue an export job: figures are rasterized on the UI thread (one per
+    tick, through the render cache), the document is built on the worker.
+
+    Each render step is profiled as ``<operation>.render`` and the document
+    build as ``<exporter_name>.worker``."""
+    try:
+        export = _load_export()
+    except Exception as e:
+        messagebox.showerror("Export Error", f"Report export not available: {e}")
+        return
+    exporter = getattr(export, exporter_name)
+    results = app.calc_results
+    dash, cache_key = _dashboard_figs()
+    images = []
+    steps = export.dashboard_render_steps(dash, cache_key, images) if dash is not None else []
+
+    def profiled_step(step):
+        with profiling.operation(f"{operation}.render"):
+            step()
+
+    prepare = [lambda step=step: profiled_step(step) for step in steps]
+    # Reports saved from the form include the projection; bulk statements do not
+    extra = {"projection": True}
+    if exporter_name == "export_report_pdf":
+        # Without an open dashboard, draw the charts natively from the results
+        extra["vector_charts"] = dash is None
+
+    def work(job):
+        try:
+            with profiling.operation(f"{exporter_name}.worker"):
+                exporter(results, save_path, figs=images or None, progress=job.report, **extra)
+        except JobCancelled:
+            if os.path.exists(save_path):
+                os.remove(save_path)
+            raise
+
+    export_jobs.submit(f"{kind} → {os.path.basename(save_path)}", work, prepare=prepare,
+                       on_done=lambda job: _on_export_done(job, kind, save_path))
+
+
 def _export_pdf():
     if not hasattr(app, 'calc_results'):
         messagebox.showwarning("No Results", "Please run a calculation first.")
@@ -869,16 +973,9 @@ def _export_pdf():
     save_path = filedialog.asksaveasfilename(defaultextension='.pdf', filetypes=[('PDF files','*.pdf')], title='Save PDF Report')
     if not save_path:
         return
-    try:
-        figs = None
-        if hasattr(app, 'current_dashboard') and getattr(app, 'current_dashboard'):
-            dash = app.current_dashboard
-            figs = [getattr(dash, 'fig1', None), getattr(dash, 'fig2', None), getattr(dash, 'fig3', None)]
-            figs = [f for f in figs if f is not None]
-        export_report_pdf(app.calc_results, save_path, figs=figs)
-        messagebox.showinfo("Exported", f"PDF report saved to: {save_path}")
-    except Exception as e:
-        messagebox.showerror("Export Error", f"Failed to export PDF: {e}")
+    # Profiled after the file dialog so the wait for the user is not included
+    with profiling.operation("export_pdf"):
+        _submit_export("PDF", "export_report_pdf", save_path, "export_pdf")
 
 
 def _export_xlsx():
@@ -888,16 +985,8 @@ def _export_xlsx():
     save_path = filedialog.asksaveasfilename(defaultextension='.xlsx', filetypes=[('Excel files','*.xlsx')], title='Save Excel Report')
     if not save_path:
         return
-    try:
-        figs = None
-        if hasattr(app, 'current_dashboard') and getattr(app, 'current_dashboard'):
-            dash = app.current_dashboard
-            figs = [getattr(dash, 'fig1', None), getattr(dash, 'fig2', None), getattr(dash, 'fig3', None)]
-            figs = [f for f in figs if f is not None]
-        export_report_excel(app.calc_results, save_path, figs=figs)
-        messagebox.showinfo("Exported", f"Excel report saved to: {save_path}")
-    except Exception as e:
-        messagebox.showerror("Export Error", f"Failed to export Excel: {e}")
+    with profiling.operation("export_xlsx"):
+        _submit_export("Excel", "export_report_excel", save_path, "export_xlsx")
 
 def toggle_theme():
     current = app.style.theme.name
@@ -909,6 +998,7 @@ def toggle_theme():
         theme_btn.config(text="🌙 Dark Mode")
 
 def reset_form():
+    global loan_interest
     entry_pan.delete(0, tk.END)
     entry_pan.insert(0, "ABCDP1234F")
     employment_type_var.set("Salaried")
@@ -916,6 +1006,7 @@ def reset_form():
     income_var.set("750000")
     emi_var.set("10000")
     age_var.set("30")
+    loan_interest = 0.0
     txt_details.config(state="normal")
     txt_details.delete("1.0", tk.END)
     txt_details.config(state="disabled")
@@ -927,26 +1018,8 @@ def reset_form():
     efficiency_labels[0].config(text="0%")
     efficiency_labels[1].config(text="₹0")
     on_pan_change()
-
-# ------------------- MODERN ANDROID-STYLE UI BUILD -------------------
-app = ttk.Window(themename="morph")
-app.title("💼 TaxFlow Pro - Complete Tax Calculator")
-app.geometry("1300x1000")
-app.minsize(1200, 800)
-
-# Create employment type variable AFTER app is created
-employment_type_var = tk.StringVar(value="Salaried")
-
-# Load persisted theme and language preferences
-try:
-    saved_theme = app_config.get('theme')
-    if saved_theme:
-        app.style.theme_use(saved_theme)
-    saved_lang = app_config.get('language')
-    if saved_lang:
-        i18n.set_language(saved_lang)
-except Exception:
-    pass
+    # Resetting the fields must not trigger (or deliver) a live recalculation
+    recalc.cancel()
 
 def on_employment_type_change():
     """Update standard deduction based on employment type"""
@@ -956,356 +1029,378 @@ def on_employment_type_change():
     else:  # Self Employed
         deduction_var.set("0")
 
-# Financial input variables
-income_var = tk.StringVar(value="750000")
-deduction_var = tk.StringVar(value="75000")
-emi_var = tk.StringVar(value="10000")
-age_var = tk.StringVar(value="30")
-
-# Modern header
-header_frame = ttk.Frame(app, padding=(40, 25, 40, 20))
-header_frame.pack(fill="x")
-
-# Main title
-title_container = ttk.Frame(header_frame)
-title_container.pack(fill="x", pady=(0, 10))
-
-ttk.Label(
-    title_container,
-    text="💼",
-    font=("Segoe UI", 32)
-).pack(side="left", padx=(0, 15))
-
-title_text = ttk.Frame(title_container)
-title_text.pack(side="left")
-
-ttk.Label(
-    title_text,
-    text="TaxFlow Pro",
-    font=("Segoe UI", 28, "bold")
-).pack(anchor="w")
-
-ttk.Label(
-    title_text,
-    text="Complete AI-Powered Tax Calculator & Financial Insights",
-    font=("Segoe UI", 12),
-    bootstyle="secondary"
-).pack(anchor="w", pady=(5, 0))
-
-# Theme toggle
-theme_btn = ttk.Button(header_frame, text="🌙 Dark Mode", command=toggle_theme, 
-                      bootstyle="outline", width=15)
-theme_btn.pack(anchor="ne", pady=(0, 10))
-
-# Main content
-main_container = ttk.Frame(app, padding=30)
-main_container.pack(fill="both", expand=True)
-
-# Left column - Input and Quick Results
-left_column = ttk.Frame(main_container)
-left_column.pack(side="left", fill="both", expand=True, padx=(0, 15))
-
-# Right column - Detailed Analysis
-right_column = ttk.Frame(main_container)
-right_column.pack(side="right", fill="both", expand=True, padx=(15, 0))
-
-# Input section
-input_card = ModernCard(left_column, title="📝 Financial Profile")
-input_card.pack(fill="x", pady=(0, 20))
-
-# Input grid
-input_grid = ttk.Frame(input_card.content)
-input_grid.pack(fill="x", pady=10)
-
-# PAN input
-pan_frame = ttk.Frame(input_grid)
-pan_frame.pack(fill="x", pady=12)
-
-ttk.Label(pan_frame, text="PAN Number", font=("Segoe UI", 11, "bold")).pack(side="left")
-entry_pan = ttk.Entry(pan_frame, font=("Segoe UI", 11), width=25)
-entry_pan.pack(side="left", padx=(20, 30))
-entry_pan.insert(0, "ABCDP1234F")
-entry_pan.bind("<KeyRelease>", on_pan_change)
-entry_pan.bind("<FocusOut>", autofill_pan)
-
-entity_label = ttk.Label(pan_frame, text="👤 Individual", font=("Segoe UI", 10), bootstyle="success")
-entity_label.pack(side="left")
-
-# Employment Type Selection (Salaried vs Self Employed)
-employment_frame = ttk.Frame(input_grid)
-employment_frame.pack(fill="x", pady=12)
-
-ttk.Label(employment_frame, text="Employment Type", font=("Segoe UI", 11, "bold")).pack(side="left")
-
-radio_frame = ttk.Frame(employment_frame)
-radio_frame.pack(side="left", padx=(20, 0))
-
-ttk.Radiobutton(
-    radio_frame, 
-    text="💼 Salaried", 
-    variable=employment_type_var, 
-    value="Salaried",
-    command=on_employment_type_change,
-    bootstyle="info"
-).pack(side="left", padx=(0, 20))
-
-ttk.Radiobutton(
-    radio_frame, 
-    text="👨‍💼 Self Employed", 
-    variable=employment_type_var, 
-    value="Self Employed",
-    command=on_employment_type_change,
-    bootstyle="warning"
-).pack(side="left")
+# Deductible home-loan interest last added to the deductions by the loan dialog
+loan_interest = 0.0
 
-# ------------------- CUSTOM INPUT WITH DROPDOWN -------------------
-class FlexibleInput(ttk.Frame):
-    """Entry field with Frame-based dropdown for preset values"""
-    def __init__(self, parent, variable, presets, **kwargs):
-        super().__init__(parent, **kwargs)
-        self.variable = variable
-        self.presets = presets
-        self.dropdown_open = False
-        self.root = parent
-        
-        # Find root window
-        w = parent
-        while hasattr(w, 'master') and w.master:
-            w = w.master
-        self.root_window = w
-        
-        # Container for entry and dropdown button
-        input_container = ttk.Frame(self)
-        input_container.pack(fill="x", expand=True)
-        
-        # Manual entry field
-        self.entry = ttk.Entry(input_container, textvariable=variable, font=("Segoe UI", 10), width=20)
-        self.entry.pack(side="left", fill="both", expand=True, padx=(0, 8))
-        
-        # Dropdown button
-        self.dropdown_btn = ttk.Button(
-            input_container, 
-            text="▼", 
-            width=3,
-            command=self.toggle_dropdown,
-            bootstyle="secondary-outline"
-        )
-        self.dropdown_btn.pack(side="left")
-        
-        # Create hidden dropdown frame (will be placed dynamically)
-        self.dropdown_frame = tk.Frame(self.root_window, bg="white", relief="solid", borderwidth=1)
-        
-        # Listbox for presets
-        scrollbar = ttk.Scrollbar(self.dropdown_frame)
-        scrollbar.pack(side="right", fill="y")
-        
-        self.listbox = tk.Listbox(
-            self.dropdown_frame, 
-            font=("Segoe UI", 10),
-            yscrollcommand=scrollbar.set,
-            height=6,
-            width=20,
-            relief="flat"
-        )
-        self.listbox.pack(side="left", fill="both", expand=True)
-        scrollbar.config(command=self.listbox.yview)
-        
-        # Populate listbox
-        for preset in presets:
-            self.listbox.insert(tk.END, preset)
-        
-        # Bind selection
-        self.listbox.bind("<Button-1>", self.on_select)
-        self.listbox.bind("<Return>", self.on_select)
-        self.listbox.bind("<Escape>", lambda e: self.close_dropdown())
-        
-        # Bind entry focus loss
-        self.entry.bind("<FocusOut>", lambda e: self.after(100, self.close_dropdown_safe))
-        
-        # Bind root window click to close dropdown
-        self.root_window.bind("<Button-1>", self.on_root_click, add=True)
-    
-    def toggle_dropdown(self):
-        if self.dropdown_open:
-            self.close_dropdown()
-        else:
-            self.open_dropdown()
-    
-    def open_dropdown(self):
-        if self.dropdown_open:
-            return
-        
-        self.dropdown_open = True
-        
-        # Get entry position
-        x = self.entry.winfo_rootx()
-        y = self.entry.winfo_rooty() + self.entry.winfo_height() + 2
-        width = self.entry.winfo_width() + self.dropdown_btn.winfo_width() + 8
-        
-        # Place dropdown frame absolutely on root window
-        self.dropdown_frame.place(x=x, y=y, width=width, height=140)
-        self.listbox.focus()
-    
-    def close_dropdown(self):
-        self.dropdown_open = False
-        self.dropdown_frame.place_forget()
-    
-    def close_dropdown_safe(self):
-        if self.dropdown_open:
-            self.close_dropdown()
-    
-    def on_root_click(self, event):
-        # Close dropdown if click is outside the entry/button/dropdown
-        if self.dropdown_open:
-            if not (self.entry.winfo_ismapped() or self.dropdown_btn.winfo_ismapped()):
-                return
-            
-            # Check if click is within entry, button, or dropdown
-            entry_x0 = self.entry.winfo_rootx()
-            entry_x1 = entry_x0 + self.entry.winfo_width()
-            btn_x0 = self.dropdown_btn.winfo_rootx()
-            btn_x1 = btn_x0 + self.dropdown_btn.winfo_width()
-            
-            dropdown_x0 = self.dropdown_frame.winfo_rootx()
-            dropdown_x1 = dropdown_x0 + self.dropdown_frame.winfo_width()
-            
-            entry_y0 = self.entry.winfo_rooty()
-            entry_y1 = entry_y0 + self.entry.winfo_height()
-            
-            dropdown_y0 = self.dropdown_frame.winfo_rooty()
-            dropdown_y1 = dropdown_y0 + self.dropdown_frame.winfo_height()
-            
-            click_in_entry = (entry_x0 <= event.x_root <= entry_x1 and entry_y0 <= event.y_root <= entry_y1)
-            click_in_btn = (btn_x0 <= event.x_root <= btn_x1 and entry_y0 <= event.y_root <= entry_y1)
-            click_in_dropdown = (dropdown_x0 <= event.x_root <= dropdown_x1 and dropdown_y0 <= event.y_root <= dropdown_y1)
-            
-            if not (click_in_entry or click_in_btn or click_in_dropdown):
-                self.close_dropdown()
-    
-    def on_select(self, event):
-        selection = self.listbox.curselection()
-        if selection:
-            value = self.listbox.get(selection[0])
-            self.variable.set(value)
-            self.close_dropdown()
 
-# Financial inputs
-financial_inputs = [
-    ("💰 Annual Income", "750000", ["500000", "750000", "1000000", "1500000", "2000000"]),
-    ("📉 Deductions", "50000", ["0", "50000", "100000", "150000", "200000"]),
-    ("🏠 Monthly EMI", "10000", ["0", "5000", "10000", "15000", "20000", "25000"]),
-    ("👤 Age", "30", [str(i) for i in range(18, 101, 5)])
-]
+def _deductible_interest(loan, regime=REGIME):
+    """First-year interest of `loan` allowed under 24(b) (none in the New Regime)."""
+    return allowed_deductions({"24b": loan["interest"]}, regime)["24b"]
 
-variables = [income_var, deduction_var, emi_var, age_var]
 
-for i, (label, default, values) in enumerate(financial_inputs):
-    row = ttk.Frame(input_grid)
-    row.pack(fill="x", pady=8)
-    
-    ttk.Label(row, text=label, font=("Segoe UI", 10), width=15).pack(side="left")
-    
-    FlexibleInput(row, variables[i], values).pack(side="left", padx=(15, 0), fill="x", expand=True)
+def _apply_loan(amount, rate_pct, years):
+    """Fill EMI and deductions from a home loan (first year's 24(b) interest,
+    if the regime allows it)."""
+    global loan_interest
+    loan = loan_inputs(amount, rate_pct / 100, int(round(years * 12)))
+    interest = _deductible_interest(loan)
+    try:
+        current = float(deduction_var.get())
+    except ValueError:
+        current = loan_interest
+    deduction_var.set(f"{max(0.0, current - loan_interest) + interest:.0f}")
+    emi_var.set(f"{loan['emi']:.0f}")
+    loan_interest = interest
+    return loan
+
+
+def open_loan_dialog():
+    dialog = ttk.Toplevel(title="🏦 Home Loan")
+    dialog.transient(app)
+    frame = ttk.Frame(dialog, padding=20)
+    frame.pack(fill="both", expand=True)
+    fields = [("Loan Amount (₹)", "5000000"), ("Interest Rate (% p.a.)", "8.5"), ("Tenure (years)", "20")]
+    loan_vars = []
+    for label, default in fields:
+        row = ttk.Frame(frame)
+        row.pack(fill="x", pady=6)
+        ttk.Label(row, text=label, font=("Segoe UI", 10), width=22).pack(side="left")
+        var = tk.StringVar(value=default)
+        ttk.Entry(row, textvariable=var, width=16).pack(side="left")
+        loan_vars.append(var)
+    summary = ttk.Label(frame, text="", font=("Segoe UI", 10))
+    summary.pack(fill="x", pady=(10, 0))
+
+    def apply():
+        try:
+            amount, rate_pct, years = (float(v.get()) for v in loan_vars)
+        except ValueError:
+            messagebox.showerror("Error", "Please enter valid numeric values", parent=dialog)
+            return
+        loan = _apply_loan(amount, rate_pct, years)
+        deductible = (f"₹{loan_interest:,.0f} deductible under 24(b)" if REGIME == "old"
+                      else "not deductible under the New Regime")
+        summary.config(text=f"EMI ₹{loan['emi']:,.0f} · first-year interest ₹{loan['interest']:,.0f} "
+                            f"({deductible})")
+
+    buttons = ttk.Frame(frame)
+    buttons.pack(fill="x", pady=(15, 0))
+    ttk.Button(buttons, text="Apply", command=apply, bootstyle="success").pack(side="left", padx=(0, 10))
+    ttk.Button(buttons, text="Close", command=dialog.destroy, bootstyle="secondary").pack(side="left")
 
-# Action buttons
-action_frame = ttk.Frame(left_column)
-action_frame.pack(fill="x", pady=(0, 20))
 
-btn_calculate = ttk.Button(action_frame, text="🚀 Calculate Tax", command=calculate_tax, 
-                          bootstyle="success", width=20)
-btn_calculate.pack(side="left", padx=(0, 15))
-btn_calculate.config(state="disabled")
+def _create_dashboard(results):
+    with instrument.span("dashboard.build"):
+        return CompleteDashboard(results["steps"], results["emi"], results["entity"],
+                                 results["age"], results["employment_type"], results["regime"])
 
-btn_reset = ttk.Button(action_frame, text="🔄 Reset", command=reset_form, 
-                     bootstyle="warning", width=15)
-btn_reset.pack(side="left", padx=(0, 15))
 
+@profiling.profiled("open_dashboard")
 def _open_dashboard():
-    # Create and store the dashboard instance on the app so exports can access figures
-    app.current_dashboard = CompleteDashboard(app.calc_results["steps"], 
-                                               app.calc_results["emi"], 
-                                               app.calc_results["entity"])
-
-btn_dashboard = ttk.Button(action_frame, text="📊 View Dashboard", 
-                          command=_open_dashboard,
-                          bootstyle="info", width=18)
-btn_dashboard.pack(side="left", padx=(0, 20))
-btn_dashboard.config(state="disabled")
-
-# Export buttons (disabled until a calculation is run)
-btn_export_pdf = ttk.Button(action_frame, text="📄 Export PDF", bootstyle="secondary", width=16, command=_export_pdf)
-btn_export_pdf.pack(side="left", padx=(0, 8))
-btn_export_pdf.config(state="disabled")
-
-btn_export_xlsx = ttk.Button(action_frame, text="📁 Export Excel", bootstyle="secondary", width=16, command=_export_xlsx)
-btn_export_xlsx.pack(side="left", padx=(0, 8))
-btn_export_xlsx.config(state="disabled")
-
-loading_label = ttk.Label(action_frame, text="", font=("Segoe UI", 11, "bold"), bootstyle="info")
-loading_label.pack(side="left")
-
-# Quick results card
-quick_card = ModernCard(left_column, title="⚡ Quick Results")
-quick_card.pack(fill="x", pady=(0, 20))
-
-quick_content = ttk.Frame(quick_card.content)
-quick_content.pack(fill="x", pady=15)
-
-ttk.Label(quick_content, text="Tax Payable", font=("Segoe UI", 12)).grid(row=0, column=0, sticky="w", pady=8)
-lbl_tax = ttk.Label(quick_content, text="₹0", font=("Segoe UI", 20, "bold"), bootstyle="danger")
-lbl_tax.grid(row=0, column=1, sticky="e", pady=8)
-
-ttk.Label(quick_content, text="Net Take-Home", font=("Segoe UI", 12)).grid(row=1, column=0, sticky="w", pady=8)
-lbl_takehome = ttk.Label(quick_content, text="₹0", font=("Segoe UI", 20, "bold"), bootstyle="success")
-lbl_takehome.grid(row=1, column=1, sticky="e", pady=8)
-
-quick_content.columnconfigure(1, weight=1)
-
-# Efficiency card
-efficiency_card = ModernCard(left_column, title="📊 Efficiency Metrics")
-efficiency_card.pack(fill="x")
-
-efficiency_content = ttk.Frame(efficiency_card.content)
-efficiency_content.pack(fill="x", pady=15)
-
-ttk.Label(efficiency_content, text="Tax Efficiency", font=("Segoe UI", 11)).grid(row=0, column=0, sticky="w", pady=6)
-efficiency_label1 = ttk.Label(efficiency_content, text="0%", font=("Segoe UI", 16, "bold"), bootstyle="info")
-efficiency_label1.grid(row=0, column=1, sticky="e", pady=6)
-
-ttk.Label(efficiency_content, text="Savings Potential", font=("Segoe UI", 11)).grid(row=1, column=0, sticky="w", pady=6)
-efficiency_label2 = ttk.Label(efficiency_content, text="₹0", font=("Segoe UI", 16, "bold"), bootstyle="warning")
-efficiency_label2.grid(row=1, column=1, sticky="e", pady=6)
-
-efficiency_labels = [efficiency_label1, efficiency_label2]
-efficiency_content.columnconfigure(1, weight=1)
-
-# Detailed analysis card
-details_card = ModernCard(right_column, title="📋 Detailed Tax Analysis")
-details_card.pack(fill="both", expand=True)
-
-# Text area with scroll
-text_container = ttk.Frame(details_card.content)
-text_container.pack(fill="both", expand=True)
-
-txt_details = tk.Text(
-    text_container, 
-    wrap="word", 
-    font=("Segoe UI", 10),
-    bg="#f8f9fa",
-    fg="#2d3436",
-    relief="flat",
-    padx=20,
-    pady=20,
-    borderwidth=0
-)
-scrollbar = ttk.Scrollbar(text_container, command=txt_details.yview)
-txt_details.configure(yscrollcommand=scrollbar.set)
-
-txt_details.pack(side="left", fill="both", expand=True)
-scrollbar.pack(side="right", fill="y")
-txt_details.config(state="disabled")
-
-# Initialize
-app.after(100, on_pan_change)
-
-app.mainloop()
\ No newline at end of file
+    # One dashboard window is kept and updated in place (exports read its figures)
+    dashboards.open(app.calc_results)
+
+# ------------------- MODERN ANDROID-STYLE UI BUILD -------------------
+def create_app():
+    """Build the main window and return it (without entering the main loop).
+
+    Widgets used by the module-level callbacks are published as globals.
+    Charting and export modules are not imported here; they load on first
+    use of the dashboard or an export.
+    """
+    global app, export_jobs, dashboards, recalc, live_var, employment_type_var, income_var, deduction_var, emi_var, age_var
+    global theme_btn, entry_pan, entity_label, btn_calculate, btn_dashboard
+    global btn_export_pdf, btn_export_xlsx, btn_cancel_export, loading_label
+    global lbl_tax, lbl_takehome, efficiency_labels, txt_details
+
+    app = ttk.Window(themename="morph")
+    app.title("💼 TaxFlow Pro - Complete Tax Calculator")
+    app.geometry("1300x1000")
+    app.minsize(1200, 800)
+    startup_timer.mark("main window created")
+
+    # Exports run in the background; progress is reported through app.after
+    export_jobs = JobManager(app.after, on_update=_on_export_job_update)
+    dashboards = DashboardManager(_create_dashboard)
+    recalc = LiveCalculator(app.after, _compute_results, _show_results, on_error=_on_calc_error)
+
+    # Create employment type variable AFTER app is created
+    employment_type_var = tk.StringVar(value="Salaried")
+
+    # Load persisted theme and language preferences
+    try:
+        saved_theme = app_config.get('theme')
+        if saved_theme:
+            app.style.theme_use(saved_theme)
+        saved_lang = app_config.get('language')
+        if saved_lang:
+            i18n.set_language(saved_lang)
+    except Exception:
+        pass
+
+    # Financial input variables
+    income_var = tk.StringVar(value="750000")
+    deduction_var = tk.StringVar(value="75000")
+    emi_var = tk.StringVar(value="10000")
+    age_var = tk.StringVar(value="30")
+
+    # Modern header
+    header_frame = ttk.Frame(app, padding=(40, 25, 40, 20))
+    header_frame.pack(fill="x")
+
+    # Main title
+    title_container = ttk.Frame(header_frame)
+    title_container.pack(fill="x", pady=(0, 10))
+
+    ttk.Label(
+        title_container,
+        text="💼",
+        font=("Segoe UI", 32)
+    ).pack(side="left", padx=(0, 15))
+
+    title_text = ttk.Frame(title_container)
+    title_text.pack(side="left")
+
+    ttk.Label(
+        title_text,
+        text="TaxFlow Pro",
+        font=("Segoe UI", 28, "bold")
+    ).pack(anchor="w")
+
+    ttk.Label(
+        title_text,
+        text="Complete AI-Powered Tax Calculator & Financial Insights",
+        font=("Segoe UI", 12),
+        bootstyle="secondary"
+    ).pack(anchor="w", pady=(5, 0))
+
+    # Theme toggle
+    theme_btn = ttk.Button(header_frame, text="🌙 Dark Mode", command=toggle_theme, 
+                          bootstyle="outline", width=15)
+    theme_btn.pack(anchor="ne", pady=(0, 10))
+
+    # Main content
+    main_container = ttk.Frame(app, padding=30)
+    main_container.pack(fill="both", expand=True)
+
+    # Left column - Input and Quick Results
+    left_column = ttk.Frame(main_container)
+    left_column.pack(side="left", fill="both", expand=True, padx=(0, 15))
+
+    # Right column - Detailed Analysis
+    right_column = ttk.Frame(main_container)
+    right_column.pack(side="right", fill="both", expand=True, padx=(15, 0))
+
+    # Input section
+    input_card = ModernCard(left_column, title="📝 Financial Profile")
+    input_card.pack(fill="x", pady=(0, 20))
+
+    # Input grid
+    input_grid = ttk.Frame(input_card.content)
+    input_grid.pack(fill="x", pady=10)
+
+    # PAN input
+    pan_frame = ttk.Frame(input_grid)
+    pan_frame.pack(fill="x", pady=12)
+
+    ttk.Label(pan_frame, text="PAN Number", font=("Segoe UI", 11, "bold")).pack(side="left")
+    entry_pan = ttk.Entry(pan_frame, font=("Segoe UI", 11), width=25)
+    entry_pan.pack(side="left", padx=(20, 30))
+    entry_pan.insert(0, "ABCDP1234F")
+    entry_pan.bind("<KeyRelease>", on_pan_change)
+    entry_pan.bind("<FocusOut>", autofill_pan)
+
+    entity_label = ttk.Label(pan_frame, text="👤 Individual", font=("Segoe UI", 10), bootstyle="success")
+    entity_label.pack(side="left")
+
+    # Employment Type Selection (Salaried vs Self Employed)
+    employment_frame = ttk.Frame(input_grid)
+    employment_frame.pack(fill="x", pady=12)
+
+    ttk.Label(employment_frame, text="Employment Type", font=("Segoe UI", 11, "bold")).pack(side="left")
+
+    radio_frame = ttk.Frame(employment_frame)
+    radio_frame.pack(side="left", padx=(20, 0))
+
+    ttk.Radiobutton(
+        radio_frame, 
+        text="💼 Salaried", 
+        variable=employment_type_var, 
+        value="Salaried",
+        command=on_employment_type_change,
+        bootstyle="info"
+    ).pack(side="left", padx=(0, 20))
+
+    ttk.Radiobutton(
+        radio_frame, 
+        text="👨‍💼 Self Employed", 
+        variable=employment_type_var, 
+        value="Self Employed",
+        command=on_employment_type_change,
+        bootstyle="warning"
+    ).pack(side="left")
+
+    # Financial inputs
+    financial_inputs = [
+        ("💰 Annual Income", "750000", ["500000", "750000", "1000000", "1500000", "2000000"]),
+        ("📉 Deductions", "50000", ["0", "50000", "100000", "150000", "200000"]),
+        ("🏠 Monthly EMI", "10000", ["0", "5000", "10000", "15000", "20000", "25000"]),
+        ("👤 Age", "30", [str(i) for i in range(18, 101, 5)])
+    ]
+
+    variables = [income_var, deduction_var, emi_var, age_var]
+
+    for i, (label, default, values) in enumerate(financial_inputs):
+        row = ttk.Frame(input_grid)
+        row.pack(fill="x", pady=8)
+
+        ttk.Label(row, text=label, font=("Segoe UI", 10), width=15).pack(side="left")
+
+        FlexibleInput(row, variables[i], values).pack(side="left", padx=(15, 0), fill="x", expand=True)
+        variables[i].trace_add('write', _on_input_change)
+
+    ttk.Button(input_grid, text="🏦 EMI & interest from a home loan", command=open_loan_dialog,
+               bootstyle="info-link").pack(anchor="w")
+
+    startup_timer.mark("input form built")
+
+    # Action buttons
+    action_frame = ttk.Frame(left_column)
+    action_frame.pack(fill="x", pady=(0, 20))
+
+    btn_calculate = ttk.Button(action_frame, text="🚀 Calculate Tax", command=calculate_tax, 
+                              bootstyle="success", width=20)
+    btn_calculate.pack(side="left", padx=(0, 15))
+    btn_calculate.config(state="disabled")
+
+    live_var = tk.BooleanVar(value=bool(app_config.get('live_recalc', False)))
+    ttk.Checkbutton(action_frame, text="⚡ Live", variable=live_var, command=_on_live_toggle,
+                    bootstyle="success-round-toggle").pack(side="left", padx=(0, 15))
+
+    btn_reset = ttk.Button(action_frame, text="🔄 Reset", command=reset_form, 
+                         bootstyle="warning", width=15)
+    btn_reset.pack(side="left", padx=(0, 15))
+
+    btn_dashboard = ttk.Button(action_frame, text="📊 View Dashboard", 
+                              command=_open_dashboard,
+                              bootstyle="info", width=18)
+    btn_dashboard.pack(side="left", padx=(0, 20))
+    btn_dashboard.config(state="disabled")
+
+    # Export buttons (disabled until a calculation is run)
+    btn_export_pdf = ttk.Button(action_frame, text="📄 Export PDF", bootstyle="secondary", width=16, command=_export_pdf)
+    btn_export_pdf.pack(side="left", padx=(0, 8))
+    btn_export_pdf.config(state="disabled")
+
+    btn_export_xlsx = ttk.Button(action_frame, text="📁 Export Excel", bootstyle="secondary", width=16, command=_export_xlsx)
+    btn_export_xlsx.pack(side="left", padx=(0, 8))
+    btn_export_xlsx.config(state="disabled")
+
+    btn_cancel_export = ttk.Button(action_frame, text="✖ Cancel Export", bootstyle="danger-outline", width=14,
+                                   command=lambda: export_jobs.cancel())
+    btn_cancel_export.pack(side="left", padx=(0, 8))
+    btn_cancel_export.config(state="disabled")
+
+    loading_label = ttk.Label(action_frame, text="", font=("Segoe UI", 11, "bold"), bootstyle="info")
+    loading_label.pack(side="left")
+
+    # Quick results card
+    quick_card = ModernCard(left_column, title="⚡ Quick Results")
+    quick_card.pack(fill="x", pady=(0, 20))
+
+    quick_content = ttk.Frame(quick_card.content)
+    quick_content.pack(fill="x", pady=15)
+
+    ttk.Label(quick_content, text="Tax Payable", font=("Segoe UI", 12)).grid(row=0, column=0, sticky="w", pady=8)
+    lbl_tax = ttk.Label(quick_content, text="₹0", font=("Segoe UI", 20, "bold"), bootstyle="danger")
+    lbl_tax.grid(row=0, column=1, sticky="e", pady=8)
+
+    ttk.Label(quick_content, text="Net Take-Home", font=("Segoe UI", 12)).grid(row=1, column=0, sticky="w", pady=8)
+    lbl_takehome = ttk.Label(quick_content, text="₹0", font=("Segoe UI", 20, "bold"), bootstyle="success")
+    lbl_takehome.grid(row=1, column=1, sticky="e", pady=8)
+
+    quick_content.columnconfigure(1, weight=1)
+
+    # Efficiency card
+    efficiency_card = ModernCard(left_column, title="📊 Efficiency Metrics")
+    efficiency_card.pack(fill="x")
+
+    efficiency_content = ttk.Frame(efficiency_card.content)
+    efficiency_content.pack(fill="x", pady=15)
+
+    ttk.Label(efficiency_content, text="Tax Efficiency", font=("Segoe UI", 11)).grid(row=0, column=0, sticky="w", pady=6)
+    efficiency_label1 = ttk.Label(efficiency_content, text="0%", font=("Segoe UI", 16, "bold"), bootstyle="info")
+    efficiency_label1.grid(row=0, column=1, sticky="e", pady=6)
+
+    ttk.Label(efficiency_content, text="Savings Potential", font=("Segoe UI", 11)).grid(row=1, column=0, sticky="w", pady=6)
+    efficiency_label2 = ttk.Label(efficiency_content, text="₹0", font=("Segoe UI", 16, "bold"), bootstyle="warning")
+    efficiency_label2.grid(row=1, column=1, sticky="e", pady=6)
+
+    efficiency_labels = [efficiency_label1, efficiency_label2]
+    efficiency_content.columnconfigure(1, weight=1)
+
+    # Detailed analysis card
+    details_card = ModernCard(right_column, title="📋 Detailed Tax Analysis")
+    details_card.pack(fill="both", expand=True)
+
+    # Text area with scroll
+    text_container = ttk.Frame(details_card.content)
+    text_container.pack(fill="both", expand=True)
+
+    txt_details = tk.Text(
+        text_container, 
+        wrap="word", 
+        font=("Segoe UI", 10),
+        bg="#f8f9fa",
+        fg="#2d3436",
+        relief="flat",
+        padx=20,
+        pady=20,
+        borderwidth=0
+    )
+    scrollbar = ttk.Scrollbar(text_container, command=txt_details.yview)
+    txt_details.configure(yscrollcommand=scrollbar.set)
+
+    txt_details.pack(side="left", fill="both", expand=True)
+    scrollbar.pack(side="right", fill="y")
+    txt_details.config(state="disabled")
+
+    # Initialize
+    app.after(100, on_pan_change)
+
+    return app
+
+
+def main(argv=None):
+    """Run the GUI. ``--startup-timing`` prints per-import and per-phase times,
+    ``--profile`` writes per-operation profiles to the diagnostics folder."""
+    argv = sys.argv[1:] if argv is None else argv
+    if "--startup-timing" in argv:
+        startup_timer.enabled = True
+    instrument.configure()
+    profiling.configure(argv)
+    with startup_timer.phase("create_app"):
+        create_app()
+    startup_timer.mark("create_app done")
+
+    def _first_idle():
+        app.update_idletasks()
+        startup_timer.mark("window shown")
+        startup_timer.emit()
+
+    app.after_idle(_first_idle)
+    app.mainloop()
+    # Lazy imports (dashboard, export) happened after the first report
+    if any(name.startswith("load ") for _, name, _ in startup_timer.entries):
+        startup_timer.emit()
+    if instrument.is_enabled():
+        frames = animator.stats()
+        instrument.gauge("frames.total", frames["frames"])
+        instrument.gauge("frames.dropped", frames["dropped"])
+        instrument.gauge("frames.max_ms", round(frames["max_ms"], 2))
+        instrument.gauge("live.dropped", recalc.dropped)
+        instrument.write_summary()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,21 +2,24 @@
 TaxLib — Core tax calculation and PAN validation library for TaxFlow Pro.
 
 Provides:
-- Tax calculations (individual & corporate)
+- Tax calculations (individual & corporate, old vs new regime)
 - PAN validation & entity detection
 - SQLite database operations for persisting user data
 """
 
-from .calculations import calculate_individual_tax, calculate_corporate_tax
+from .calculations import calculate_individual_tax, calculate_corporate_tax, calculate_pan_results, compare_regimes
 from .pan import validate_pan, get_pan_entity_type
-from .db import save_pan_data_db, get_pan_data_db
+from .db import save_pan_data_db, get_pan_data_db, iter_pan_data_db
 
 __version__ = "1.0.0"
 __all__ = [
     "calculate_individual_tax",
     "calculate_corporate_tax",
+    "calculate_pan_results",
+    "compare_regimes",
     "validate_pan",
     "get_pan_entity_type",
     "save_pan_data_db",
     "get_pan_data_db",
+    "iter_pan_data_db",
 ]
@@ -0,0 +1,241 @@
+"""Headless bulk generation of PDF tax statements.
+
+Builds one PDF statement per calculation result using ``export_report_pdf``
+without any GUI; charts are drawn natively by reportlab, so matplotlib is
+never loaded. Documents are built in a process pool with a bounded number
+of jobs in flight, each PDF is written as soon as it completes, and a run can
+be resumed after an interruption: statements that already exist on disk are
+skipped (files are written under a temporary name and renamed when done, so a
+partially written PDF is never mistaken for a finished one).
+
+Usage::
+
+    python -m taxlib.bulk OUT_DIR [--db tax_calculator.db] [--csv batch.csv]
+"""
+
+import argparse
+import csv
+import os
+import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Callable, Iterable, Optional
+
+from . import db
+from .calculations import calculate_pan_results
+from .deductions import CLAIMABLE, allowed_deductions
+from .export import export_report_pdf
+from .loans import FY_START_MONTH, loan_inputs
+
+PART_SUFFIX = ".part"
+
+
+def _skip(errors: Optional[list], pan, error):
+    if errors is not None:
+        errors.append((pan, str(error)))
+
+
+def records_from_db(db_file: Optional[str] = None, employment_type: str = "Salaried",
+                    errors: Optional[list] = None):
+    """Yield calculation results for every PAN saved in the database.
+
+    The DB does not store the employment type, so `employment_type` is
+    applied to every record. Records that cannot be calculated are skipped;
+    pass a list as `errors` to collect them as (pan, message) tuples.
+    """
+    for row in db.iter_pan_data_db(db_file=db_file):
+        try:
+            results = calculate_pan_results(row["pan"], row["income"], row["deductions"],
+                                            row["emi"], row["age"], employment_type)
+        except Exception as e:
+            _skip(errors, row["pan"], e)
+            continue
+        yield results
+
+
+def _csv_record(row: dict) -> dict:
+    employment_type = row.get("employment_type") or "Salaried"
+    regime = row.get("regime") or "new"
+    age = int(row["age"])
+    loan = None
+    if row.get("loan_amount"):
+        loan = loan_inputs(float(row["loan_amount"]), float(row["loan_rate"]), int(row["loan_months"]),
+                           int(row.get("loan_start_month") or FY_START_MONTH), int(row.get("loan_year") or 0))
+    if row.get("deductions"):
+        deductions = float(row["deductions"])
+    else:
+        claims = {s: float(row[s]) for s in CLAIMABLE if row.get(s)}
+        for section, amount in (loan["claims"] if loan else {}).items():
+            claims[section] = claims.get(section, 0.0) + amount
+        deductions = allowed_deductions(claims, regime, employment_type, age)["total"]
+    return calculate_pan_results(
+        row["pan"],
+        float(row["income"]),
+        deductions,
+        float(row["emi"]) if row.get("emi") else (loan["emi"] if loan else 0.0),
+        age,
+        employment_type,
+        regime,
+    )
+
+
+def records_from_csv(path: str, errors: Optional[list] = None):
+    """Yield calculation results for each row of a batch CSV file.
+
+    Expected columns: pan, income, emi, age, and either deductions or
+    per-section claims (80C, 80CCD(1B), 80D, 80D_parents, 24b), which are
+    capped by ``deductions.allowed_deductions``. Optional columns:
+    employment_type (defaults to "Salaried") and regime ("new" or "old",
+    defaults to "new").
+
+    A home loan can be given instead of the EMI with loan_amount,
+    loan_rate (annual, as a fraction) and loan_months, plus optionally
+    loan_start_month (1-12) and loan_year (financial year of the loan to
+    claim for, 0 = first). Its EMI fills an empty emi column and, with
+    per-section claims, its interest and principal for that year are
+    claimed under 24b and 80C (see ``loans.loan_inputs``).
+
+    Malformed rows (missing columns, values that are not numbers) are
+    skipped; pass a list as `errors` to collect them as (pan, message)
+    tuples, where the message names the CSV line.
+    """
+    with open(path, newline='', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            try:
+                results = _csv_record(row)
+            except Exception as e:
+                message = f"missing column {e}" if isinstance(e, KeyError) else e
+                _skip(errors, row.get("pan") or None, f"line {reader.line_num}: {message}")
+                continue
+            yield results
+
+
+def statement_filename(results: dict) -> str:
+    """Return the statement file name for a result (one file per PAN)."""
+    return f"{results['pan']}.pdf"
+
+
+def _build_statement(results: dict, path: str, charts: bool = True) -> str:
+    """Build one statement PDF atomically. Runs inside pool workers."""
+    tmp = path + PART_SUFFIX
+    try:
+        export_report_pdf(results, tmp, vector_charts=charts)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    return path
+
+
+def generate_statements(records: Iterable[dict], out_dir: str, workers: Optional[int] = None,
+                        max_pending: Optional[int] = None, overwrite: bool = False,
+                        charts: bool = True, progress: Optional[Callable[[int, int, int], None]] = None) -> dict:
+    """Generate a PDF statement for every result in `records`.
+
+    Args:
+        records: iterable of result dicts (see ``calculate_pan_results``);
+            consumed lazily, so generators over a DB cursor or CSV work.
+        out_dir: folder receiving ``<PAN>.pdf`` files (created if missing)
+        workers: number of worker processes; ``0`` builds in-process,
+            ``None`` uses one per CPU
+        max_pending: maximum jobs submitted but not finished (default
+            ``4 * workers``); bounds memory for very large batches
+        overwrite: rebuild statements that already exist instead of skipping
+        charts: include the vector income/slab/component charts
+        progress: optional ``progress(written, skipped, failed)`` callback,
+            called after every finished statement
+
+    Returns:
+        dict: {written, skipped, failed, errors} where errors is a list of
+        (pan, message) tuples
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    summary = {"written": 0, "skipped": 0, "failed": 0, "errors": []}
+
+    def report():
+        if progress:
+            progress(summary["written"], summary["skipped"], summary["failed"])
+
+    def jobs():
+        for results in records:
+            path = os.path.join(out_dir, statement_filename(results))
+            if not overwrite and os.path.exists(path):
+                summary["skipped"] += 1
+                report()
+                continue
+            yield results, path
+
+    if workers == 0:
+        for results, path in jobs():
+            try:
+                _build_statement(results, path, charts)
+                summary["written"] += 1
+            except Exception as e:
+                summary["failed"] += 1
+                summary["errors"].append((results.get("pan"), str(e)))
+            report()
+        return summary
+
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or workers * 4
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = {}
+
+        def collect(done):
+            for fut in done:
+                pan = pending.pop(fut)
+                try:
+                    fut.result()
+                    summary["written"] += 1
+                except Exception as e:
+                    summary["failed"] += 1
+                    summary["errors"].append((pan, str(e)))
+                report()
+
+        for results, path in jobs():
+            if len(pending) >= max_pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+            pending[pool.submit(_build_statement, results, path, charts)] = results.get("pan")
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            collect(done)
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate PDF tax statements in bulk.")
+    parser.add_argument("out_dir", help="folder for the generated statements")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--db", help="SQLite database to read saved PAN records from")
+    source.add_argument("--csv", help="batch CSV with pan,income,deductions,emi,age[,employment_type,regime]; "
+                                      "section columns (80C, 80D, ...) may replace deductions")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (0 = in-process)")
+    parser.add_argument("--overwrite", action="store_true", help="rebuild existing statements")
+    parser.add_argument("--no-charts", action="store_true", help="omit charts from the statements")
+    args = parser.parse_args(argv)
+
+    row_errors = []
+    records = records_from_csv(args.csv, row_errors) if args.csv else records_from_db(args.db, errors=row_errors)
+
+    def progress(written, skipped, failed):
+        total = written + skipped + failed
+        if total % 100 == 0:
+            print(f"\r{written} written, {skipped} skipped, {failed} failed", end="", flush=True)
+
+    summary = generate_statements(records, args.out_dir, workers=args.workers,
+                                  overwrite=args.overwrite, charts=not args.no_charts,
+                                  progress=progress)
+    # Rows that could not be read count as failed statements
+    summary["failed"] += len(row_errors)
+    summary["errors"] = row_errors + summary["errors"]
+    print(f"\r{summary['written']} written, {summary['skipped']} skipped, {summary['failed']} failed")
+    for pan, err in summary["errors"]:
+        print(f"  {pan}: {err}", file=sys.stderr)
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    import multiprocessing
+    multiprocessing.freeze_support()
+    sys.exit(main())
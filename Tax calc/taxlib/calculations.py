@@ -1,19 +1,101 @@
 """
 Tax calculation functions for individual and corporate entities.
 
-Uses New Tax Regime slabs for India (2023+).
+Individuals are taxed under the New Tax Regime by default; the Old Regime
+(age-based exemption limits, itemised deductions) is available with
+``regime="old"`` and ``compare_regimes`` evaluates both at once.
 """
 
+import functools
+from collections import namedtuple
 
-def calculate_individual_tax(old_income, deductions, age, employment_type="Salaried"):
+from .pan import get_pan_entity_type
+
+# New Tax Regime slabs (unified for salaried and self-employed): (width, rate)
+NEW_REGIME_SLABS = [
+    (700_000, 0.00),     # 0-7L: 0%
+    (400_000, 0.05),     # 7L-11L: 5%
+    (400_000, 0.10),     # 11L-15L: 10%
+    (400_000, 0.15),     # 15L-19L: 15%
+    (400_000, 0.20),     # 19L-23L: 20%
+    (400_000, 0.25),     # 23L-27L: 25%
+    (float('inf'), 0.30) # 27L+: 30%
+]
+NEW_REGIME_LABELS = ["0–7L", "7L–11L", "11L–15L", "15L–19L", "19L–23L", "23L–27L", "Above 27L"]
+REBATE_LIMIT = 500_000   # taxable income up to which the rebate applies
+REBATE_MAX = 12_500
+
+# Old Tax Regime: basic exemption by age band (below 60, 60-79, 80+), then
+# 5% up to 5L, 20% up to 10L and 30% above
+SENIOR_AGE = 60
+SUPER_SENIOR_AGE = 80
+OLD_REGIME_EXEMPTION = {0: 250_000, SENIOR_AGE: 300_000, SUPER_SENIOR_AGE: 500_000}
+OLD_REBATE_LIMIT = 500_000
+OLD_REBATE_MAX = 12_500
+
+CESS_RATE = 0.04
+COMPANY_RATE_LIMIT = 5_000_000  # companies pay 22% up to this gross income, 30% above
+
+TaxCurve = namedtuple("TaxCurve", ["income", "tax", "effective", "marginal"])
+RegimeComparison = namedtuple("RegimeComparison", ["old_tax", "new_tax", "cheaper", "difference"])
+# income (M,) and deductions (N,) axes; tax, effective and take_home are N x M
+TaxGrid = namedtuple("TaxGrid", ["income", "deductions", "tax", "effective", "take_home"])
+
+
+def _lakhs(amount):
+    return f"{amount / 100_000:g}L"
+
+
+def age_band(age):
+    """Lower bound of the Old Regime age band: 0, 60 or 80."""
+    if age >= SUPER_SENIOR_AGE:
+        return SUPER_SENIOR_AGE
+    return SENIOR_AGE if age >= SENIOR_AGE else 0
+
+
+def regime_rules(regime, age=0):
+    """
+    Slab schedule of an individual tax regime.
+
+    Args:
+        regime (str): "new" or "old"
+        age (int): Age of the individual (selects the Old Regime exemption)
+
+    Returns:
+        dict: {slabs: [(width, rate)], labels, rebate_limit, rebate_max}
+
+    Raises:
+        ValueError: for an unknown regime
+    """
+    if regime == "new":
+        return {"slabs": NEW_REGIME_SLABS, "labels": NEW_REGIME_LABELS,
+                "rebate_limit": REBATE_LIMIT, "rebate_max": REBATE_MAX}
+    if regime == "old":
+        exemption = OLD_REGIME_EXEMPTION[age_band(age)]
+        edges = [0, exemption, 500_000, 1_000_000]
+        slabs, labels = [], []
+        for lower, upper, rate in zip(edges, edges[1:], (0.00, 0.05, 0.20)):
+            if upper > lower:
+                slabs.append((upper - lower, rate))
+                labels.append(f"{_lakhs(lower) if lower else '0'}–{_lakhs(upper)}")
+        slabs.append((float('inf'), 0.30))
+        labels.append("Above 10L")
+        return {"slabs": slabs, "labels": labels,
+                "rebate_limit": OLD_REBATE_LIMIT, "rebate_max": OLD_REBATE_MAX}
+    raise ValueError(f"Unknown tax regime: {regime!r}")
+
+
+def calculate_individual_tax(old_income, deductions, age, employment_type="Salaried", regime="new"):
     """
-    Calculate income tax for an individual using New Tax Regime.
+    Calculate income tax for an individual using the New (default) or Old Tax Regime.
 
     Args:
         old_income (float): Gross annual income
         deductions (float): Total deductions (standard or itemized)
-        age (int): Age of the individual (currently unused in New Regime)
+        age (int): Age of the individual (sets the Old Regime exemption limit;
+            unused in the New Regime)
         employment_type (str): "Salaried" or "Self Employed"
+        regime (str): "new" or "old"
 
     Returns:
         tuple: (total_tax, slab_details, steps_dict)
@@ -23,17 +105,9 @@ def calculate_individual_tax(old_income, deductions, age, employment_type="Salar
     """
     taxable = max(0, old_income - deductions)
 
-    # New Tax Regime slabs (unified for salaried and self-employed)
-    slabs = [
-        (700_000, 0.00),     # 0-7L: 0%
-        (400_000, 0.05),     # 7L-11L: 5%
-        (400_000, 0.10),     # 11L-15L: 10%
-        (400_000, 0.15),     # 15L-19L: 15%
-        (400_000, 0.20),     # 19L-23L: 20%
-        (400_000, 0.25),     # 23L-27L: 25%
-        (float('inf'), 0.30) # 27L+: 30%
-    ]
-    labels = ["0–7L", "7L–11L", "11L–15L", "15L–19L", "19L–23L", "23L–27L", "Above 27L"]
+    rules = regime_rules(regime, age)
+    slabs = rules["slabs"]
+    labels = rules["labels"]
 
     rem = taxable
     slab_details = {}
@@ -48,9 +122,9 @@ def calculate_individual_tax(old_income, deductions, age, employment_type="Salar
         tax_before += t
         rem -= part
 
-    rebate = min(tax_before, 12500) if taxable <= 500_000 else 0
+    rebate = min(tax_before, rules["rebate_max"]) if taxable <= rules["rebate_limit"] else 0
     tax_after = tax_before - rebate
-    cess = tax_after * 0.04
+    cess = tax_after * CESS_RATE
     total = round(tax_after + cess, 2)
 
     return total, slab_details, {
@@ -81,13 +155,13 @@ def calculate_corporate_tax(gross_income, deductions, entity_type):
     slab_details = {}
 
     if entity_type == "Company":
-        rate = 0.22 if gross_income <= 5_000_000 else 0.30
+        rate = 0.22 if gross_income <= COMPANY_RATE_LIMIT else 0.30
     else:
         rate = 0.30
 
     tax_before = taxable * rate
     slab_details[f"{int(rate*100)}% Flat"] = round(tax_before, 2)
-    cess = tax_before * 0.04
+    cess = tax_before * CESS_RATE
     total = round(tax_before + cess, 2)
 
     return total, slab_details, {
@@ -100,3 +174,177 @@ def calculate_corporate_tax(gross_income, deductions, entity_type):
         "cess": round(cess, 2),
         "total": total
     }
+
+
+def calculate_pan_results(pan, income, deductions, emi, age, employment_type="Salaried", regime="new"):
+    """
+    Calculate tax for a PAN holder and assemble the full result record.
+
+    The entity type is derived from the PAN; individuals use the individual
+    calculator under `regime`, every other entity the corporate one.
+
+    Args:
+        pan (str): PAN number
+        income (float): Gross annual income
+        deductions (float): Total deductions
+        emi (float): Monthly EMI
+        age (int): Age of the individual
+        employment_type (str): "Salaried" or "Self Employed"
+        regime (str): "new" or "old" (individuals only)
+
+    Returns:
+        dict: {total_tax, take_home, steps, slab, emi, pan, entity, age, employment_type, regime}
+    """
+    pan = pan.strip().upper()
+    entity = get_pan_entity_type(pan)
+    if entity == "Individual":
+        total_tax, slab, steps = calculate_individual_tax(income, deductions, age, employment_type, regime)
+    else:
+        total_tax, slab, steps = calculate_corporate_tax(income, deductions, entity)
+
+    return {
+        "total_tax": total_tax,
+        "take_home": income - deductions - total_tax - emi,
+        "steps": steps,
+        "slab": slab,
+        "emi": emi,
+        "pan": pan,
+        "entity": entity,
+        "age": age,
+        "employment_type": employment_type,
+        "regime": regime
+    }
+
+
+def tax_for_incomes(incomes, deductions=0.0, entity_type="Individual", regime="new", age=0):
+    """
+    Calculate tax for many gross incomes in one vectorized pass.
+
+    Gives the same totals as ``calculate_individual_tax`` /
+    ``calculate_corporate_tax`` for each income; the values are looked up
+    in the precomputed ``rates.rate_table``. numpy is imported on first
+    use, so the scalar calculators stay dependency free.
+
+    Args:
+        incomes (array-like): Gross annual incomes
+        deductions (float): Deductions applied to every income
+        entity_type (str): "Individual", "Company" or another corporate type
+        regime (str): Individual tax regime ("new" or "old")
+        age (int): Age of the individual (Old Regime exemption)
+
+    Returns:
+        TaxCurve: numpy arrays (income, tax, effective, marginal), where
+            effective is tax / income and marginal is the tax on the next
+            rupee of income (both as fractions, cess included)
+    """
+    import numpy as np
+    from .rates import rate_table
+
+    table = rate_table(entity_type, float(deductions), regime, age=age)
+    income = np.asarray(incomes, dtype=float)
+    tax = table.taxes(income)
+    effective = np.divide(tax, income, out=np.zeros_like(tax), where=income > 0)
+    return TaxCurve(income, tax, effective, table.marginals(income))
+
+
+@functools.lru_cache(maxsize=32)
+def tax_curve(start, stop, points=1000, deductions=0.0, entity_type="Individual", regime="new", age=0):
+    """
+    Sample tax, effective and marginal rate at `points` incomes from `start` to `stop`.
+
+    Results are cached per range and inputs, so redrawing a chart for the
+    same user costs nothing; the returned arrays are read-only.
+
+    Returns:
+        TaxCurve: see ``tax_for_incomes``
+    """
+    import numpy as np
+
+    curve = tax_for_incomes(np.linspace(start, stop, points), deductions, entity_type, regime, age)
+    for values in curve:
+        values.flags.writeable = False
+    return curve
+
+
+@functools.lru_cache(maxsize=8)
+def tax_grid(income_start, income_stop, income_points, deduction_start, deduction_stop, deduction_points,
+             entity_type="Individual", regime="new", age=0, emi=0.0):
+    """
+    Tax, effective rate and take-home over an income x deductions mesh.
+
+    Every cell is evaluated in one broadcasted pass over the precomputed
+    rate table instead of one calculator call each. Results are cached per
+    grid spec, so a redrawn heatmap costs nothing; the arrays are read-only.
+
+    Args:
+        income_start, income_stop, income_points: income axis (linspace)
+        deduction_start, deduction_stop, deduction_points: deductions axis
+        entity_type, regime, age: as for ``calculate_pan_results``
+        emi (float): EMI subtracted from take-home, as in ``calculate_pan_results``
+
+    Returns:
+        TaxGrid: axes plus deductions x income arrays (row i is
+            ``deductions[i]``, column j is ``income[j]``)
+    """
+    import numpy as np
+    from .rates import rate_table
+
+    income = np.linspace(income_start, income_stop, income_points)
+    deductions = np.linspace(deduction_start, deduction_stop, deduction_points)
+    taxable = np.maximum(income[None, :] - deductions[:, None], 0.0)
+    if entity_type == "Individual":
+        tax = rate_table("Individual", 0.0, regime, age=age).taxes(taxable)
+    else:
+        # The company rate depends on gross income: the deduction-free table's
+        # effective rate at each income is that flat rate (cess included)
+        tax = np.round(rate_table(entity_type, 0.0).effectives(income)[None, :] * taxable, 2)
+    effective = np.divide(tax, income[None, :], out=np.zeros_like(tax), where=income[None, :] > 0)
+    grid = TaxGrid(income, deductions, tax, effective, income[None, :] - deductions[:, None] - tax - emi)
+    for values in grid:
+        values.flags.writeable = False
+    return grid
+
+
+def compare_regimes(incomes, deductions, ages=30, new_deductions=None):
+    """
+    Tax of individuals under the Old and the New Regime, and which is cheaper.
+
+    Takes scalars or arrays (e.g. a whole payroll; `deductions` and `ages`
+    may be per person). Individual tax depends only on taxable income, so
+    both regimes are looked up in precomputed rate tables in one pass:
+    one table for the New Regime and one per Old Regime age band. Scalar
+    inputs are answered without numpy.
+
+    Args:
+        incomes (float or array-like): Gross annual incomes
+        deductions (float or array-like): Itemised deductions for the Old Regime
+        ages (int or array-like): Ages (Old Regime exemption limits)
+        new_deductions (float or array-like): Deductions allowed under the New
+            Regime; defaults to `deductions`
+
+    Returns:
+        RegimeComparison: (old_tax, new_tax, cheaper, difference) where
+            cheaper is "old" or "new" ("new" on a tie) and difference is the
+            saving of the cheaper regime
+    """
+    from .rates import by_age_band, rate_table
+
+    if new_deductions is None:
+        new_deductions = deductions
+    new_table = rate_table("Individual", 0.0, "new")
+
+    if all(isinstance(v, (int, float)) for v in (incomes, deductions, ages, new_deductions)):
+        old_tax = rate_table("Individual", 0.0, "old", age=ages).tax(max(0, incomes - deductions))
+        new_tax = new_table.tax(max(0, incomes - new_deductions))
+        cheaper = "old" if old_tax < new_tax else "new"
+        return RegimeComparison(old_tax, new_tax, cheaper, round(abs(old_tax - new_tax), 2))
+
+    import numpy as np
+
+    income = np.asarray(incomes, dtype=float)
+    income, old_d, new_d, age = np.broadcast_arrays(income, np.asarray(deductions, dtype=float),
+                                                    np.asarray(new_deductions, dtype=float), np.asarray(ages))
+    new_tax = new_table.taxes(np.maximum(0.0, income - new_d))
+    old_tax = by_age_band("taxes", np.maximum(0.0, income - old_d), "old", age)
+    cheaper = np.where(old_tax < new_tax, "old", "new")
+    return RegimeComparison(old_tax, new_tax, cheaper, np.round(np.abs(old_tax - new_tax), 2))
@@ -0,0 +1,745 @@
+"""Dashboard charts and the blitting animation engine.
+
+Every dashboard chart is a *track*: it creates its matplotlib artists once in
+``setup()`` and changes their data in ``update(frame)`` (wedge angles, bar
+heights, line data) instead of clearing the axes and rebuilding everything
+for each frame. ``BlitAnimation`` plays all tracks of one figure together:
+the static parts (axes, ticks, titles, grids) are drawn once and cached with
+``copy_from_bbox``, and a frame only restores that background, redraws the
+animated artists and blits the result.
+
+Needs numpy and matplotlib, so the GUI imports it lazily. Nothing here is
+Tk specific: the same tracks render on an offscreen Agg canvas.
+"""
+
+import math
+import time
+from typing import Callable, List, Optional, Sequence
+
+import numpy as np
+from matplotlib.patches import Polygon
+
+from . import instrument
+from .calculations import regime_rules, tax_curve, tax_grid
+from .deductions import optimize_investments, savings_headroom, split_deductions
+from .projection import DEFAULT_INFLATION, DEFAULT_SALARY_GROWTH, project
+from .rates import rate_table
+
+TITLE_STYLE = dict(fontsize=14, fontweight='bold', pad=20)
+PLACEHOLDER = 0.1  # size of a pie wedge that has not been revealed yet
+
+
+def _pct(p: float) -> str:
+    return f'{p:.1f}%' if p > 1 else ''
+
+
+def _rupees(amount: float) -> str:
+    return f'₹{amount:,.0f}'
+
+
+def _limits(values: Sequence[float], margin: float = 0.05, include_zero: bool = False):
+    lo, hi = min(values), max(values)
+    if include_zero:
+        lo, hi = min(lo, 0), max(hi, 0)
+    pad = (hi - lo) * margin or 1
+    return lo - pad, hi + pad
+
+
+class Track:
+    """One animated chart drawn into one axes.
+
+    Subclasses create their artists in ``_build`` (appending every artist
+    that changes between frames to ``self.artists``) and move them to a
+    given frame in ``update``. Frame 0 is the empty chart and
+    ``frames - 1`` the complete one.
+    """
+
+    frames = 1
+    interval = 400  # ms per frame
+
+    def __init__(self, ax, title: str, interval: int = 400):
+        self.ax = ax
+        self.title = title
+        self.interval = interval
+        self.artists: List = []
+
+    def setup(self):
+        """Clear the axes, draw the static parts and create the artists."""
+        self.ax.clear()
+        self.artists = []
+        self.ax.set_title(self.title, **TITLE_STYLE)
+        self._build()
+
+    def _build(self):
+        raise NotImplementedError
+
+    def update(self, frame: int):
+        raise NotImplementedError
+
+
+class PieTrack(Track):
+    """Pie (or donut) revealing one wedge per frame.
+
+    Unrevealed wedges are drawn as thin slivers, as the original dashboard
+    did. Negative amounts cannot be drawn as wedges and count as zero.
+    """
+
+    def __init__(self, ax, title: str, values: Sequence[float], colors: Sequence[str],
+                 labels: Optional[Sequence[str]] = None, pct: Callable[[float], str] = _pct,
+                 donut_width: Optional[float] = None, reveal_labels: bool = False,
+                 white_pct: bool = False, interval: int = 400):
+        super().__init__(ax, title, interval)
+        self.values = [max(0.0, float(v)) for v in values]
+        self.colors = list(colors)
+        self.labels = list(labels) if labels else [''] * len(self.values)
+        self.pct = pct
+        self.donut_width = donut_width
+        self.reveal_labels = reveal_labels
+        self.white_pct = white_pct
+        self.frames = len(self.values) + 1
+
+    def _build(self):
+        n = len(self.values)
+        wedgeprops = dict(width=self.donut_width) if self.donut_width else None
+        self.wedges, self.texts, self.autotexts = self.ax.pie(
+            [1] * n, labels=[''] * n, colors=self.colors, autopct=lambda p: '',
+            startangle=90, wedgeprops=wedgeprops,
+        )
+        if self.white_pct:
+            for autotext in self.autotexts:
+                autotext.set_color('white')
+                autotext.set_fontweight('bold')
+        self.artists.extend(self.wedges + self.texts + self.autotexts)
+
+    def update(self, frame: int):
+        current = [v if i < frame else PLACEHOLDER for i, v in enumerate(self.values)]
+        total = sum(current)
+        theta = 90.0
+        for i, (wedge, text, autotext) in enumerate(zip(self.wedges, self.texts, self.autotexts)):
+            share = current[i] / total if total > 0 else 1 / len(current)
+            end = theta + 360 * share
+            wedge.set_theta1(theta)
+            wedge.set_theta2(end)
+            mid = math.radians((theta + end) / 2)
+            x, y = math.cos(mid), math.sin(mid)
+            text.set_position((1.1 * x, 1.1 * y))
+            text.set_horizontalalignment('left' if x > 0 else 'right')
+            text.set_text(self.labels[i] if not self.reveal_labels or i < frame else '')
+            autotext.set_position((0.6 * x, 0.6 * y))
+            autotext.set_text(self.pct(share * 100))
+            theta = end
+
+
+class BarTrack(Track):
+    """Bar chart growing one bar per frame, with optional value labels.
+
+    Args:
+        label_offset: value labels sit this far above the bar; ``None``
+            places them 1% of the bar height above it
+        label_zero: also label bars whose amount is zero
+        reference: optional ``(y, label)`` drawn as a dashed line with a
+            legend once all bars are shown
+    """
+
+    def __init__(self, ax, title: str, labels: Sequence[str], values: Sequence[float],
+                 colors, ylabel: Optional[str] = None, alpha: float = 0.8,
+                 value_labels: bool = True, label_offset: Optional[float] = None,
+                 label_zero: bool = False, label_size=None, rotation: Optional[float] = None,
+                 grid: bool = True, ylim=None, reference=None, interval: int = 400):
+        super().__init__(ax, title, interval)
+        self.labels = list(labels)
+        self.values = [float(v) for v in values]
+        self.colors = colors
+        self.ylabel = ylabel
+        self.alpha = alpha
+        self.value_labels = value_labels
+        self.label_offset = label_offset
+        self.label_zero = label_zero
+        self.label_size = label_size
+        self.rotation = rotation
+        self.grid = grid
+        self.ylim = ylim
+        self.reference = reference
+        self.frames = len(self.values) + 1
+
+    def _build(self):
+        ax = self.ax
+        self.bars = list(ax.bar(self.labels, [0] * len(self.values), color=self.colors, alpha=self.alpha))
+        self.artists.extend(self.bars)
+        if self.ylabel:
+            ax.set_ylabel(self.ylabel, fontweight='bold')
+        if self.grid:
+            ax.grid(True, alpha=0.3)
+        if self.rotation:
+            ax.tick_params(axis='x', rotation=self.rotation)
+        if self.ylim:
+            ax.set_ylim(*self.ylim)
+        else:
+            top = max(self.values + [self.reference[0] if self.reference else 0])
+            ax.set_ylim(0, top * 1.15 if top > 0 else 1)
+
+        self.value_texts = []
+        if self.value_labels:
+            for bar in self.bars:
+                text = ax.text(bar.get_x() + bar.get_width() / 2., 0, '', ha='center', va='bottom',
+                               fontweight='bold', fontsize=self.label_size)
+                self.value_texts.append(text)
+            self.artists.extend(self.value_texts)
+
+        self.ref_line = self.legend = None
+        if self.reference:
+            y, label = self.reference
+            self.ref_line = ax.axhline(y=y, color='red', linestyle='--', linewidth=3, label=label)
+            self.legend = ax.legend()
+            self.artists.extend([self.ref_line, self.legend])
+
+    def update(self, frame: int):
+        for i, bar in enumerate(self.bars):
+            height = self.values[i] if i < frame else 0
+            bar.set_height(height)
+            if self.value_texts:
+                text = self.value_texts[i]
+                shown = i < frame and (height > 0 or self.label_zero)
+                text.set_visible(shown)
+                if shown:
+                    offset = height * 0.01 if self.label_offset is None else self.label_offset
+                    text.set_y(height + offset)
+                    text.set_text(_rupees(height))
+        if self.ref_line is not None:
+            complete = frame >= len(self.bars)
+            self.ref_line.set_visible(complete)
+            self.legend.set_visible(complete)
+
+
+class LineTrack(Track):
+    """Line extending by one point per frame.
+
+    `x` may hold category names, which are placed at 0, 1, 2...
+
+    Args:
+        style: matplotlib format string of the line
+        fill: shade the area under the line
+        marker: optional ``(x, y, label)`` point shown with a legend once
+            the line is complete
+        reveal_frames: draw the line in this many frames instead of one
+            point per frame (for densely sampled curves)
+    """
+
+    def __init__(self, ax, title: str, x: Sequence, y: Sequence[float], color: str,
+                 linewidth: float = 2, xlabel: Optional[str] = None, ylabel: Optional[str] = None,
+                 grid: bool = False, fill: bool = False, marker=None, style: str = 'o-',
+                 reveal_frames: Optional[int] = None, interval: int = 400):
+        super().__init__(ax, title, interval)
+        self.categories = [str(v) for v in x] if len(x) and isinstance(x[0], str) else None
+        self.x = np.arange(len(x), dtype=float) if self.categories else np.asarray(x, dtype=float)
+        self.y = np.asarray(y, dtype=float)
+        self.color = color
+        self.linewidth = linewidth
+        self.xlabel = xlabel
+        self.ylabel = ylabel
+        self.grid = grid
+        self.fill = fill
+        self.marker = marker
+        self.style = style
+        self.frames = (reveal_frames or len(self.x)) + 1
+
+    def _build(self):
+        ax = self.ax
+        self.line, = ax.plot([], [], self.style, color=self.color, linewidth=self.linewidth)
+        self.artists.append(self.line)
+        self.area = None
+        if self.fill:
+            self.area = Polygon(np.empty((0, 2)), closed=True, color=self.color, alpha=0.3)
+            ax.add_patch(self.area)
+            self.artists.append(self.area)
+        self.point = self.legend = None
+        if self.marker:
+            mx, my, label = self.marker
+            self.point, = ax.plot([mx], [my], 'ro', markersize=10, label=label)
+            self.legend = ax.legend()
+            self.artists.extend([self.point, self.legend])
+
+        xs, ys = list(self.x), list(self.y)
+        if self.marker:
+            xs.append(self.marker[0])
+            ys.append(self.marker[1])
+        if xs:
+            ax.set_xlim(*_limits(xs))
+            ax.set_ylim(*_limits(ys, include_zero=self.fill))
+        if self.categories:
+            ax.set_xticks(self.x)
+            ax.set_xticklabels(self.categories)
+        if self.xlabel:
+            ax.set_xlabel(self.xlabel, fontweight='bold')
+        if self.ylabel:
+            ax.set_ylabel(self.ylabel, fontweight='bold')
+        if self.grid:
+            ax.grid(True, alpha=0.3)
+
+    def update(self, frame: int):
+        shown = len(self.x) * min(frame, self.frames - 1) // (self.frames - 1) if self.frames > 1 else 0
+        x, y = self.x[:shown], self.y[:shown]
+        self.line.set_data(x, y)
+        if self.area is not None:
+            if shown:
+                self.area.set_xy(np.column_stack([
+                    np.concatenate([[x[0]], x, [x[-1]]]),
+                    np.concatenate([[0], y, [0]]),
+                ]))
+            else:
+                self.area.set_xy(np.empty((0, 2)))
+        if self.point is not None:
+            complete = frame >= self.frames - 1
+            self.point.set_visible(complete)
+            self.legend.set_visible(complete)
+
+
+def _lakhs(value, _pos=None) -> str:
+    return f'{value / 100_000:g}L'
+
+
+class HeatmapTrack(Track):
+    """Image of a 2-D grid (rows along y, columns along x) with a colorbar,
+    revealed in column bands.
+
+    The image is one artist whatever the grid size, so a 500 x 500 grid
+    costs about as much per frame as a 50 x 50 one.
+
+    Args:
+        x, y: column and row coordinates (evenly spaced)
+        values: len(y) x len(x) array
+        marker: optional ``(x, y, label)`` point shown once complete
+        fmt: tick formatter for both axes
+        cfmt: optional tick formatter for the colorbar
+    """
+
+    def __init__(self, ax, title: str, x, y, values, cmap: str = 'viridis', clabel: Optional[str] = None,
+                 xlabel: Optional[str] = None, ylabel: Optional[str] = None, vmin=None, vmax=None,
+                 marker=None, fmt: Callable = _lakhs, cfmt: Optional[Callable] = None, reveal_frames: int = 8,
+                 interval: int = 120):
+        super().__init__(ax, title, interval)
+        self.x = np.asarray(x, dtype=float)
+        self.y = np.asarray(y, dtype=float)
+        self.values = np.asarray(values, dtype=float)
+        self.cmap = cmap
+        self.clabel = clabel
+        self.xlabel = xlabel
+        self.ylabel = ylabel
+        self.vmin = np.nanmin(self.values) if vmin is None else vmin
+        self.vmax = np.nanmax(self.values) if vmax is None else vmax
+        if self.vmax <= self.vmin:
+            self.vmax = self.vmin + 1
+        self.marker = marker
+        self.fmt = fmt
+        self.cfmt = cfmt
+        self.frames = reveal_frames + 1
+
+    def _build(self):
+        from matplotlib.ticker import FuncFormatter
+        ax = self.ax
+        self.shown = np.full_like(self.values, np.nan)
+        extent = (self.x[0], self.x[-1], self.y[0], self.y[-1])
+        self.image = ax.imshow(self.shown, origin='lower', extent=extent, aspect='auto', cmap=self.cmap,
+                               vmin=self.vmin, vmax=self.vmax, interpolation='nearest')
+        self.artists.append(self.image)
+        colorbar = ax.figure.colorbar(self.image, cax=ax.inset_axes([1.02, 0, 0.03, 1]))
+        if self.clabel:
+            colorbar.set_label(self.clabel, fontweight='bold')
+        if self.cfmt:
+            colorbar.ax.yaxis.set_major_formatter(FuncFormatter(self.cfmt))
+        ax.xaxis.set_major_formatter(FuncFormatter(self.fmt))
+        ax.yaxis.set_major_formatter(FuncFormatter(self.fmt))
+        if self.xlabel:
+            ax.set_xlabel(self.xlabel, fontweight='bold')
+        if self.ylabel:
+            ax.set_ylabel(self.ylabel, fontweight='bold')
+        self.point = self.legend = None
+        if self.marker:
+            mx, my, label = self.marker
+            self.point, = ax.plot([mx], [my], 'o', color='white', markeredgecolor='black', markersize=10,
+                                  label=label)
+            self.legend = ax.legend(loc='upper left')
+            self.artists.extend([self.point, self.legend])
+
+    def update(self, frame: int):
+        columns = self.values.shape[1]
+        shown = columns * min(frame, self.frames - 1) // (self.frames - 1)
+        self.shown[:, :shown] = self.values[:, :shown]
+        self.shown[:, shown:] = np.nan
+        self.image.set_data(self.shown)
+        if self.point is not None:
+            complete = frame >= self.frames - 1
+            self.point.set_visible(complete)
+            self.legend.set_visible(complete)
+
+
+# ------------------- DASHBOARD TABS -------------------
+def income_tracks(axes, steps: dict, emi: float, mode: str = 'Pie') -> List[Track]:
+    """Tracks for the Income Distribution tab (main, monthly, efficiency, overview)."""
+    ax_main, ax_monthly, ax_efficiency, ax_overview = axes
+    gross = steps["gross"]
+    deductions = steps["deductions"]
+    tax = steps["total"]
+    take_home = max(0, gross - deductions - tax - emi)
+
+    # 1. Income distribution
+    values = [deductions, tax, emi, take_home]
+    labels = ['Deductions', 'Tax', 'EMI', 'Net Income']
+    colors = ['#FF6B6B', '#4ECDC4', '#FFD93D', '#6BCF7F']
+    if mode == 'Bar':
+        main = BarTrack(ax_main, 'Income Distribution (Bar)', labels, values, colors,
+                        alpha=0.9, grid=False)
+    elif mode == 'Line':
+        main = LineTrack(ax_main, 'Income Distribution (Line)', labels, values, '#4361EE')
+    else:
+        main = PieTrack(ax_main, 'Income Distribution (Pie)', values, colors, labels, white_pct=True)
+
+    # 2. Monthly cash flow
+    monthly_takehome = take_home / 12
+    monthly = PieTrack(
+        ax_monthly, 'Monthly Cash Flow',
+        [monthly_takehome, emi, monthly_takehome - emi],
+        ['#27AE60', '#E74C3C', '#3498DB'],
+        ['Monthly Income', 'Monthly EMI', 'Disposable Income'],
+        donut_width=0.3,
+    )
+
+    # 3. Tax efficiency
+    tax_efficiency = ((gross - tax) / gross * 100) if gross > 0 else 0
+    efficiency = PieTrack(ax_efficiency, f'Tax Efficiency: {tax_efficiency:.1f}%',
+                          [tax, gross - tax], ['#E74C3C', '#27AE60'])
+
+    # 4. Complete overview
+    categories = ['Gross Income', 'Deductions', 'Tax Paid', 'Monthly EMI', 'Net Take-home']
+    amounts = [gross, deductions, tax, emi, take_home]
+    bar_colors = ['#4361EE', '#FF6B6B', '#4ECDC4', '#FFD93D', '#6BCF7F']
+    if mode == 'Bar':
+        overview = BarTrack(ax_overview, 'Complete Financial Overview', categories, amounts,
+                            bar_colors, rotation=15, interval=500)
+    elif mode == 'Line':
+        overview = LineTrack(ax_overview, 'Complete Financial Overview (Line)', categories, amounts,
+                             '#6BCF7F', interval=500)
+    else:
+        overview = PieTrack(ax_overview, 'Complete Financial Overview (Pie)', amounts, bar_colors,
+                            categories, interval=500)
+
+    return [main, monthly, efficiency, overview]
+
+
+CURVE_POINTS = 1000
+CURVE_STEP = 500_000  # curve ranges are rounded up to this so nearby incomes share a cached curve
+SLAB_COLORS = ['#27AE60', '#F39C12', '#E74C3C', '#8E44AD', '#3498DB', '#9B59B6', '#34495E']
+INVESTMENT_COLORS = ['#3498DB', '#27AE60', '#E74C3C', '#9B59B6', '#F39C12', '#1ABC9C']
+
+
+def tax_tracks(axes, steps: dict, entity_type: str, age: int = 30, regime: str = "new") -> List[Track]:
+    """Tracks for the Tax Analysis tab (slabs, rates, tax curve, components)."""
+    ax_slabs, ax_rates, ax_curve, ax_components = axes
+    gross = steps["gross"]
+    tax = steps["total"]
+    taxable = steps["taxable"]
+
+    # 1. Slab distribution over the slabs of the user's regime
+    if entity_type == "Individual":
+        rules = regime_rules(regime, age)
+        slab_data = []
+        rem = taxable
+        for width, _ in rules["slabs"]:
+            part = min(max(rem, 0), width)
+            slab_data.append(part)
+            rem -= part
+        slab_labels = [f'{label}\n{rate:.0%}' for label, (_, rate) in zip(rules["labels"], rules["slabs"])]
+        slab_colors = [SLAB_COLORS[i % len(SLAB_COLORS)] for i in range(len(slab_data))]
+    else:
+        slab_data = [taxable]
+        slab_labels = [f'Corporate Tax\n{22 if gross <= 5000000 else 30}%']
+        slab_colors = ['#3498DB']
+    breakdown = BarTrack(ax_slabs, 'Tax Slab Distribution', slab_labels, slab_data, slab_colors,
+                         ylabel='Amount (₹)', label_size=8)
+
+    # 2. Rate comparison: the slab rates of this user's schedule
+    table = rate_table(entity_type, steps["deductions"], regime, age=age)
+    slab_rates = [r * 100 for r in table.slab_rates()]
+    actual_rate = (table.tax(gross) / taxable * 100) if taxable > 0 else 0
+    rates = BarTrack(ax_rates, 'Tax Rate Comparison', [f'{r:g}%' for r in slab_rates],
+                     slab_rates, 'lightblue', ylabel='Tax Rate (%)', alpha=0.6,
+                     value_labels=False, ylim=(0, max(slab_rates + [actual_rate]) + 5),
+                     reference=(actual_rate, f'Your Effective Rate: {actual_rate:.1f}%'))
+
+    # 3. Tax vs income for this user's entity, deductions, regime and age
+    stop = max(2_000_000, math.ceil(gross * 1.5 / CURVE_STEP) * CURVE_STEP)
+    sampled = tax_curve(0, stop, CURVE_POINTS, steps["deductions"], entity_type, regime, age)
+    curve = LineTrack(ax_curve, 'Tax vs Income', sampled.income, sampled.tax, '#E74C3C',
+                      linewidth=3, xlabel='Income (₹)', ylabel='Tax (₹)', grid=True,
+                      marker=(gross, tax, 'Your Position'), style='-', reveal_frames=8, interval=300)
+
+    # 4. Components
+    components = BarTrack(
+        ax_components, 'Tax Components', ['Basic Tax', 'Rebate', 'Cess', 'Total Tax'],
+        [steps["tax_before"], steps["rebate"], steps["cess"], steps["total"]],
+        ['#3498DB', '#27AE60', '#F39C12', '#E74C3C'], ylabel='Amount (₹)', label_offset=1000,
+    )
+    return [breakdown, rates, curve, components]
+
+
+def insights_tracks(axes, steps: dict, emi: float, age: int = 30,
+                    employment_type: str = "Salaried", entity_type: str = "Individual") -> List[Track]:
+    """Tracks for the Financial Insights tab (savings, investments, budget, projection)."""
+    ax_savings, ax_investments, ax_budget, ax_projection = axes
+    gross = steps["gross"]
+    deductions = steps["deductions"]
+    tax = steps["total"]
+    take_home = max(0, gross - deductions - tax - emi)
+
+    # 1. Savings potential: deductions still available under the section caps
+    headroom = savings_headroom(deductions, "old", employment_type, age, income=gross)
+    savings = BarTrack(ax_savings, 'Tax Savings Potential', ['Current Savings', 'Additional Potential'],
+                       [deductions, headroom], ['#3498DB', '#F39C12'],
+                       ylabel='Amount (₹)', label_offset=1000, label_zero=True)
+
+    # 2. Investment recommendations: the least take-home money that brings
+    # the Old Regime tax down as far as it can go. Only the Old Regime
+    # rewards investing, so the saving is measured against the tax actually
+    # paid (`tax`, under whichever regime the result used); when the Old
+    # Regime stays dearer even after investing there is nothing to gain.
+    claims = split_deductions(deductions, "old", employment_type, age)
+    plan = optimize_investments(gross, take_home, claims, "old", employment_type, age)
+    picks = [(name, amount) for name, amount in plan.amounts.items() if amount > 0]
+    saving = round(tax - plan.tax_after, 2)
+    if picks and saving > 0:
+        investments = PieTrack(ax_investments,
+                               f'Recommended Investments\n(Old Regime: saves ₹{saving:,.0f} tax)',
+                               [amount for _, amount in picks], INVESTMENT_COLORS[:len(picks)],
+                               [name for name, _ in picks],
+                               pct=lambda p: f'{p:.0f}' if p > 1 else '', reveal_labels=True)
+    else:
+        investments = PieTrack(ax_investments, 'Recommended Investments', [1], ['#BDC3C7'],
+                               ['New Regime is cheaper' if picks else 'No further tax saving'],
+                               pct=lambda p: '', reveal_labels=True)
+
+    # 3. Monthly budget
+    budget = PieTrack(ax_budget, 'Monthly Budget', [take_home / 12, emi, take_home / 12 - emi],
+                      ['#27AE60', '#E74C3C', '#3498DB'],
+                      ['Monthly Income', 'Monthly EMI', 'Disposable Income'])
+
+    # 4. Take-home over the coming years (default growth and inflation)
+    plan = project(gross, deductions, emi, age, entity_type=entity_type)
+    projection = LineTrack(ax_projection,
+                           f'Yearly Income Projection\n({DEFAULT_SALARY_GROWTH:.0%} raises, '
+                           f'{DEFAULT_INFLATION:.0%} inflation)',
+                           [f'Y{year + 1}' for year in plan.years], plan.take_home, '#27AE60', linewidth=3,
+                           ylabel='Take-home (₹)', grid=True, fill=True, interval=300)
+    return [savings, investments, budget, projection]
+
+
+WHATIF_POINTS = 500  # cells per axis of the what-if heatmaps
+WHATIF_DEDUCTION_STEP = 100_000
+WHATIF_MIN_DEDUCTIONS = 500_000  # covers the investment caps of the Old Regime
+
+
+def whatif_tracks(axes, steps: dict, emi: float, entity_type: str, age: int = 30,
+                  regime: str = "new") -> List[Track]:
+    """Tracks for the What-If tab: tax over income x deductions, and the tax
+    saved by one more rupee of deductions (where extra investment pays off)."""
+    ax_tax, ax_saving = axes
+    gross = steps["gross"]
+    deductions = steps["deductions"]
+    income_stop = max(CURVE_STEP, math.ceil(2 * gross / CURVE_STEP) * CURVE_STEP)
+    deduction_stop = max(WHATIF_MIN_DEDUCTIONS,
+                         math.ceil(2 * deductions / WHATIF_DEDUCTION_STEP) * WHATIF_DEDUCTION_STEP)
+    grid = tax_grid(0, income_stop, WHATIF_POINTS, 0, deduction_stop, WHATIF_POINTS, entity_type, regime, age,
+                    float(emi))
+    marker = (gross, deductions, 'You')
+
+    tax = HeatmapTrack(ax_tax, 'Tax by Income and Deductions', grid.income, grid.deductions, grid.tax,
+                       cmap='magma', clabel='Tax (₹)', xlabel='Gross Income', ylabel='Deductions',
+                       marker=marker, cfmt=_lakhs)
+    # Tax saved per extra rupee of deductions; cells next to the rebate cliff
+    # save more than a rupee and are shown at the top of the scale
+    step = grid.deductions[1] - grid.deductions[0]
+    saved = -np.diff(grid.tax, axis=0) / step
+    saving = np.clip(np.vstack([saved, saved[-1:]]), 0.0, 1.0)
+    payoff = HeatmapTrack(ax_saving, 'Tax Saved per Extra ₹1 of Deductions', grid.income, grid.deductions,
+                          saving, cmap='YlGn', clabel='₹ saved per ₹1', xlabel='Gross Income',
+                          ylabel='Deductions', vmin=0.0, vmax=0.5, marker=marker)
+    return [tax, payoff]
+
+
+# ------------------- LAYOUT -------------------
+class LayoutCache:
+    """Remembers ``tight_layout`` results of one figure per canvas size.
+
+    ``tight_layout`` measures every tick label and title, which costs more
+    than drawing a frame. The resulting subplot parameters only depend on
+    the canvas size and the figure's content, so they are computed once per
+    (size, `key`) and re-applied with ``subplots_adjust`` afterwards. Call
+    ``invalidate`` when the content changes in a way `key` does not cover.
+    """
+
+    MAX_ENTRIES = 8
+
+    def __init__(self, figure):
+        self.figure = figure
+        self.computed = 0
+        self._params = {}
+
+    def apply(self, key=None) -> bool:
+        """Lay out the figure for its current canvas size.
+
+        Returns True if the subplot parameters changed (the figure needs a
+        redraw), False if the cached layout was already in effect.
+        """
+        width, height = self.figure.canvas.get_width_height()
+        entry = (width, height, key)
+        params = self._params.get(entry)
+        before = self._current()
+        if params is None:
+            with instrument.span("chart.layout"):
+                self.figure.tight_layout()
+            self.computed += 1
+            params = self._current()
+            if len(self._params) >= self.MAX_ENTRIES:
+                self._params.pop(next(iter(self._params)))
+            self._params[entry] = params
+        elif params != before:
+            self.figure.subplots_adjust(**params)
+        return params != before
+
+    def invalidate(self):
+        self._params.clear()
+
+    def _current(self) -> dict:
+        sp = self.figure.subplotpars
+        return dict(left=sp.left, right=sp.right, bottom=sp.bottom, top=sp.top,
+                    wspace=sp.wspace, hspace=sp.hspace)
+
+
+# ------------------- ANIMATION ENGINE -------------------
+class BlitAnimation:
+    """Plays the tracks of one figure by blitting over a cached background.
+
+    Each track advances on its own interval from a shared start time; a frame
+    is only redrawn when at least one track changed. Any full redraw of the
+    canvas (first show, resize, ``tight_layout``) recaptures the background.
+    When every track is complete the artists are handed back to normal
+    drawing, so later redraws and exports show the finished charts.
+
+    Args:
+        canvas: the figure's canvas (``FigureCanvasTkAgg`` or Agg)
+        tracks: tracks drawing into axes of ``canvas.figure``
+        fps: tick rate of the canvas timer used by ``start``
+    """
+
+    def __init__(self, canvas, tracks: Sequence[Track], fps: int = 30):
+        self.canvas = canvas
+        self.figure = canvas.figure
+        self.tracks = list(tracks)
+        self.fps = fps
+        self.frames = [-1] * len(self.tracks)
+        self.running = False
+        self.blits = 0
+        self._t0 = 0.0
+        self._background = None
+        self._timer = None
+        self._draw_cid = None
+        self._ready = False
+
+    @property
+    def artists(self) -> list:
+        return [artist for track in self.tracks for artist in track.artists]
+
+    @property
+    def duration(self) -> float:
+        """Seconds until the slowest track shows its last frame."""
+        return max(((t.frames - 1) * t.interval for t in self.tracks), default=0) / 1000
+
+    def setup(self):
+        """Create every track's artists at frame 0. Called by ``start`` if needed;
+        call it first to lay out the figure (e.g. ``tight_layout``) before playing."""
+        for track in self.tracks:
+            track.setup()
+            for artist in track.artists:
+                artist.set_animated(True)
+            track.update(0)
+        self.frames = [0] * len(self.tracks)
+        self._ready = True
+
+    def start(self, now: Optional[float] = None, timer: bool = True):
+        """Draw the static background and start playing.
+
+        With ``timer=False`` nothing is scheduled and the caller drives the
+        animation through ``advance`` (offscreen rendering, tests).
+        """
+        if not self._ready:
+            self.setup()
+        self.running = True
+        self._t0 = time.perf_counter() if now is None else now
+        self._draw_cid = self.canvas.mpl_connect('draw_event', self._on_draw)
+        self.canvas.draw()
+        if timer:
+            self._timer = self.canvas.new_timer(interval=max(1, int(1000 / self.fps)))
+            self._timer.add_callback(self.advance)
+            self._timer.start()
+
+    def advance(self, now: Optional[float] = None) -> bool:
+        """Move every track to its frame for time `now`; return False once done."""
+        if not self.running:
+            return False
+        now = time.perf_counter() if now is None else now
+        elapsed_ms = (now - self._t0) * 1000
+        changed = False
+        complete = True
+        for i, track in enumerate(self.tracks):
+            frame = min(track.frames - 1, int(elapsed_ms // track.interval))
+            if frame != self.frames[i]:
+                track.update(frame)
+                self.frames[i] = frame
+                changed = True
+            complete = complete and frame == track.frames - 1
+        if complete:
+            self.stop()
+            return False
+        if changed:
+            self.blit()
+        return True
+
+    def blit(self):
+        """Redraw the animated artists over the cached background."""
+        if self._background is None:
+            return  # not drawn yet; the first full draw paints the current frame
+        with instrument.span("chart.frame"):
+            self.canvas.restore_region(self._background)
+            self._draw_artists()
+            self.canvas.blit(self.figure.bbox)
+        self.blits += 1
+
+    def stop(self, redraw: bool = True):
+        """Finish immediately: show the last frame of every track and return
+        the artists to normal (non-animated) drawing. With ``redraw=False``
+        the canvas is left alone (it is hidden or about to be destroyed)."""
+        if self._timer is not None:
+            self._timer.stop()
+            self._timer = None
+        if self._draw_cid is not None:
+            self.canvas.mpl_disconnect(self._draw_cid)
+            self._draw_cid = None
+        if self._ready:
+            for i, track in enumerate(self.tracks):
+                if self.frames[i] != track.frames - 1:
+                    track.update(track.frames - 1)
+                    self.frames[i] = track.frames - 1
+            for artist in self.artists:
+                artist.set_animated(False)
+        was_running = self.running
+        self.running = False
+        self._background = None
+        if was_running and redraw:
+            self.canvas.draw_idle()
+
+    def _on_draw(self, event):
+        self._background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self._draw_artists()
+
+    def _draw_artists(self):
+        for artist in self.artists:
+            self.figure.draw_artist(artist)
@@ -0,0 +1,82 @@
+"""Lifecycle of the dashboard window.
+
+The GUI keeps at most one dashboard. Opening it again, or calculating while
+it is open, pushes the new results into the existing window instead of
+creating another Toplevel with three more figures, and closing the window
+releases its figures. ``stats()`` reports how many figures, axes and artists
+are alive so memory can be checked over long sessions.
+
+The manager does not depend on Tk or matplotlib. A dashboard only needs
+``update(results)``, ``show()``, ``close()``, a ``closed`` attribute and
+``figures()`` returning its built matplotlib figures.
+"""
+
+from typing import Callable, Iterable
+
+
+def figure_stats(figures: Iterable) -> dict:
+    """Count figures, axes and artists (every object ``findobj`` reaches)."""
+    stats = {"figures": 0, "axes": 0, "artists": 0}
+    for fig in figures:
+        stats["figures"] += 1
+        stats["axes"] += len(fig.axes)
+        stats["artists"] += len(fig.findobj())
+    return stats
+
+
+class DashboardManager:
+    """Keeps a single dashboard and updates it in place.
+
+    Args:
+        factory: ``factory(results)`` creating and showing a new dashboard
+    """
+
+    def __init__(self, factory: Callable[[dict], object]):
+        self.factory = factory
+        self.created = 0
+        self.updates = 0
+        self._dashboard = None
+
+    @property
+    def current(self):
+        """The open dashboard, or None once it has been closed."""
+        if self._dashboard is not None and self._dashboard.closed:
+            self._dashboard = None
+        return self._dashboard
+
+    def open(self, results: dict):
+        """Show `results`, reusing the open dashboard when there is one."""
+        dashboard = self.current
+        if dashboard is None:
+            self._dashboard = dashboard = self.factory(results)
+            self.created += 1
+        else:
+            self._update(dashboard, results)
+            dashboard.show()
+        return dashboard
+
+    def push(self, results: dict) -> bool:
+        """Update the open dashboard with `results`; return False if none is open."""
+        dashboard = self.current
+        if dashboard is None:
+            return False
+        self._update(dashboard, results)
+        return True
+
+    def close(self):
+        """Close the dashboard (if open) and release its figures."""
+        dashboard = self.current
+        if dashboard is not None:
+            dashboard.close()
+        self._dashboard = None
+
+    def stats(self) -> dict:
+        """Figures/axes/artists alive in the open dashboard plus lifetime counters."""
+        dashboard = self.current
+        stats = figure_stats(dashboard.figures() if dashboard is not None else ())
+        stats.update(open=dashboard is not None, created=self.created, updates=self.updates)
+        return stats
+
+    def _update(self, dashboard, results: dict):
+        dashboard.update(results)
+        self.updates += 1
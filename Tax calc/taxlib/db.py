@@ -8,14 +8,17 @@ from datetime import datetime
 DB_FILE = "tax_calculator.db"
 
 
-def _get_connection():
+def _get_connection(db_file=None):
     """
     Get or create SQLite connection and initialize schema.
 
+    Args:
+        db_file (str): Database path; defaults to ``DB_FILE``
+
     Returns:
         sqlite3.Connection: Database connection
     """
-    conn = sqlite3.connect(DB_FILE)
+    conn = sqlite3.connect(db_file or DB_FILE)
     c = conn.cursor()
     c.execute('''
     CREATE TABLE IF NOT EXISTS pan_users (
@@ -77,3 +80,28 @@ def get_pan_data_db(pan):
     if row:
         return {"income": row[0], "deductions": row[1], "emi": row[2], "age": row[3]}
     return {}
+
+
+def iter_pan_data_db(batch_size=1000, db_file=None):
+    """
+    Iterate over every saved PAN record without loading the table into memory.
+
+    Args:
+        batch_size (int): Rows fetched from the cursor per round trip
+        db_file (str): Database path; defaults to ``DB_FILE``
+
+    Yields:
+        dict: {pan, income, deductions, emi, age}
+    """
+    conn = _get_connection(db_file)
+    try:
+        c = conn.cursor()
+        c.execute("SELECT pan, income, deductions, emi, age FROM pan_users ORDER BY pan")
+        while True:
+            rows = c.fetchmany(batch_size)
+            if not rows:
+                break
+            for row in rows:
+                yield {"pan": row[0], "income": row[1], "deductions": row[2], "emi": row[3], "age": row[4]}
+    finally:
+        conn.close()
@@ -0,0 +1,259 @@
+"""Deduction catalogue: per-section claims, statutory caps and interactions.
+
+Calculators take one ``deductions`` amount. This module turns what a
+taxpayer declares per section into the amount actually allowed:
+
+- ``standard``: standard deduction for salaried taxpayers (50K in the Old
+  Regime, 75K in the New Regime), applied automatically
+- ``80C``: PPF, ELSS, life insurance, ... capped at 1.5L together with
+  80CCC/80CCD(1)
+- ``80CCD(1B)``: additional NPS contribution, capped at 50K; NPS claimed
+  beyond that counts towards 80C (as 80CCD(1)) within the 1.5L cap
+- ``80D``: health insurance for self and family, 25K (50K from age 60)
+- ``80D_parents``: health insurance for parents, 25K (50K if a parent is a
+  senior citizen)
+- ``24b``: interest on a self-occupied home loan, capped at 2L
+
+The New Regime allows only the standard deduction.
+
+``optimize_investments`` spends an investment budget across deduction
+instruments so that tax is as low as possible, for the least money.
+
+Claims, ages, employment types and flags may be scalars or arrays (one
+entry per taxpayer). Arrays are processed with numpy in one pass; scalars
+use plain Python, so the GUI does not load numpy for a single user.
+"""
+
+from collections import namedtuple
+from typing import Dict, Iterable, Mapping, Optional, Sequence
+
+from .calculations import SENIOR_AGE
+
+SECTIONS = ("standard", "80C", "80CCD(1B)", "80D", "80D_parents", "24b")
+CLAIMABLE = SECTIONS[1:]  # the standard deduction is not claimed, it is applied
+INVESTMENT_SECTIONS = ("80C", "80CCD(1B)", "80D")  # what a taxpayer can still invest in
+
+STANDARD_DEDUCTION = {"old": 50_000, "new": 75_000}
+CAP_80C = 150_000
+CAP_80CCD_1B = 50_000
+CAP_80D = 25_000
+CAP_80D_SENIOR = 50_000
+CAP_24B = 200_000
+
+# An instrument the taxpayer can put money into; `limit` is the instrument's
+# own yearly limit, on top of the cap of its section
+Instrument = namedtuple("Instrument", ["name", "section", "limit"])
+INSTRUMENTS = (
+    Instrument("NPS", "80CCD(1B)", float("inf")),
+    Instrument("PPF", "80C", CAP_80C),
+    Instrument("ELSS", "80C", float("inf")),
+    Instrument("Health Insurance", "80D", float("inf")),
+)
+
+Allocation = namedtuple("Allocation", ["amounts", "invested", "tax_before", "tax_after", "saving"])
+
+
+def _ops(vectorized: bool):
+    """(minimum, maximum, where) for arrays or for plain scalars."""
+    if vectorized:
+        import numpy as np
+        return np.minimum, np.maximum, np.where
+    return min, max, lambda cond, a, b: a if cond else b
+
+
+def _is_array(value) -> bool:
+    return not isinstance(value, (int, float, str, bool))
+
+
+def allowed_deductions(claims: Mapping[str, object], regime: str = "old", employment_type="Salaried",
+                       age=30, parents_senior=False) -> Dict[str, object]:
+    """Allowed amount per section and in total.
+
+    Args:
+        claims: section -> claimed amount (scalar or array); missing
+            sections are 0
+        regime: "old" or "new"
+        employment_type: "Salaried" or "Self Employed" (scalar or array)
+        age: age of the taxpayer (scalar or array)
+        parents_senior: whether a parent is 60+ (scalar or array)
+
+    Returns:
+        dict: section -> allowed amount for every entry of ``SECTIONS``,
+            plus ``total`` (the ``deductions`` to pass to the calculators)
+
+    Raises:
+        ValueError: for an unknown section or regime
+    """
+    unknown = set(claims) - set(CLAIMABLE)
+    if unknown:
+        raise ValueError(f"Unknown deduction section(s): {', '.join(sorted(unknown))}")
+    if regime not in STANDARD_DEDUCTION:
+        raise ValueError(f"Unknown tax regime: {regime!r}")
+
+    vectorized = any(_is_array(v) for v in (*claims.values(), employment_type, age, parents_senior))
+    minimum, maximum, where = _ops(vectorized)
+    if vectorized:
+        import numpy as np
+        salaried = np.asarray(employment_type) == "Salaried"
+        claim = {s: np.asarray(claims.get(s, 0.0), dtype=float) for s in CLAIMABLE}
+        age = np.asarray(age)
+        parents_senior = np.asarray(parents_senior, dtype=bool)
+    else:
+        salaried = employment_type == "Salaried"
+        claim = {s: float(claims.get(s, 0.0)) for s in CLAIMABLE}
+
+    allowed = {"standard": where(salaried, float(STANDARD_DEDUCTION[regime]), 0.0)}
+    if regime == "new":
+        for section in CLAIMABLE:
+            allowed[section] = np.zeros_like(claim[section]) if vectorized else 0.0
+    else:
+        nps = maximum(claim["80CCD(1B)"], 0.0)
+        allowed["80CCD(1B)"] = minimum(nps, CAP_80CCD_1B)
+        # NPS beyond the 1B cap is claimed as 80CCD(1), inside the 80C limit
+        allowed["80C"] = minimum(maximum(claim["80C"], 0.0) + nps - allowed["80CCD(1B)"], CAP_80C)
+        allowed["80D"] = minimum(maximum(claim["80D"], 0.0), where(age >= SENIOR_AGE, CAP_80D_SENIOR, CAP_80D))
+        allowed["80D_parents"] = minimum(maximum(claim["80D_parents"], 0.0),
+                                         where(parents_senior, CAP_80D_SENIOR, CAP_80D))
+        allowed["24b"] = minimum(maximum(claim["24b"], 0.0), CAP_24B)
+    allowed["total"] = sum(allowed[s] for s in SECTIONS)
+    if vectorized:
+        # One array per section, each with an entry per taxpayer
+        allowed = dict(zip(allowed, (np.array(v, dtype=float) for v in np.broadcast_arrays(*allowed.values()))))
+    return allowed
+
+
+def section_caps(regime: str = "old", employment_type: str = "Salaried", age: int = 30,
+                 parents_senior: bool = False) -> Dict[str, float]:
+    """Largest amount allowed per section for one taxpayer."""
+    full = {s: float("inf") for s in CLAIMABLE}
+    allowed = allowed_deductions(full, regime, employment_type, age, parents_senior)
+    return {s: allowed[s] for s in SECTIONS}
+
+
+def max_deductions(regime: str = "old", employment_type: str = "Salaried", age: int = 30,
+                   sections: Iterable[str] = ("standard",) + INVESTMENT_SECTIONS,
+                   parents_senior: bool = False) -> float:
+    """Total deductions reachable by claiming `sections` in full."""
+    caps = section_caps(regime, employment_type, age, parents_senior)
+    return sum(caps[s] for s in sections)
+
+
+def savings_headroom(deductions: float, regime: str = "old", employment_type: str = "Salaried",
+                     age: int = 30, income: Optional[float] = None) -> float:
+    """Further deductions available through investments (standard deduction
+    plus ``INVESTMENT_SECTIONS``) beyond what is already deducted, limited
+    to the income left to deduct from when `income` is given."""
+    headroom = max(0.0, max_deductions(regime, employment_type, age) - deductions)
+    if income is not None:
+        headroom = min(headroom, max(0.0, income - deductions))
+    return headroom
+
+
+def split_deductions(total: float, regime: str = "old", employment_type: str = "Salaried",
+                     age: int = 30) -> Dict[str, float]:
+    """Claims for a deductions total given without a breakdown.
+
+    The total is assumed to fill the standard deduction first, then
+    ``INVESTMENT_SECTIONS`` in order up to their caps; anything left is
+    put under ``24b``.
+    """
+    caps = section_caps(regime, employment_type, age)
+    left = max(0.0, total - caps["standard"])
+    claims = {}
+    for section in INVESTMENT_SECTIONS:
+        claims[section] = min(left, caps[section])
+        left -= claims[section]
+    claims["24b"] = left
+    return claims
+
+
+def _fill(budget, room: Dict[str, object], instruments: Sequence[Instrument], minimum) -> Dict[str, object]:
+    """Put `budget` into `instruments` in order, within their limits and the section `room`."""
+    room = dict(room)
+    amounts = {}
+    for instrument in instruments:
+        amount = minimum(minimum(budget, instrument.limit), room[instrument.section])
+        room[instrument.section] = room[instrument.section] - amount
+        budget = budget - amount
+        amounts[instrument.name] = amounts.get(instrument.name, 0.0) + amount
+    return amounts
+
+
+def optimize_investments(income, budget, claims: Optional[Mapping[str, object]] = None, regime: str = "old",
+                         employment_type="Salaried", age=30, parents_senior=False,
+                         instruments: Sequence[Instrument] = INSTRUMENTS) -> Allocation:
+    """Allocation of an investment budget that minimizes tax.
+
+    Every allowed rupee of deduction lowers taxable income by one rupee,
+    whichever instrument it comes from, and tax never falls as taxable
+    income rises. So the lowest tax is reached by deducting as much as the
+    budget and the section caps allow. Less money often reaches the same
+    tax: once taxable income falls into a stretch with a 0% marginal rate
+    (below the exemption limit, or at or below the 87A rebate limit) further
+    investment saves nothing. The rate table gives the end of that stretch
+    directly (``RateTable.plateau_end``), so the smallest sufficient
+    investment is found without searching. It is then spread over
+    `instruments` in order, within each instrument's limit and its
+    section's remaining cap.
+
+    Args:
+        income: gross income (scalar or array)
+        budget: money available to invest (scalar or array)
+        claims: what is already claimed per section, as for
+            ``allowed_deductions`` (see ``split_deductions`` for a total)
+        regime: "old" or "new"; the New Regime allows no investment
+            deductions, so nothing is allocated
+        employment_type, age, parents_senior: as for ``allowed_deductions``
+        instruments: where money can go, in order of preference
+
+    Returns:
+        Allocation: ``amounts`` (instrument name -> amount), ``invested``,
+            ``tax_before``, ``tax_after`` and ``saving`` (tax_before -
+            tax_after); arrays with one entry per taxpayer when any input
+            is an array
+
+    Raises:
+        ValueError: for an instrument in an unknown section, or as
+            ``allowed_deductions``
+    """
+    from .rates import by_age_band, rate_table
+
+    claims = claims or {}
+    unknown = {i.section for i in instruments} - set(CLAIMABLE)
+    if unknown:
+        raise ValueError(f"Unknown deduction section(s): {', '.join(sorted(unknown))}")
+
+    vectorized = any(_is_array(v) for v in (income, budget, *claims.values(), employment_type, age,
+                                            parents_senior))
+    minimum, maximum, _ = _ops(vectorized)
+    allowed = allowed_deductions(claims, regime, employment_type, age, parents_senior)
+    caps = allowed_deductions({s: float("inf") for s in CLAIMABLE}, regime, employment_type, age, parents_senior)
+    room = {s: caps[s] - allowed[s] for s in CLAIMABLE}
+    if vectorized:
+        import numpy as np
+        income = np.asarray(income, dtype=float)
+        budget = np.asarray(budget, dtype=float)
+
+    taxable = maximum(income - allowed["total"], 0.0)
+    reachable = sum(_fill(maximum(budget, 0.0), room, instruments, minimum).values())
+    lowest = taxable - minimum(reachable, taxable)
+    # Stop where taxable income enters a 0% stretch: going lower saves nothing
+    if vectorized:
+        target = minimum(by_age_band("plateau_ends", lowest, regime, age), taxable)
+        tax_before = by_age_band("taxes", taxable, regime, age)
+        tax_after = by_age_band("taxes", target, regime, age)
+    else:
+        table = rate_table("Individual", 0.0, regime, age=age)
+        target = min(table.plateau_end(lowest), taxable)
+        tax_before, tax_after = table.tax(taxable), table.tax(target)
+
+    amounts = _fill(taxable - target, room, instruments, minimum)
+    invested = sum(amounts.values())
+    if vectorized:
+        shape = np.broadcast(taxable, *amounts.values()).shape
+        amounts = {name: np.broadcast_to(amount, shape).astype(float) for name, amount in amounts.items()}
+        invested = np.broadcast_to(invested, shape).astype(float)
+        saving = np.round(tax_before - tax_after, 2)
+    else:
+        saving = round(tax_before - tax_after, 2)
+    return Allocation(amounts, invested, tax_before, tax_after, saving)
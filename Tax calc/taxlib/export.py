@@ -3,36 +3,181 @@
 Simple, robust helpers used by the GUI to produce PDF and Excel reports.
 They save any provided matplotlib Figures to temporary PNGs, embed those
 images into the outputs, and clean up temporary files afterwards.
+
+Rasterized figures can be shared between exporters through ``render_cache``:
+pass the same ``cache_key`` (see ``figure_cache_key``) to both exporters and
+each figure is rendered to PNG only once.
+
+PDF reports can alternatively draw their charts natively with
+``reportlab.graphics`` (``vector_charts=True``), straight from the result
+data; this needs no matplotlib figures at all and is what bulk statement
+generation uses.
 """
 
+from reportlab.graphics.charts.barcharts import VerticalBarChart
+from reportlab.graphics.charts.piecharts import Pie
+from reportlab.graphics.shapes import Drawing, String
+from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.styles import getSampleStyleSheet
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Table, TableStyle, Spacer, Image as RLImage
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.drawing.image import Image as XLImage
+from openpyxl.styles import Font
+from openpyxl.utils import get_column_letter
+import hashlib
+import io
+import json
 import os
 import subprocess
 import tempfile
-from typing import List, Optional
+import threading
+from collections import OrderedDict
+from typing import Callable, Iterable, List, Mapping, Optional
 from datetime import datetime
 
+from . import instrument
+
+
+def figure_cache_key(results: Optional[dict], chart_mode: Optional[str] = None):
+    """Return the cache key identifying dashboard renders of `results`.
+
+    The key combines a digest of the calculation result with the dashboard
+    chart mode; figure index and size are added per figure by ``RenderCache``.
+    """
+    payload = json.dumps(results or {}, sort_keys=True, default=str)
+    digest = hashlib.sha1(payload.encode('utf-8')).hexdigest()
+    return (digest, chart_mode or '')
+
+
+class RenderCache:
+    """Bounded LRU cache of rasterized dashboard figures (PNG bytes).
+
+    Entries are keyed by ``(cache_key, figure index, figure size, dpi)`` so a
+    figure is rendered once per result and chart mode and reused by every
+    exporter. The index must identify the figure (the dashboard tab), not
+    its position in a list that can grow. The least recently used images
+    are evicted once the total size exceeds `max_bytes`.
+    """
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[tuple, bytes]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def size(self):
+        """Total number of cached bytes."""
+        return self._size
+
+    @staticmethod
+    def entry_key(fig, index: int, cache_key) -> tuple:
+        try:
+            w, h = fig.get_size_inches()
+            size = (round(float(w), 3), round(float(h), 3))
+        except Exception:
+            size = None
+        return (cache_key, index, size, getattr(fig, 'dpi', None))
+
+    def get(self, key) -> Optional[bytes]:
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+            return data
+
+    def put(self, key, data: bytes):
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= len(old)
+            if len(data) > self.max_bytes:
+                return
+            self._entries[key] = data
+            self._size += len(data)
+            while self._size > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def clear(self):
+        """Drop every cached image (call when results or chart mode change)."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
 
-def _save_figs_to_temp_png(figs: Optional[List]):
+    def render(self, fig, index: int, cache_key) -> bytes:
+        """Return PNG bytes for `fig`, rasterizing it only on a cache miss."""
+        key = self.entry_key(fig, index, cache_key)
+        data = self.get(key)
+        if data is None:
+            buf = io.BytesIO()
+            fig.savefig(buf, format='png', bbox_inches='tight')
+            data = buf.getvalue()
+            self.put(key, data)
+        return data
+
+
+# Shared by the PDF and Excel exporters
+render_cache = RenderCache()
+
+
+def dashboard_render_steps(dashboard, cache_key, images: list) -> List[Callable[[], None]]:
+    """Steps rasterizing the built figures of `dashboard` into `images`, one
+    figure per step (for a job's UI-thread ``prepare`` list).
+
+    Each figure is cached under its tab index from ``dashboard.tab_figures()``.
+    Tabs are built on first visit, so a figure's position among the built
+    figures changes and must not be used as its key. Running chart
+    animations are finished (``dashboard.stop_animations()``) before each
+    render, since an animation can restart between steps and a partial
+    frame must never be exported or cached.
+    """
+    def step(index, fig):
+        dashboard.stop_animations()
+        images.append(render_cache.render(fig, index, cache_key))
+
+    return [lambda index=index, fig=fig: step(index, fig) for index, fig in dashboard.tab_figures()]
+
+
+def _save_figs_to_temp_png(figs, cache_key=None):
     """Save matplotlib Figure objects to temp PNG files and return paths.
 
-    figs: list of matplotlib.figure.Figure or objects exposing ``savefig(path)``.
+    figs: list of matplotlib.figure.Figure or objects exposing ``savefig(path)``,
+    or a mapping of dashboard tab index -> figure (e.g. ``dict(dashboard.tab_figures())``);
+    PNG ``bytes`` rendered earlier (e.g. by ``RenderCache.render``) are written as-is.
+    cache_key: optional key from ``figure_cache_key``; when given and `figs`
+    is a mapping, rendered images are taken from (and stored in)
+    ``render_cache`` under their tab index. A list position does not
+    identify a figure, so list entries are always rendered.
     Returns list of filesystem paths. Caller should remove files after use.
     """
     if not figs:
         return []
+    if isinstance(figs, Mapping):
+        items = list(figs.items())
+    else:
+        items = list(enumerate(figs))
+        cache_key = None
     paths: List[str] = []
-    for i, fig in enumerate(figs):
+    for i, (index, fig) in enumerate(items):
         try:
             tmp = tempfile.NamedTemporaryFile(delete=False, suffix=f"_dashboard_{i}.png")
             tmp.close()
             # fig may be a matplotlib Figure or similar object with savefig
             try:
-                fig.savefig(tmp.name, bbox_inches='tight')
+                if isinstance(fig, bytes):
+                    with open(tmp.name, 'wb') as f:
+                        f.write(fig)
+                elif cache_key is not None and not isinstance(fig, str):
+                    with open(tmp.name, 'wb') as f:
+                        f.write(render_cache.render(fig, index, cache_key))
+                else:
+                    fig.savefig(tmp.name, bbox_inches='tight')
             except Exception:
                 # if it's already a path-like object, try copying
                 try:
@@ -58,11 +203,135 @@ def _cleanup_temp_files(paths: List[str]):
             pass
 
 
-def export_report_pdf(results: Optional[dict], path: str, figs: Optional[List] = None):
+# Same palettes as the dashboard charts
+_INCOME_COLORS = ['#FF6B6B', '#4ECDC4', '#FFD93D', '#6BCF7F']
+_SLAB_COLORS = ['#27AE60', '#F39C12', '#E74C3C', '#8E44AD', '#3498DB', '#9B59B6', '#34495E']
+_COMPONENT_COLORS = ['#3498DB', '#27AE60', '#F39C12', '#E74C3C']
+
+
+def _chart_drawing(title: str, width: float, height: float) -> Drawing:
+    d = Drawing(width, height)
+    d.add(String(width / 2, height - 14, title, fontName='Helvetica-Bold', fontSize=12, textAnchor='middle'))
+    return d
+
+
+def _bar_chart(title: str, labels: List[str], values: List[float], palette: List[str],
+               width: float = 450, height: float = 220) -> Drawing:
+    d = _chart_drawing(title, width, height)
+    chart = VerticalBarChart()
+    chart.x, chart.y = 60, 35
+    chart.width, chart.height = width - 80, height - 70
+    chart.data = [values]
+    chart.categoryAxis.categoryNames = labels
+    chart.categoryAxis.labels.fontName = 'Helvetica'
+    chart.categoryAxis.labels.fontSize = 7
+    chart.valueAxis.valueMin = 0
+    chart.valueAxis.labels.fontName = 'Helvetica'
+    chart.valueAxis.labels.fontSize = 7
+    chart.valueAxis.labelTextFormat = lambda v: f"{v:,.0f}"
+    chart.bars.strokeColor = None
+    for i in range(len(values)):
+        chart.bars[(0, i)].fillColor = colors.HexColor(palette[i % len(palette)])
+    chart.barLabelFormat = lambda v: f"{v:,.0f}" if v else ''
+    chart.barLabels.fontName = 'Helvetica'
+    chart.barLabels.fontSize = 7
+    chart.barLabels.nudge = 6
+    d.add(chart)
+    return d
+
+
+def _income_distribution_chart(results: dict) -> Drawing:
+    steps = results["steps"]
+    emi = results.get("emi", 0) or 0
+    gross, deductions, tax = steps["gross"], steps["deductions"], steps["total"]
+    take_home = max(0, gross - deductions - tax - emi)
+    labels = ['Deductions', 'Tax', 'EMI', 'Net Income']
+    values = [deductions, tax, emi, take_home]
+
+    d = _chart_drawing('Income Distribution', 450, 220)
+    pie = Pie()
+    pie.x, pie.y = 150, 20
+    pie.width = pie.height = 160
+    # reportlab cannot draw an all-zero pie; keep empty slices invisible instead
+    pie.data = [max(v, 0) for v in values] if any(v > 0 for v in values) else [1, 0, 0, 0]
+    total = sum(pie.data)
+    pie.labels = [f"{lab} {v / total * 100:.1f}%" if v > 0 else '' for lab, v in zip(labels, pie.data)]
+    pie.startAngle = 90
+    pie.direction = 'clockwise'
+    pie.slices.strokeColor = colors.white
+    pie.slices.fontName = 'Helvetica'
+    pie.slices.fontSize = 8
+    for i, c in enumerate(_INCOME_COLORS):
+        pie.slices[i].fillColor = colors.HexColor(c)
+    d.add(pie)
+    return d
+
+
+def _slab_breakdown_chart(results: dict) -> Optional[Drawing]:
+    slab = results.get("slab")
+    if not slab:
+        return None
+    return _bar_chart('Tax by Slab', [str(k) for k in slab], [float(v) for v in slab.values()], _SLAB_COLORS)
+
+
+def _tax_components_chart(results: dict) -> Drawing:
+    steps = results["steps"]
+    labels = ['Basic Tax', 'Rebate', 'Cess', 'Total Tax']
+    values = [steps["tax_before"], steps["rebate"], steps["cess"], steps["total"]]
+    return _bar_chart('Tax Components', labels, [float(v) for v in values], _COMPONENT_COLORS)
+
+
+def build_vector_charts(results: dict) -> List[Drawing]:
+    """Draw the income distribution, slab breakdown and tax components charts.
+
+    Returns reportlab ``Drawing`` flowables built directly from `results`
+    (a result dict as produced by ``calculate_pan_results``); no matplotlib
+    rendering is involved. Charts whose data is missing are skipped.
+    """
+    drawings = []
+    for build in (_income_distribution_chart, _slab_breakdown_chart, _tax_components_chart):
+        try:
+            drawing = build(results)
+        except (KeyError, TypeError, ZeroDivisionError):
+            continue
+        if drawing is not None:
+            drawings.append(drawing)
+    return drawings
+
+
+PROJECTION_HEADER = ["Year", "Income", "Deductions", "EMI", "Tax", "Take-home", "Take-home (today's money)"]
+
+
+def projection_rows(results: Optional[dict]) -> List[list]:
+    """Year-by-year projection of `results` (header first), or [] when the
+    results lack the data to project."""
+    from .projection import project_results
+    try:
+        p = project_results(results)
+    except (KeyError, TypeError, ValueError, AttributeError):
+        return []
+    rows = [PROJECTION_HEADER]
+    for i, year in enumerate(p.years):
+        rows.append([int(year) + 1] + [round(float(column[i]), 2) for column in
+                                       (p.income, p.deductions, p.emi, p.tax, p.take_home, p.real_take_home)])
+    return rows
+
+
+@instrument.timed("export.pdf")
+def export_report_pdf(results: Optional[dict], path: str, figs=None,
+                      cache_key=None, vector_charts: bool = False, projection: bool = False,
+                      progress: Optional[Callable[[int, int], None]] = None):
     """Create a simple PDF report including `results` summary and dashboard images.
 
     - `results` is expected to be a mapping-like object with printable keys/values.
-    - `figs` is an optional list of matplotlib Figures (or objects with savefig).
+    - `figs` is an optional list of matplotlib Figures (or objects with savefig),
+      or a mapping of dashboard tab index -> figure.
+    - `cache_key` reuses renders of a `figs` mapping from ``render_cache`` (see
+      ``figure_cache_key``).
+    - `vector_charts` draws native charts from `results` instead of embedding `figs`.
+    - `projection` adds a year-by-year projection table (see ``projection_rows``).
+    - `progress(done, total)` is called after each embedded image and page;
+      an exception raised from it aborts the export.
     """
     doc = SimpleDocTemplate(path, pagesize=A4)
     styles = getSampleStyleSheet()
@@ -86,26 +355,63 @@ def export_report_pdf(results: Optional[dict], path: str, figs: Optional[List] =
     story.append(tbl)
     story.append(Spacer(1, 12))
 
+    projection = projection_rows(results) if projection else []
+    if projection:
+        story.append(Paragraph(f"{len(projection) - 1}-Year Projection", styles['Heading2']))
+        cells = [projection[0]] + [[row[0]] + [f"{v:,.0f}" for v in row[1:]] for row in projection[1:]]
+        proj_tbl = Table(cells)
+        proj_tbl.setStyle(TableStyle([
+            ('GRID', (0, 0), (-1, -1), 0.5, (0, 0, 0)),
+            ('BACKGROUND', (0, 0), (-1, 0), (0.9, 0.9, 0.9)),
+            ('FONTSIZE', (0, 0), (-1, -1), 8),
+            ('ALIGN', (1, 1), (-1, -1), 'RIGHT'),
+        ]))
+        story.append(proj_tbl)
+        story.append(Spacer(1, 12))
+
+    if vector_charts and results:
+        for drawing in build_vector_charts(results):
+            story.append(drawing)
+            story.append(Spacer(1, 12))
+        figs = None
+
     # Embed dashboard images
-    img_paths = _save_figs_to_temp_png(figs)
+    img_paths = _save_figs_to_temp_png(figs, cache_key)
+    total = len(img_paths) + 1
     try:
-        for p in img_paths:
+        for i, p in enumerate(img_paths):
             try:
                 img = RLImage(p, width=450, height=300)
                 story.append(img)
                 story.append(Spacer(1, 12))
             except Exception:
                 continue
-        doc.build(story)
+            if progress:
+                progress(i + 1, total)
+        if progress:
+            def on_page(canvas, doc):
+                progress(total - 1, total)
+            doc.build(story, onFirstPage=on_page, onLaterPages=on_page)
+            progress(total, total)
+        else:
+            doc.build(story)
     finally:
         _cleanup_temp_files(img_paths)
 
 
-def export_report_excel(results: Optional[dict], path: str, figs: Optional[List] = None):
+@instrument.timed("export.excel")
+def export_report_excel(results: Optional[dict], path: str, figs=None,
+                        cache_key=None, projection: bool = False,
+                        progress: Optional[Callable[[int, int], None]] = None):
     """Create a simple Excel workbook with a summary sheet and optional image sheets.
 
-    The function writes `results` into the first sheet and places each image
-    into its own sheet named `Dashboard_1`, `Dashboard_2`, ...
+    The function writes `results` into the first sheet, with `projection` a
+    year-by-year projection (see ``projection_rows``) into `Projection`, and
+    places each image into its own sheet named `Dashboard_1`, `Dashboard_2`, ...
+    `figs` is a list or a tab index -> figure mapping as for
+    ``export_report_pdf``; `cache_key` reuses renders of a mapping from
+    ``render_cache``. `progress(done, total)` is called after each image
+    sheet and once saved (an exception raised from it aborts the export).
     """
     wb = Workbook()
     ws = wb.active
@@ -130,7 +436,14 @@ def export_report_excel(results: Optional[dict], path: str, figs: Optional[List]
                 except Exception:
                     ws.append([str(k), str(v)])
 
-    img_paths = _save_figs_to_temp_png(figs)
+    projection = projection_rows(results) if projection else []
+    if projection:
+        ws_proj = wb.create_sheet(title="Projection")
+        for row in projection:
+            ws_proj.append(row)
+
+    img_paths = _save_figs_to_temp_png(figs, cache_key)
+    total = len(img_paths) + 1
     try:
         for i, p in enumerate(img_paths):
             try:
@@ -139,11 +452,124 @@ def export_report_excel(results: Optional[dict], path: str, figs: Optional[List]
                 ws_img.add_image(img, 'A1')
             except Exception:
                 continue
+            if progress:
+                progress(i + 1, total)
         wb.save(path)
+        if progress:
+            progress(total, total)
     finally:
         _cleanup_temp_files(img_paths)
 
 
+# Column types for streaming exports: name -> (converter, number format)
+COLUMN_TYPES = {
+    'str': (str, None),
+    'int': (int, '0'),
+    'float': (float, '0.00'),
+    'currency': (float, '#,##0.00'),
+    'percent': (float, '0.00%'),
+    'date': (None, 'yyyy-mm-dd'),
+}
+
+# Flat per-taxpayer columns produced by ``results_rows``
+RESULT_COLUMNS = [
+    ("PAN", 'str'),
+    ("Entity", 'str'),
+    ("Employment Type", 'str'),
+    ("Age", 'int'),
+    ("Gross Income", 'currency'),
+    ("Deductions", 'currency'),
+    ("Taxable Income", 'currency'),
+    ("Tax Before Rebate", 'currency'),
+    ("Rebate", 'currency'),
+    ("Cess", 'currency'),
+    ("Total Tax", 'currency'),
+    ("Monthly EMI", 'currency'),
+    ("Net Take-home", 'currency'),
+]
+
+
+def results_rows(records: Iterable[dict]):
+    """Yield one flat row per result dict, matching ``RESULT_COLUMNS``."""
+    for r in records:
+        steps = r["steps"]
+        yield (r["pan"], r["entity"], r.get("employment_type", ""), r.get("age"),
+               steps["gross"], steps["deductions"], steps["taxable"], steps["tax_before"],
+               steps["rebate"], steps["cess"], steps["total"], r["emi"], r["take_home"])
+
+
+def _typed_row_writer(ws, columns):
+    """Return (header, convert) where convert turns a raw row into typed cells.
+
+    Formatted columns reuse one styled ``WriteOnlyCell`` each: write-only
+    sheets serialize a row as soon as it is appended, so only the value has to
+    change per row and no style lookup is paid per cell.
+    """
+    header = []
+    specs = []
+    for col in columns:
+        name, ctype = (col, 'str') if isinstance(col, str) else col
+        header.append(name)
+        converter, fmt = COLUMN_TYPES[ctype]
+        cell = None
+        if fmt is not None:
+            cell = WriteOnlyCell(ws)
+            cell.number_format = fmt
+        specs.append((converter, cell))
+
+    def convert(row):
+        out = []
+        for value, (converter, cell) in zip(row, specs):
+            if value is not None and converter is not None:
+                try:
+                    value = converter(value)
+                except (TypeError, ValueError):
+                    value = str(value)
+            if cell is not None and value is not None and not isinstance(value, str):
+                cell.value = value
+                value = cell
+            out.append(value)
+        return out
+
+    return header, convert
+
+
+def export_rows_excel(path: str, sheets: Iterable[tuple], column_width: float = 16) -> dict:
+    """Stream large tabular data into an Excel workbook with flat memory use.
+
+    Uses openpyxl's write-only mode: rows are serialized as they are appended
+    and never kept in memory, so `rows` can be a generator or a DB cursor of
+    any length.
+
+    `sheets` is an iterable of ``(title, columns, rows)`` where `columns` is a
+    list of ``(header, type)`` pairs (types from ``COLUMN_TYPES``; a bare
+    header string means ``'str'``) and `rows` an iterable of sequences.
+    Returns a dict mapping each sheet title to its number of data rows.
+    """
+    wb = Workbook(write_only=True)
+    counts = {}
+    for title, columns, rows in sheets:
+        ws = wb.create_sheet(title=title)
+        for i in range(1, len(columns) + 1):
+            ws.column_dimensions[get_column_letter(i)].width = column_width
+        ws.freeze_panes = 'A2'
+        header, convert = _typed_row_writer(ws, columns)
+        bold = Font(bold=True)
+        header_cells = []
+        for name in header:
+            cell = WriteOnlyCell(ws, value=name)
+            cell.font = bold
+            header_cells.append(cell)
+        ws.append(header_cells)
+        n = 0
+        for row in rows:
+            ws.append(convert(row))
+            n += 1
+        counts[title] = n
+    wb.save(path)
+    return counts
+
+
 def print_pdf(path: str):
     """Send a PDF file to the default printer on Windows using `os.startfile`.
 
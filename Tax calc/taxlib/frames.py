@@ -0,0 +1,144 @@
+"""A single frame clock for GUI animations.
+
+Instead of every animation scheduling its own timer (a number tween used to
+queue 40 ``after`` callbacks, every chart had its own timer), animations
+register a callback with one clock. The clock ticks once per frame while
+anything is registered and calls every callback with the same timestamp.
+
+Animations are time based: a callback computes its state from ``now`` rather
+than counting ticks, so when a frame runs late the clock simply skips ahead
+(the missed frames are counted as dropped) and only ever has one tick
+pending. Frame times are measured and reported by ``stats()``.
+
+Like ``jobs.JobManager`` it is toolkit agnostic: it only needs a
+``schedule(ms, callback)`` function such as ``app.after``.
+"""
+
+import logging
+import time
+from collections import deque
+from typing import Callable, Hashable, Optional
+
+FrameCallback = Callable[[float], bool]
+
+logger = logging.getLogger(__name__)
+
+
+def ease_out_quad(t: float) -> float:
+    return t * (2 - t)
+
+
+def linear(t: float) -> float:
+    return t
+
+
+class FrameClock:
+    """Runs registered animations from one timer.
+
+    Args:
+        schedule: ``schedule(ms, callback)`` running `callback` later on
+            the UI thread
+        fps: target frame rate
+        clock: time source (seconds), ``time.perf_counter`` by default
+    """
+
+    def __init__(self, schedule: Callable, fps: int = 60, clock: Callable[[], float] = time.perf_counter):
+        self.schedule = schedule
+        self.fps = fps
+        self.interval = 1.0 / fps
+        self.clock = clock
+        self.frames = 0
+        self.dropped = 0
+        self.frame_times = deque(maxlen=240)  # seconds spent inside recent ticks
+        self._animations = {}  # key -> callback(now) returning True to keep running
+        self._pending = False
+        self._last_tick = None
+        self._keys = 0
+
+    @property
+    def active(self) -> int:
+        return len(self._animations)
+
+    def add(self, callback: FrameCallback, key: Optional[Hashable] = None) -> Hashable:
+        """Call `callback(now)` every frame until it returns False.
+
+        An animation registered under an existing `key` replaces the old
+        one (e.g. a new number tween on the same label). Returns the key.
+        """
+        if key is None:
+            self._keys += 1
+            key = ("anim", self._keys)
+        self._animations[key] = callback
+        self._wake()
+        return key
+
+    def remove(self, key: Hashable):
+        self._animations.pop(key, None)
+
+    def tween(self, duration_ms: float, update: Callable[[float], None],
+              ease: Callable[[float], float] = ease_out_quad,
+              on_done: Optional[Callable[[], None]] = None, key: Optional[Hashable] = None) -> Hashable:
+        """Call `update(eased progress)` every frame for `duration_ms`.
+
+        The last call always receives 1.0, then `on_done` runs.
+        """
+        start = self.clock()
+        duration = max(duration_ms / 1000.0, 1e-9)
+
+        def step(now):
+            t = min(1.0, (now - start) / duration)
+            update(ease(t))
+            if t < 1.0:
+                return True
+            if on_done:
+                on_done()
+            return False
+
+        return self.add(step, key)
+
+    def stats(self) -> dict:
+        """Frame counters and frame-time statistics (milliseconds)."""
+        times = list(self.frame_times)
+        return {
+            "frames": self.frames,
+            "dropped": self.dropped,
+            "active": self.active,
+            "avg_ms": sum(times) / len(times) * 1000 if times else 0.0,
+            "max_ms": max(times) * 1000 if times else 0.0,
+        }
+
+    def _wake(self):
+        if not self._pending:
+            self._pending = True
+            self._last_tick = None
+            self.schedule(0, self._tick)
+
+    def _tick(self):
+        self._pending = False
+        now = self.clock()
+        if self._last_tick is not None:
+            # Frames that should have happened while we were late are skipped
+            missed = int((now - self._last_tick) / self.interval) - 1
+            if missed > 0:
+                self.dropped += missed
+        self._last_tick = now
+
+        for key, callback in list(self._animations.items()):
+            try:
+                keep = callback(now)
+            except Exception:
+                # One broken animation must not stop the others, but the
+                # error has to be visible
+                logger.exception("Animation %r failed and was stopped", key)
+                keep = False
+            if not keep and self._animations.get(key) is callback:
+                del self._animations[key]
+
+        spent = self.clock() - now
+        self.frames += 1
+        self.frame_times.append(spent)
+        if self._animations:
+            # One pending tick at most: wait for the rest of this frame
+            self._pending = True
+            delay_ms = max(1, int((self.interval - spent) * 1000))
+            self.schedule(delay_ms, self._tick)
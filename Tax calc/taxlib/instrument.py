@@ -0,0 +1,188 @@
+"""Lightweight timing instrumentation for hot paths.
+
+Code marks interesting work with named spans::
+
+    with instrument.span("calculation"):
+        results = calculate_pan_results(...)
+
+Each finished span adds its duration to an in-process registry (count,
+total, min and max per name; thread safe, so worker threads can record
+too). Instrumentation is off by default. ``span`` then returns a shared
+no-op context manager, which costs one function call and one flag check.
+It is switched on with ``TAXFLOW_METRICS=1`` or ``"metrics": true`` in the
+config file, and a per-session summary is appended to ``LOG_FILE`` on exit.
+
+Span names used by the app: validation, calculation, db.save,
+details.render, dashboard.build, dashboard.tab, chart.frame, chart.layout,
+export.pdf and export.excel.
+"""
+
+import functools
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Optional
+
+ENV_VAR = "TAXFLOW_METRICS"
+CONFIG_KEY = "metrics"
+LOG_FILE = "taxflow_metrics.log"
+
+
+class Metrics:
+    """Aggregated span timings and gauges."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._spans: Dict[str, list] = {}  # name -> [count, total, min, max, errors]
+        self.gauges: Dict[str, float] = {}
+
+    def record(self, name: str, seconds: float, error: bool = False):
+        with self._lock:
+            stats = self._spans.get(name)
+            if stats is None:
+                self._spans[name] = [1, seconds, seconds, seconds, int(error)]
+            else:
+                stats[0] += 1
+                stats[1] += seconds
+                if seconds < stats[2]:
+                    stats[2] = seconds
+                if seconds > stats[3]:
+                    stats[3] = seconds
+                stats[4] += error
+
+    def gauge(self, name: str, value: float):
+        """Record a point-in-time value (e.g. dropped frames) for the summary."""
+        with self._lock:
+            self.gauges[name] = value
+
+    def snapshot(self) -> Dict[str, dict]:
+        """Per-span statistics in milliseconds."""
+        with self._lock:
+            return {
+                name: {
+                    "count": count,
+                    "total_ms": total * 1000,
+                    "avg_ms": total / count * 1000,
+                    "min_ms": lo * 1000,
+                    "max_ms": hi * 1000,
+                    "errors": errors,
+                }
+                for name, (count, total, lo, hi, errors) in self._spans.items()
+            }
+
+    def reset(self):
+        with self._lock:
+            self._spans.clear()
+            self.gauges.clear()
+
+    def summary(self) -> str:
+        lines = [f"TaxFlow session metrics ({datetime.now():%Y-%m-%d %H:%M:%S})", "=" * 78,
+                 f"{'span':<24}{'count':>8}{'total ms':>12}{'avg ms':>10}{'min ms':>10}{'max ms':>10}"]
+        for name, s in sorted(self.snapshot().items()):
+            errors = f"  ({s['errors']} failed)" if s["errors"] else ""
+            lines.append(f"{name:<24}{s['count']:>8}{s['total_ms']:>12.1f}{s['avg_ms']:>10.2f}"
+                         f"{s['min_ms']:>10.2f}{s['max_ms']:>10.2f}{errors}")
+        for name, value in sorted(self.gauges.items()):
+            lines.append(f"{name:<24}{value:>8g}")
+        return "\n".join(lines)
+
+
+registry = Metrics()
+_enabled = False
+
+
+class _Span:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        registry.record(self.name, time.perf_counter() - self.start, error=exc_type is not None)
+        return False
+
+
+class _NoSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+def span(name: str):
+    """Context manager timing the enclosed block under `name` (no-op when disabled)."""
+    if not _enabled:
+        return _NO_SPAN
+    return _Span(name)
+
+
+def timed(name: str):
+    """Decorator timing every call of the function under `name`."""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def record(name: str, seconds: float):
+    """Record an externally measured duration under `name`."""
+    if _enabled:
+        registry.record(name, seconds)
+
+
+def gauge(name: str, value: float):
+    if _enabled:
+        registry.gauge(name, value)
+
+
+def enable(on: bool = True):
+    global _enabled
+    _enabled = bool(on)
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def configure() -> bool:
+    """Enable instrumentation from the environment or the config file."""
+    on = os.environ.get(ENV_VAR, "") not in ("", "0")
+    if not on:
+        from . import config
+        on = bool(config.get(CONFIG_KEY, False))
+    enable(on)
+    return on
+
+
+def write_summary(path: Optional[str] = None) -> Optional[str]:
+    """Append the session summary to `path` (default ``LOG_FILE``).
+
+    Does nothing when disabled or when nothing was recorded. Returns the
+    path written to.
+    """
+    if not _enabled or not (registry.snapshot() or registry.gauges):
+        return None
+    path = path or LOG_FILE
+    try:
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(registry.summary() + "\n\n")
+    except OSError as e:
+        if sys.stderr is not None:
+            print(f"Could not write metrics to {path}: {e}", file=sys.stderr)
+        return None
+    return path
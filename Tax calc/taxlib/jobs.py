@@ -0,0 +1,224 @@
+"""Background job queue for long-running GUI work such as report exports.
+
+Jobs run one after another on a single worker thread so the Tk main loop
+stays responsive. The worker never touches widgets: progress and state
+changes are queued and delivered on the UI thread by polling through a
+``schedule(ms, callback)`` function (``app.after`` in the GUI).
+
+A job may declare ``prepare`` steps that must run on the UI thread (for
+example rasterizing matplotlib figures, which belong to the Tk canvas).
+They run one per scheduler tick right after submission, before the job is
+queued for the worker. Cancellation is cooperative: ``Job.report`` raises
+``JobCancelled`` once the job has been cancelled.
+"""
+
+import itertools
+import queue
+import threading
+from typing import Callable, List, Optional
+
+QUEUED = "queued"
+PREPARING = "preparing"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+FINISHED_STATES = (DONE, FAILED, CANCELLED)
+
+
+class JobCancelled(Exception):
+    """Raised inside a job's work function when the job has been cancelled."""
+
+
+class Job:
+    """A unit of background work with progress and cancellation."""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, label: str, work: Callable[["Job"], object],
+                 prepare: Optional[List[Callable[[], None]]] = None,
+                 on_done: Optional[Callable[["Job"], None]] = None):
+        self.id = next(self._ids)
+        self.label = label
+        self.work = work
+        self.prepare = list(prepare or [])
+        self.on_done = on_done
+        self.state = QUEUED
+        self.progress = 0.0
+        self.result = None
+        self.error: Optional[BaseException] = None
+        self._cancel = threading.Event()
+        self._events: Optional[queue.Queue] = None
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def cancel(self):
+        """Request cancellation; takes effect at the job's next checkpoint."""
+        self._cancel.set()
+
+    def check(self):
+        """Raise ``JobCancelled`` if the job has been cancelled."""
+        if self._cancel.is_set():
+            raise JobCancelled(self.label)
+
+    def report(self, done: float, total: float = 1.0):
+        """Report progress from the worker thread (also a cancellation checkpoint)."""
+        self.check()
+        if self._events is not None:
+            self._events.put((self, None, done / total if total else 1.0))
+
+    def __repr__(self):
+        return f"<Job {self.id} {self.label!r} {self.state} {self.progress:.0%}>"
+
+
+class JobManager:
+    """Runs jobs serially on a worker thread and reports back on the UI thread.
+
+    Args:
+        schedule: ``schedule(ms, callback)`` running `callback` on the UI
+            thread later, e.g. ``app.after``
+        on_update: called on the UI thread with the job whenever its state
+            or progress changes
+        poll_ms: how often pending worker events are delivered
+    """
+
+    def __init__(self, schedule: Callable, on_update: Optional[Callable[[Job], None]] = None,
+                 poll_ms: int = 50):
+        self.schedule = schedule
+        self.on_update = on_update
+        self.poll_ms = poll_ms
+        self.jobs: List[Job] = []  # jobs not finished yet, in submission order
+        self._queue: "queue.Queue[Job]" = queue.Queue()
+        self._events: queue.Queue = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._polling = False
+
+    @property
+    def current(self) -> Optional[Job]:
+        """The job currently running on the worker, if any."""
+        for j in self.jobs:
+            if j.state == RUNNING:
+                return j
+        return None
+
+    def submit(self, label: str, work: Callable[[Job], object],
+               prepare: Optional[List[Callable[[], None]]] = None,
+               on_done: Optional[Callable[[Job], None]] = None) -> Job:
+        """Queue `work(job)` for the worker thread and return the job.
+
+        `prepare` callables run on the UI thread first, one per tick;
+        `on_done(job)` runs on the UI thread once the job has finished,
+        failed or been cancelled.
+        """
+        job = Job(label, work, prepare, on_done)
+        job._events = self._events
+        self.jobs.append(job)
+        if job.prepare:
+            job.state = PREPARING
+            self._notify(job)
+            self.schedule(0, lambda: self._prepare_step(job))
+        else:
+            self._enqueue(job)
+        return job
+
+    def cancel(self, job: Optional[Job] = None):
+        """Cancel `job`, or the running job (else the oldest active one)."""
+        job = job or self.current or next(iter(self.jobs), None)
+        if job is None or job.state in FINISHED_STATES:
+            return
+        job.cancel()
+        if job.state in (QUEUED, PREPARING):
+            # Not started on the worker yet: finish it right away
+            self._finish(job, CANCELLED)
+
+    def cancel_all(self):
+        for job in list(self.jobs):
+            self.cancel(job)
+
+    def _prepare_step(self, job: Job):
+        if job.state in FINISHED_STATES:
+            return
+        try:
+            job.check()
+            if job.prepare:
+                job.prepare.pop(0)()
+        except JobCancelled:
+            self._finish(job, CANCELLED)
+            return
+        except Exception as e:
+            job.error = e
+            self._finish(job, FAILED)
+            return
+        if job.prepare:
+            self.schedule(0, lambda: self._prepare_step(job))
+        else:
+            self._enqueue(job)
+
+    def _enqueue(self, job: Job):
+        job.state = QUEUED
+        self._notify(job)
+        self._queue.put(job)
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._run, name="taxflow-jobs", daemon=True)
+            self._worker.start()
+        self._start_polling()
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            if job.cancelled:
+                self._events.put((job, CANCELLED, None))
+                continue
+            self._events.put((job, RUNNING, None))
+            try:
+                job.result = job.work(job)
+                state = CANCELLED if job.cancelled else DONE
+            except JobCancelled:
+                state = CANCELLED
+            except Exception as e:
+                job.error = e
+                state = FAILED
+            self._events.put((job, state, None))
+
+    def _start_polling(self):
+        if not self._polling:
+            self._polling = True
+            self.schedule(self.poll_ms, self._poll)
+
+    def _poll(self):
+        while True:
+            try:
+                job, state, progress = self._events.get_nowait()
+            except queue.Empty:
+                break
+            if job.state in FINISHED_STATES:
+                continue
+            if state is None:
+                job.progress = progress
+                self._notify(job)
+            elif state in FINISHED_STATES:
+                self._finish(job, state)
+            else:
+                job.state = state
+                self._notify(job)
+        if any(j.state in (QUEUED, RUNNING) for j in self.jobs):
+            self.schedule(self.poll_ms, self._poll)
+        else:
+            self._polling = False
+
+    def _finish(self, job: Job, state: str):
+        job.state = state
+        if state == DONE:
+            job.progress = 1.0
+        self._notify(job)
+        if job in self.jobs:
+            self.jobs.remove(job)
+        if job.on_done:
+            job.on_done(job)
+
+    def _notify(self, job: Job):
+        if self.on_update:
+            self.on_update(job)
@@ -0,0 +1,122 @@
+"""Debounced background recalculation for the live input mode.
+
+Every keystroke in an input field calls ``LiveCalculator.request``. Requests
+are debounced (only the last one in a burst is submitted), computed on a
+single worker thread, and results are delivered on the UI thread through the
+same ``schedule``-based polling ``jobs.JobManager`` uses. Each request gets a
+generation number; anything older than the newest request is dropped, both
+before it is computed and when its result comes back, so the UI only ever
+sees the latest inputs.
+"""
+
+import queue
+import threading
+from typing import Callable, Optional
+
+
+class LiveCalculator:
+    """Runs `compute` off the UI thread and delivers only the latest result.
+
+    Args:
+        schedule: ``schedule(ms, callback)`` running `callback` on the UI
+            thread later, e.g. ``app.after``
+        compute: ``compute(*args)`` called on the worker thread; must not
+            touch widgets
+        on_result: called on the UI thread with the newest result
+        on_error: called on the UI thread with the exception if the newest
+            request failed
+        delay_ms: debounce delay for ``request``
+        poll_ms: how often finished results are collected
+    """
+
+    def __init__(self, schedule: Callable, compute: Callable, on_result: Callable,
+                 on_error: Optional[Callable[[BaseException], None]] = None,
+                 delay_ms: int = 300, poll_ms: int = 30):
+        self.schedule = schedule
+        self.compute = compute
+        self.on_result = on_result
+        self.on_error = on_error
+        self.delay_ms = delay_ms
+        self.poll_ms = poll_ms
+        self.generation = 0
+        self.computed = 0
+        self.dropped = 0
+        self._next = None  # (generation, args) waiting for the worker
+        self._cond = threading.Condition()
+        self._results: queue.Queue = queue.Queue()
+        self._outstanding = 0  # submitted requests whose outcome is not collected yet
+        self._worker: Optional[threading.Thread] = None
+        self._polling = False
+
+    @property
+    def busy(self) -> bool:
+        return self._outstanding > 0
+
+    def request(self, *args, delay_ms: Optional[int] = None):
+        """Recalculate for `args` once no newer request arrives within the delay."""
+        self.generation += 1
+        generation = self.generation
+        delay = self.delay_ms if delay_ms is None else delay_ms
+        self.schedule(delay, lambda: self._submit(generation, args))
+
+    def cancel(self):
+        """Forget pending and running requests; their results are dropped."""
+        self.generation += 1
+
+    def _submit(self, generation: int, args: tuple):
+        if generation != self.generation:
+            return  # superseded while debouncing
+        with self._cond:
+            replaced = self._next is not None
+            self._next = (generation, args)
+            self._cond.notify()
+        if replaced:
+            self.dropped += 1
+        else:
+            self._outstanding += 1
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._run, name="taxflow-live", daemon=True)
+            self._worker.start()
+        if not self._polling:
+            self._polling = True
+            self.schedule(self.poll_ms, self._poll)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._next is None:
+                    self._cond.wait()
+                generation, args = self._next
+                self._next = None
+            if generation != self.generation:
+                self._results.put((generation, None, None, False))
+                continue
+            try:
+                self._results.put((generation, self.compute(*args), None, True))
+            except Exception as e:
+                self._results.put((generation, None, e, True))
+
+    def _poll(self):
+        latest = None
+        while True:
+            try:
+                item = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._outstanding -= 1
+            generation, result, error, ran = item
+            self.computed += ran
+            if generation == self.generation:
+                latest = item
+            else:
+                self.dropped += 1
+        if latest is not None:
+            _, result, error, _ = latest
+            if error is None:
+                self.on_result(result)
+            elif self.on_error:
+                self.on_error(error)
+        if self._outstanding > 0:
+            self.schedule(self.poll_ms, self._poll)
+        else:
+            self._polling = False
@@ -0,0 +1,167 @@
+"""Loan amortization: EMI, monthly schedules and tax-deductible parts.
+
+A loan of ``principal`` at ``annual_rate`` (a fraction, 0.085 for 8.5%)
+repaid over ``months`` equal instalments has the EMI
+
+    EMI = P * r * (1 + r)^n / ((1 + r)^n - 1),    r = annual_rate / 12
+
+and after ``k`` instalments the balance is
+
+    B_k = P * (1 + r)^k - EMI * ((1 + r)^k - 1) / r
+
+Both are closed forms, so ``amortize`` fills a whole loans x months grid of
+balances at once with numpy, and ``by_financial_year`` needs the balance only
+at financial-year boundaries (April to March): the principal repaid in a year
+is the drop in balance and the interest is the rest of the instalments. That
+is what makes 30-year splits for 100k loans take well under a second.
+
+Each year's interest is deductible under section 24(b) (see
+``deductions.CAP_24B``) and the principal repaid counts towards 80C;
+``loan_inputs`` turns one loan into the EMI and the claims for the
+calculators. Single loans use plain Python; arrays (one entry per loan)
+use numpy.
+"""
+
+from collections import namedtuple
+
+from .deductions import CAP_24B
+
+FY_START_MONTH = 4  # financial years run April to March
+
+# Monthly grids have one row per loan; months after a loan is repaid are 0
+Schedule = namedtuple("Schedule", ["emi", "interest", "principal", "balance"])
+# Per financial year (one row per loan, one column per year of the longest loan)
+YearlySplit = namedtuple("YearlySplit", ["interest", "principal", "deductible_interest"])
+
+
+def _is_array(value) -> bool:
+    return not isinstance(value, (int, float))
+
+
+def emi(principal, annual_rate, months):
+    """Monthly instalment (scalars or arrays, one entry per loan)."""
+    if not any(_is_array(v) for v in (principal, annual_rate, months)):
+        r = annual_rate / 12
+        if months <= 0:
+            return 0.0
+        if r == 0:
+            return principal / months
+        growth = (1 + r) ** months
+        return principal * r * growth / (growth - 1)
+
+    import numpy as np
+    p = np.asarray(principal, dtype=float)
+    r = np.asarray(annual_rate, dtype=float) / 12
+    n = np.asarray(months, dtype=float)
+    growth = (1 + r) ** n
+    with np.errstate(divide='ignore', invalid='ignore'):
+        payment = np.where(r > 0, p * r * growth / (growth - 1), p / n)
+    return np.where(n > 0, payment, 0.0)
+
+
+def _balance_after(p, r, payment, n, paid):
+    """Balance after `paid` instalments (numpy arrays that broadcast)."""
+    import numpy as np
+    paid = np.minimum(paid, n)
+    growth = (1 + r) ** paid
+    with np.errstate(divide='ignore', invalid='ignore'):
+        annuity = np.where(r > 0, (growth - 1) / r, paid)
+    return np.where(paid >= n, 0.0, np.maximum(p * growth - payment * annuity, 0.0))
+
+
+def _loans(principal, annual_rate, months):
+    import numpy as np
+    p, rate, n = np.broadcast_arrays(np.asarray(principal, dtype=float), np.asarray(annual_rate, dtype=float),
+                                     np.asarray(months, dtype=int))
+    p, rate, n = np.atleast_1d(p, rate, n)
+    return p, rate / 12, n, emi(p, rate, n)
+
+
+def amortize(principal, annual_rate, months) -> Schedule:
+    """Full monthly schedules for many loans at once.
+
+    Args:
+        principal, annual_rate, months: per-loan values (scalars or arrays
+            that broadcast together)
+
+    Returns:
+        Schedule: ``emi`` per loan, and ``interest``, ``principal`` and
+            ``balance`` (after each instalment) as loans x months arrays,
+            one column per month of the longest loan
+
+    Each array holds 8 bytes per loan-month (about 290 MB for 100k 30-year
+    loans); use ``by_financial_year`` when only yearly totals are needed.
+    """
+    import numpy as np
+    p, r, n, payment = _loans(principal, annual_rate, months)
+    paid = np.arange(1, max(int(n.max(initial=0)), 0) + 1)
+    balance = _balance_after(p[:, None], r[:, None], payment[:, None], n[:, None], paid[None, :])
+    before = np.concatenate([p[:, None], balance[:, :-1]], axis=1)
+    due = paid[None, :] <= n[:, None]
+    interest = np.where(due, before * r[:, None], 0.0)
+    repaid = np.where(due, before - balance, 0.0)
+    return Schedule(payment, interest, repaid, balance)
+
+
+def by_financial_year(principal, annual_rate, months, start_month: int = FY_START_MONTH) -> YearlySplit:
+    """Interest and principal paid per financial year, for many loans at once.
+
+    Args:
+        principal, annual_rate, months: per-loan values (scalars or arrays)
+        start_month: calendar month (1-12) of the first instalment; may
+            also be an array
+
+    Returns:
+        YearlySplit: loans x years arrays; year 0 is the financial year of
+            the first instalment. ``deductible_interest`` is the interest
+            capped at the section 24(b) limit.
+    """
+    import numpy as np
+    p, r, n, payment = _loans(principal, annual_rate, months)
+    offset = np.broadcast_to((np.asarray(start_month) - FY_START_MONTH) % 12, p.shape)[:, None]
+    years = int(np.ceil((offset[:, 0] + n).max(initial=0) / 12))
+    edges = np.arange(years + 1)[None, :] * 12 - offset  # instalments paid before each year starts
+    paid = np.clip(edges, 0, n[:, None])
+    balance = _balance_after(p[:, None], r[:, None], payment[:, None], n[:, None], paid)
+    repaid = balance[:, :-1] - balance[:, 1:]
+    interest = np.maximum(payment[:, None] * np.diff(paid, axis=1) - repaid, 0.0)
+    return YearlySplit(interest, repaid, np.minimum(interest, CAP_24B))
+
+
+def loan_inputs(principal: float, annual_rate: float, months: int, start_month: int = FY_START_MONTH,
+                year: int = 0) -> dict:
+    """EMI and deduction claims of one loan for the calculators.
+
+    Args:
+        year: financial year to claim for, counted from the year of the
+            first instalment
+
+    Returns:
+        dict: {emi, interest, principal, claims} where claims is
+            ``{"24b": interest, "80C": principal}`` for
+            ``deductions.allowed_deductions`` (which applies the caps)
+    """
+    payment = emi(principal, annual_rate, months)
+    r = annual_rate / 12
+
+    def balance(paid):
+        paid = min(max(paid, 0), months)
+        if paid >= months:
+            return 0.0
+        if r == 0:
+            return principal - payment * paid
+        growth = (1 + r) ** paid
+        return max(principal * growth - payment * (growth - 1) / r, 0.0)
+
+    offset = (start_month - FY_START_MONTH) % 12
+    first, last = 12 * year - offset, 12 * (year + 1) - offset
+    count = min(max(last, 0), months) - min(max(first, 0), months)
+    repaid = balance(first) - balance(last)
+    interest = max(payment * count - repaid, 0.0)
+    return {
+        "emi": payment,
+        "interest": interest,
+        "principal": repaid,
+        "claims": {"24b": interest, "80C": repaid},
+    }
+
@@ -0,0 +1,174 @@
+"""Opt-in profiling of top-level operations for bug reports.
+
+When profiling is on, each wrapped operation runs under ``cProfile`` and
+``tracemalloc``. Afterwards two files are written to the diagnostics folder:
+
+- ``<operation>-<timestamp>.prof``: the raw profile, for ``pstats`` or
+  snakeviz
+- ``<operation>-<timestamp>-alloc.txt``: wall time, peak traced memory, the
+  top allocations made during the operation and the slowest functions by
+  cumulative time, readable without any tools
+
+Only the newest ``keep`` runs per operation are kept, so the folder stays
+small enough to zip and attach to a report. Profiling is off by default and
+is switched on with ``--profile``, ``TAXFLOW_PROFILE=1`` or ``"profile": true``
+in the config file.
+
+cProfile cannot run two profilers at once, so one operation is profiled at
+a time; an operation that starts while another is being profiled (nested,
+or on another thread) simply runs unprofiled.
+"""
+
+import cProfile
+import functools
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from typing import List, Optional, Sequence
+
+ENV_VAR = "TAXFLOW_PROFILE"
+CONFIG_KEY = "profile"
+FLAG = "--profile"
+DIAGNOSTICS_DIR = "diagnostics"
+
+_TRACE_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+)
+
+
+class Profiler:
+    """Profiles named operations into a rotating diagnostics folder.
+
+    Args:
+        directory: where ``.prof`` files and allocation reports go
+        keep: runs kept per operation; older ones are deleted
+        top: rows in the allocation and function listings
+        frames: traceback depth recorded by tracemalloc
+    """
+
+    def __init__(self, directory: str = DIAGNOSTICS_DIR, keep: int = 5, top: int = 25, frames: int = 5):
+        self.directory = directory
+        self.keep = keep
+        self.top = top
+        self.frames = frames
+        self.enabled = False
+        self.runs = 0
+        self.skipped = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def operation(self, name: str):
+        """Profile the enclosed block as operation `name` (no-op when disabled)."""
+        if not self.enabled or not self._lock.acquire(blocking=False):
+            if self.enabled:
+                self.skipped += 1
+            yield
+            return
+        try:
+            started_tracing = not tracemalloc.is_tracing()
+            if started_tracing:
+                tracemalloc.start(self.frames)
+            tracemalloc.reset_peak()
+            before = tracemalloc.take_snapshot().filter_traces(_TRACE_FILTERS)
+            profile = cProfile.Profile()
+            start = time.perf_counter()
+            profile.enable()
+            try:
+                yield
+            finally:
+                profile.disable()
+                elapsed = time.perf_counter() - start
+                after = tracemalloc.take_snapshot().filter_traces(_TRACE_FILTERS)
+                _, peak = tracemalloc.get_traced_memory()
+                if started_tracing:
+                    tracemalloc.stop()
+                self._write(name, profile, elapsed, peak, after.compare_to(before, "lineno"))
+        finally:
+            self._lock.release()
+
+    def profiled(self, name: str):
+        """Decorator profiling every call of the function as operation `name`."""
+        def decorate(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.operation(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def files(self, name: Optional[str] = None) -> List[str]:
+        """Diagnostics files (oldest first), optionally for one operation."""
+        try:
+            entries = sorted(os.listdir(self.directory))
+        except OSError:
+            return []
+        prefix = f"{name}-" if name else ""
+        return [os.path.join(self.directory, e) for e in entries
+                if e.startswith(prefix) and e.endswith((".prof", "-alloc.txt"))]
+
+    def _write(self, name, profile, elapsed, peak, allocations):
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")[:-3]
+        base = os.path.join(self.directory, f"{name}-{stamp}")
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            profile.dump_stats(base + ".prof")
+            with open(base + "-alloc.txt", "w", encoding="utf-8") as f:
+                f.write(self._report(name, profile, elapsed, peak, allocations))
+            self.runs += 1
+            self._rotate(name)
+        except OSError as e:
+            if sys.stderr is not None:
+                print(f"Could not write profile for {name}: {e}", file=sys.stderr)
+
+    def _report(self, name, profile, elapsed, peak, allocations) -> str:
+        lines = [f"TaxFlow profile: {name} ({datetime.now():%Y-%m-%d %H:%M:%S})",
+                 "=" * 78,
+                 f"Wall time:          {elapsed * 1000:.1f} ms",
+                 f"Peak traced memory: {peak / 1024:.1f} KiB",
+                 "",
+                 f"Top {self.top} allocations during the operation (by size):"]
+        for stat in allocations[:self.top]:
+            lines.append(f"  {stat}")
+        out = io.StringIO()
+        pstats.Stats(profile, stream=out).sort_stats("cumulative").print_stats(self.top)
+        lines += ["", f"Top {self.top} functions by cumulative time:", out.getvalue()]
+        return "\n".join(lines)
+
+    def _rotate(self, name: str):
+        runs = [f for f in self.files(name) if f.endswith(".prof")]
+        for old in runs[:-self.keep] if self.keep > 0 else runs:
+            for path in (old, old[:-len(".prof")] + "-alloc.txt"):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+
+profiler = Profiler()
+
+
+def configure(argv: Sequence[str] = ()) -> bool:
+    """Enable profiling from the command line, the environment or the config file."""
+    on = FLAG in argv or os.environ.get(ENV_VAR, "") not in ("", "0")
+    if not on:
+        from . import config
+        on = bool(config.get(CONFIG_KEY, False))
+    profiler.enabled = on
+    return on
+
+
+def profiled(name: str):
+    """Decorator profiling calls as operation `name` with the shared profiler."""
+    return profiler.profiled(name)
+
+
+def operation(name: str):
+    return profiler.operation(name)
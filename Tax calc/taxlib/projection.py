@@ -0,0 +1,93 @@
+"""Multi-year projections of tax and take-home.
+
+Starting from this year's income, deductions and EMI, ``project`` rolls
+each scenario forward year by year:
+
+- income grows by ``salary_growth`` a year
+- deductions grow by ``deduction_growth`` a year (negative to shrink)
+- the EMI stops after ``emi_years`` (loan payoff)
+- the taxpayer gets a year older, which moves Old Regime taxpayers into
+  the senior and super-senior bands
+
+Tax comes from the precomputed rate tables (``rates``), so a whole
+scenarios x years grid is evaluated in a few numpy passes. Take-home is
+``income - deductions - tax - emi`` as in ``calculate_pan_results``, and
+``real_take_home`` is the same amount in today's money, deflated by
+``inflation``.
+
+Every scenario parameter may be a scalar or an array with one entry per
+scenario; arrays broadcast together.
+"""
+
+from collections import namedtuple
+
+from .rates import by_age_band, rate_table
+
+DEFAULT_YEARS = 10
+DEFAULT_SALARY_GROWTH = 0.07
+DEFAULT_INFLATION = 0.05
+
+# Each field except `years` is a scenarios x years array (one row when
+# every parameter is a scalar, see ``project``)
+Projection = namedtuple("Projection", ["years", "income", "deductions", "emi", "tax", "take_home",
+                                       "real_take_home"])
+
+
+def project(income, deductions=0.0, emi=0.0, age=30, years: int = DEFAULT_YEARS,
+            salary_growth=DEFAULT_SALARY_GROWTH, inflation=DEFAULT_INFLATION, deduction_growth=0.0,
+            emi_years=None, entity_type: str = "Individual", regime: str = "new") -> Projection:
+    """Project tax and take-home for `years` years (year 0 is this year).
+
+    Args:
+        income, deductions, emi, age: this year's values per scenario
+        years: number of years to project
+        salary_growth: yearly income growth as a fraction
+        inflation: yearly inflation as a fraction, for ``real_take_home``
+        deduction_growth: yearly change of deductions as a fraction
+        emi_years: years the EMI is still paid (None: throughout)
+        entity_type: "Individual", "Company" or "Other"
+        regime: "new" or "old" (individuals)
+
+    Returns:
+        Projection: ``years`` (0 .. years-1) and scenarios x years arrays;
+            the scenario axis is dropped when all parameters are scalars
+
+    Raises:
+        ValueError: for an unknown regime
+    """
+    import numpy as np
+
+    params = (income, deductions, emi, age, salary_growth, inflation, deduction_growth,
+              np.inf if emi_years is None else emi_years)
+    scalar = all(np.ndim(p) == 0 for p in params)
+    income, deductions, emi, age, salary_growth, inflation, deduction_growth, emi_years = (
+        np.atleast_1d(np.asarray(p, dtype=float))[:, None] for p in np.broadcast_arrays(*params))
+    year = np.arange(years)
+    t = year[None, :]
+
+    gross = income * (1 + salary_growth) ** t
+    deducted = np.maximum(deductions * (1 + deduction_growth) ** t, 0.0)
+    paying = np.broadcast_to(emi * (t < emi_years), gross.shape)
+    taxable = np.maximum(gross - deducted, 0.0)
+    if entity_type == "Individual":
+        tax = by_age_band("taxes", taxable, regime, age + t)
+    else:
+        # Entity tables have no deductions; their effective rate at a gross
+        # income is the flat rate (cess included) applied to taxable income
+        tax = np.round(rate_table(entity_type, 0.0).effectives(gross) * taxable, 2)
+    take_home = gross - deducted - tax - paying
+    real = take_home / (1 + inflation) ** t
+
+    grids = (gross, deducted, paying, tax, take_home, real)
+    if scalar:
+        grids = tuple(g[0] for g in grids)
+    return Projection(year, *grids)
+
+
+def project_results(results: dict, years: int = DEFAULT_YEARS, **assumptions) -> Projection:
+    """Project a result dict from ``calculate_pan_results`` with the default
+    (or given) growth assumptions; see ``project`` for the keywords."""
+    steps = results["steps"]
+    return project(steps["gross"], steps["deductions"], results.get("emi", 0) or 0, results.get("age", 30),
+                   years, entity_type=results.get("entity", "Individual"),
+                   regime=results.get("regime", "new"), **assumptions)
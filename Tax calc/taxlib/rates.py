@@ -0,0 +1,319 @@
+"""Precomputed tax-rate tables.
+
+Within each slab tax grows linearly with income, so the tax for one entity,
+regime and amount of deductions is a piecewise-linear function of gross
+income. ``RateTable`` stores that function exactly as breakpoints plus a
+base and a slope per segment. Breakpoints are the slab edges (shifted by the
+deductions), the point where the 87A rebate stops covering the tax, the
+rebate cliff itself and the company-rate cliff. Effective and marginal rates
+are derived from the table, so the dashboard, the efficiency card and the
+vectorized curves all read the same data instead of recalculating.
+
+Because every segment is linear the table can also be inverted directly:
+``gross_for_take_home`` and ``gross_for_tax`` solve for the gross income
+that yields a target take-home or tax without any search loop.
+
+A single value is looked up with ``bisect`` in O(log n); arrays use
+``numpy.searchsorted`` (numpy is imported only for those).
+
+Segments include their right end: the rebate applies *up to and including*
+``REBATE_LIMIT`` and the 22% company rate up to and including
+``COMPANY_RATE_LIMIT``, matching the scalar calculators.
+"""
+
+import functools
+from bisect import bisect_left, bisect_right
+from typing import Callable, Dict, List, Tuple
+
+from .calculations import (CESS_RATE, COMPANY_RATE_LIMIT, SENIOR_AGE, SUPER_SENIOR_AGE, age_band,
+                           regime_rules)
+
+CURRENT_YEAR = "current"
+
+# (regime, year) -> schedule(age) returning {slabs, rebate_limit, rebate_max}
+SCHEDULES: Dict[Tuple[str, str], Callable[[int], dict]] = {
+    ("new", CURRENT_YEAR): functools.partial(regime_rules, "new"),
+    ("old", CURRENT_YEAR): functools.partial(regime_rules, "old"),
+}
+
+
+class RateTable:
+    """Tax (cess included) as a piecewise-linear function of gross income.
+
+    Segment ``i`` covers incomes in ``(breakpoints[i], breakpoints[i + 1]]``
+    where the tax is ``base[i] + slope[i] * (income - breakpoints[i])``.
+    """
+
+    def __init__(self, breakpoints: List[float], base: List[float], slope: List[float], name: str = "",
+                 deductions: float = 0.0):
+        self.breakpoints = breakpoints
+        self.base = base
+        self.slope = slope
+        self.name = name
+        self.deductions = deductions
+
+    def __repr__(self):
+        return f"RateTable({self.name!r}, {len(self.breakpoints)} segments)"
+
+    @property
+    def cliffs(self) -> List[float]:
+        """Incomes at which the tax jumps (e.g. where a rebate stops)."""
+        found = []
+        for i in range(1, len(self.breakpoints)):
+            x = self.breakpoints[i]
+            left = self.base[i - 1] + self.slope[i - 1] * (x - self.breakpoints[i - 1])
+            if abs(left - self.base[i]) > 0.005:
+                found.append(x)
+        return found
+
+    def slab_rates(self) -> List[float]:
+        """Distinct statutory rates (without cess), lowest first."""
+        return sorted({round(s / (1 + CESS_RATE), 4) for s in self.slope})
+
+    # ---- single values ----
+    def tax(self, income: float) -> float:
+        i = max(0, bisect_left(self.breakpoints, income) - 1)
+        return round(self.base[i] + self.slope[i] * (max(income, 0) - self.breakpoints[i]), 2)
+
+    def marginal(self, income: float) -> float:
+        """Tax on the next rupee of income, as a fraction."""
+        return self.slope[max(0, bisect_right(self.breakpoints, income) - 1)]
+
+    def effective(self, income: float) -> float:
+        """Tax as a fraction of gross income."""
+        return self.tax(income) / income if income > 0 else 0.0
+
+    def plateau_end(self, income: float) -> float:
+        """Highest income taxed the same as `income`.
+
+        Inside a stretch where the marginal rate is 0 (below the exemption
+        limit, or up to the rebate limit) this is the end of the stretch;
+        where tax is rising it is `income` itself.
+        """
+        i = max(0, bisect_left(self.breakpoints, income) - 1)
+        return income if self.slope[i] else self._plateau_ends()[i]
+
+    # ---- arrays ----
+    def taxes(self, incomes):
+        import numpy as np
+        x = np.asarray(incomes, dtype=float)
+        bp, base, slope = self._arrays()
+        i = np.maximum(np.searchsorted(bp, x, side='left') - 1, 0)
+        return np.round(base[i] + slope[i] * (np.maximum(x, 0) - bp[i]), 2)
+
+    def marginals(self, incomes):
+        import numpy as np
+        bp, _, slope = self._arrays()
+        i = np.maximum(np.searchsorted(bp, np.asarray(incomes, dtype=float), side='right') - 1, 0)
+        return slope[i]
+
+    def effectives(self, incomes):
+        import numpy as np
+        x = np.asarray(incomes, dtype=float)
+        tax = self.taxes(x)
+        return np.divide(tax, x, out=np.zeros_like(tax), where=x > 0)
+
+    def plateau_ends(self, incomes):
+        import numpy as np
+        x = np.asarray(incomes, dtype=float)
+        bp, _, slope = self._arrays()
+        i = np.maximum(np.searchsorted(bp, x, side='left') - 1, 0)
+        return np.where(slope[i] > 0, x, np.array(self._plateau_ends())[i])
+
+    # ---- inverse ----
+    def income_for_tax(self, targets):
+        """Smallest gross income whose tax reaches each target.
+
+        A target inside a cliff's jump cannot be hit exactly; the cliff
+        income (the last one taxed below the target) is returned for it.
+        """
+        import numpy as np
+        bp, base, slope = self._arrays()
+        t = np.asarray(targets, dtype=float)
+        ends = self._ends(base, slope)
+        # Tax never falls as income rises, so segment ends are sorted
+        i = np.minimum(np.searchsorted(ends, t, side='left'), len(bp) - 1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            inside = np.where(slope[i] > 0, (t - base[i]) / slope[i], 0.0)
+        return self._unwrap(bp[i] + np.maximum(inside, 0.0))
+
+    def income_for_take_home(self, targets, emi: float = 0.0):
+        """Smallest gross income whose take-home reaches each target.
+
+        Take-home is ``income - deductions - tax - emi`` as in
+        ``calculate_pan_results``. At a cliff take-home drops, so the same
+        take-home can recur at a higher income; the lowest one is returned.
+        """
+        import numpy as np
+        bp, base, slope = self._arrays()
+        t = np.asarray(targets, dtype=float)
+        offset = self.deductions + emi
+        start = bp - offset - base  # take-home just after each breakpoint
+        widths = self._widths()
+        with np.errstate(invalid='ignore'):
+            ends = start + widths * (1 - slope)
+        ends[-1] = np.inf
+        # First segment reaching the target: take-home only jumps down at
+        # cliffs, so the running maximum of the ends is sorted
+        reach = np.maximum.accumulate(ends)
+        i = np.minimum(np.searchsorted(reach, t, side='left'), len(bp) - 1)
+        return self._unwrap(bp[i] + np.maximum(t - start[i], 0.0) / (1 - slope[i]))
+
+    def _widths(self):
+        import numpy as np
+        bp = self._arrays()[0]
+        return np.append(np.diff(bp), np.inf)
+
+    def _ends(self, base, slope):
+        """Tax at the right end of each segment (inf for the last)."""
+        import numpy as np
+        with np.errstate(invalid='ignore'):
+            ends = base + slope * self._widths()
+        ends[-1] = np.inf
+        return ends
+
+    def _plateau_ends(self) -> List[float]:
+        """End of the zero-rate stretch each flat segment belongs to."""
+        ends = self.__dict__.get("_flat")
+        if ends is None:
+            n = len(self.breakpoints)
+            ends = [float("inf")] * n
+            for i in reversed(range(n - 1)):
+                # A flat segment continues into the next one unless tax rises or jumps there
+                joined = not self.slope[i + 1] and abs(self.base[i + 1] - self.base[i]) <= 0.005
+                ends[i] = ends[i + 1] if joined else self.breakpoints[i + 1]
+            self._flat = ends
+        return ends
+
+    @staticmethod
+    def _unwrap(values):
+        return float(values) if values.ndim == 0 else values
+
+    def _arrays(self):
+        arrays = self.__dict__.get("_np")
+        if arrays is None:
+            import numpy as np
+            arrays = self._np = (np.array(self.breakpoints), np.array(self.base), np.array(self.slope))
+        return arrays
+
+
+def _individual_segments(schedule: dict):
+    """(start, base, slope) segments of pre-cess tax over taxable income."""
+    slabs = schedule["slabs"]
+    limit, rebate = schedule["rebate_limit"], schedule["rebate_max"]
+
+    # Slab edges with the tax due at each, then the rebate points
+    edges, tax_at = [0.0], [0.0]
+    for size, rate in slabs[:-1]:
+        edges.append(edges[-1] + size)
+        tax_at.append(tax_at[-1] + size * rate)
+    rates = [rate for _, rate in slabs]
+
+    def before_rebate(x):
+        i = bisect_right(edges, x) - 1
+        return tax_at[i] + rates[i] * (x - edges[i])
+
+    points = set(edges)
+    if limit:
+        points.add(float(limit))
+        # Where the tax before rebate reaches the rebate amount, inside the limit
+        for i, (start, rate) in enumerate(zip(edges, rates)):
+            if rate and tax_at[i] < rebate:
+                x = start + (rebate - tax_at[i]) / rate
+                if x < limit and (i + 1 == len(edges) or x < edges[i + 1]):
+                    points.add(x)
+    points = sorted(points)
+
+    segments = []
+    for start, end in zip(points, points[1:] + [float('inf')]):
+        slope = rates[bisect_right(edges, start) - 1]
+        base = before_rebate(start)
+        if limit and end <= limit:
+            if base + slope * (end - start) <= rebate:
+                base, slope = 0.0, 0.0
+            else:
+                base -= rebate
+        segments.append((start, base, slope))
+    return segments
+
+
+def _corporate_segments(entity_type: str, deductions: float):
+    """(start, base, slope) segments of pre-cess tax over gross income."""
+    points = sorted({0.0, float(deductions)} | ({float(COMPANY_RATE_LIMIT)} if entity_type == "Company" else set()))
+    segments = []
+    for start, end in zip(points, points[1:] + [float('inf')]):
+        rate = 0.22 if entity_type == "Company" and end <= COMPANY_RATE_LIMIT else 0.30
+        taxable = max(0.0, start - deductions)
+        segments.append((start, taxable * rate, rate if start >= deductions else 0.0))
+    return segments
+
+
+def rate_table(entity_type: str = "Individual", deductions: float = 0.0, regime: str = "new",
+               year: str = CURRENT_YEAR, age: int = 0) -> RateTable:
+    """The (cached) rate table for an entity, its deductions, regime, year and age.
+
+    Only the age band matters (see ``calculations.age_band``), so all ages
+    in a band share one table.
+
+    Raises:
+        ValueError: for a regime/year without a schedule
+    """
+    band = age_band(age) if entity_type == "Individual" else 0
+    return _rate_table(entity_type, float(deductions), regime, year, band)
+
+
+@functools.lru_cache(maxsize=64)
+def _rate_table(entity_type: str, deductions: float, regime: str, year: str, band: int) -> RateTable:
+    if entity_type == "Individual":
+        schedule = SCHEDULES.get((regime, year))
+        if schedule is None:
+            raise ValueError(f"No tax schedule for regime {regime!r}, year {year!r}")
+        segments = [(0.0, 0.0, 0.0)] if deductions > 0 else []
+        segments += [(start + deductions, base, slope) for start, base, slope in _individual_segments(schedule(band))]
+        name = f"{regime} {year}" + (f", age {band}+" if band else "")
+    else:
+        segments = _corporate_segments(entity_type, deductions)
+        name = entity_type
+    breakpoints = [s for s, _, _ in segments]
+    base = [b * (1 + CESS_RATE) for _, b, _ in segments]
+    slope = [m * (1 + CESS_RATE) for _, _, m in segments]
+    return RateTable(breakpoints, base, slope, f"{name}, deductions {deductions:,.0f}", deductions)
+
+
+def by_age_band(method: str, incomes, regime: str = "new", ages=0, entity_type: str = "Individual",
+                deductions: float = 0.0):
+    """Apply the array method `method` of ``RateTable`` (e.g. ``"taxes"``) to
+    `incomes`, looking each one up in the table for its taxpayer's age band.
+
+    `ages` may be a scalar or an array matching `incomes`.
+    """
+    import numpy as np
+    x = np.asarray(incomes, dtype=float)
+    age = np.asarray(ages)
+    if age.ndim == 0:
+        return getattr(rate_table(entity_type, deductions, regime, age=int(age)), method)(x)
+    x, age = np.broadcast_arrays(x, age)
+    bands = np.where(age >= SUPER_SENIOR_AGE, SUPER_SENIOR_AGE, np.where(age >= SENIOR_AGE, SENIOR_AGE, 0))
+    out = np.empty(x.shape)
+    for band in np.unique(bands):
+        mask = bands == band
+        out[mask] = getattr(rate_table(entity_type, deductions, regime, age=int(band)), method)(x[mask])
+    return out
+
+
+def gross_for_take_home(targets, deductions: float = 0.0, emi: float = 0.0,
+                        entity_type: str = "Individual", regime: str = "new", age: int = 0):
+    """Gross income needed for a target take-home (scalar or array of targets).
+
+    See ``RateTable.income_for_take_home``.
+    """
+    return rate_table(entity_type, float(deductions), regime, age=age).income_for_take_home(targets, emi)
+
+
+def gross_for_tax(targets, deductions: float = 0.0, entity_type: str = "Individual", regime: str = "new",
+                  age: int = 0):
+    """Gross income at which the tax reaches a target (scalar or array of targets).
+
+    See ``RateTable.income_for_tax``.
+    """
+    return rate_table(entity_type, float(deductions), regime, age=age).income_for_tax(targets)
@@ -0,0 +1,72 @@
+"""Startup timing for the TaxFlow GUI.
+
+Records how long each import and startup phase takes so slow cold starts
+(especially of the frozen executable) can be diagnosed. Recording is always
+on and costs two ``perf_counter`` calls per entry; the report is only shown
+when requested with ``--startup-timing`` or ``TAXFLOW_STARTUP_TIMING=1``.
+"""
+
+import importlib
+import os
+import sys
+import time
+from contextlib import contextmanager
+from typing import List, Tuple
+
+ENV_VAR = "TAXFLOW_STARTUP_TIMING"
+REPORT_FILE = "startup_timing.txt"
+
+
+class StartupTimer:
+    """Collects (name, seconds) entries for imports and startup phases."""
+
+    def __init__(self):
+        self.t0 = time.perf_counter()
+        self.entries: List[Tuple[str, str, float]] = []  # (kind, name, seconds)
+        self.enabled = os.environ.get(ENV_VAR, "") not in ("", "0")
+
+    @contextmanager
+    def phase(self, name: str, kind: str = "phase"):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.entries.append((kind, name, time.perf_counter() - start))
+
+    def import_module(self, name: str):
+        """Import `name`, recording how long the import took."""
+        with self.phase(name, kind="import"):
+            return importlib.import_module(name)
+
+    def mark(self, name: str):
+        """Record the time elapsed since the timer was created."""
+        self.entries.append(("mark", name, time.perf_counter() - self.t0))
+
+    def report(self) -> str:
+        lines = ["TaxFlow startup timing", "=" * 50]
+        for kind, title in (("import", "Imports"), ("phase", "Phases"), ("mark", "Since start")):
+            rows = [(n, s) for k, n, s in self.entries if k == kind]
+            if not rows:
+                continue
+            lines.append(f"{title}:")
+            for name, seconds in rows:
+                lines.append(f"  {name:<40} {seconds * 1000:9.1f} ms")
+        return "\n".join(lines)
+
+    def emit(self):
+        """Print the report, or write it to ``REPORT_FILE`` when there is no
+        console (windowed builds have ``sys.stdout`` set to None)."""
+        if not self.enabled:
+            return
+        text = self.report()
+        if sys.stdout is not None:
+            print(text, flush=True)
+        else:
+            try:
+                with open(REPORT_FILE, "w", encoding="utf-8") as f:
+                    f.write(text + "\n")
+            except OSError:
+                pass
+
+
+timer = StartupTimer()
@@ -0,0 +1,450 @@
+"""Performance benchmarks for taxlib and the dashboard rendering paths.
+
+Every case runs its operation on deterministic synthetic inputs (seeded
+``random.Random``), repeats the measurement several times and reports the
+best time per operation. Results are compared against ``baseline.json``; a
+case fails when it is more than ``--tolerance`` slower than its baseline.
+A fixed calibration workload is timed alongside every case and baselines
+are scaled by how much slower or faster it ran, so the comparison is
+relative to the speed of the machine at that moment.
+
+Usage (from the repository root)::
+
+    python benchmarks/bench.py                    # run and compare
+    python benchmarks/bench.py --tolerance 0.5    # allow 50% slowdowns
+    python benchmarks/bench.py -k export          # only cases matching "export"
+    python benchmarks/bench.py --update-baseline  # record new baseline
+
+Cases whose optional dependency (matplotlib, reportlab, openpyxl) is missing
+are skipped. Calibration does not make timings portable between Python
+versions or CPU types; refresh the baseline there (see BUILD.md).
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "Tax calc"))
+
+from taxlib import calculate_individual_tax, calculate_pan_results, get_pan_entity_type, validate_pan
+from taxlib import db
+
+BASELINE_FILE = Path(__file__).resolve().parent / "baseline.json"
+TOLERANCE_ENV = "TAXFLOW_BENCH_TOLERANCE"
+DEFAULT_TOLERANCE = 0.5
+MIN_DELTA_MS = 0.01  # slowdowns smaller than this are timer noise
+SEED = 20240401
+
+ENTITY_CODES = "PPPPPPCCFH"  # mostly individuals, some companies and others
+EMPLOYMENT_TYPES = ("Salaried", "Self Employed")
+
+
+def synthetic_pans(n: int, seed: int = SEED) -> List[str]:
+    rng = random.Random(seed)
+    letters = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    return ["".join(rng.choice(letters) for _ in range(3)) + rng.choice(ENTITY_CODES) + rng.choice(letters)
+            + f"{rng.randrange(10_000):04d}" + rng.choice(letters) for _ in range(n)]
+
+
+def synthetic_records(n: int, seed: int = SEED) -> List[tuple]:
+    """(pan, income, deductions, emi, age, employment type) tuples."""
+    rng = random.Random(seed)
+    return [(pan, float(rng.randrange(100_000, 8_000_000, 1_000)), float(rng.choice((0, 50_000, 75_000, 150_000))),
+             float(rng.randrange(0, 60_000, 500)), rng.randrange(21, 80), rng.choice(EMPLOYMENT_TYPES))
+            for pan in synthetic_pans(n, seed)]
+
+
+class Case:
+    """A named benchmark.
+
+    `setup(tmpdir)` prepares inputs and returns the operation to time;
+    the operation is called `number` times per measurement.
+    """
+
+    def __init__(self, name: str, setup: Callable[[str], Callable[[], object]], number: int = 1,
+                 requires: tuple = ()):
+        self.name = name
+        self.setup = setup
+        self.number = number
+        self.requires = requires
+
+    def missing(self) -> Optional[str]:
+        for module in self.requires:
+            try:
+                __import__(module)
+            except ImportError:
+                return module
+        return None
+
+
+CASES: List[Case] = []
+
+
+def case(name: str, number: int = 1, requires: tuple = ()):
+    def register(setup):
+        CASES.append(Case(name, setup, number, requires))
+        return setup
+    return register
+
+
+# ---- calibration ----
+
+def _calibration(tmpdir):
+    """Fixed pure-Python work that taxlib changes cannot affect."""
+    words = synthetic_pans(2_000)
+    return lambda: sorted(w[::-1] for w in words if sum(map(ord, w)) % 7)
+
+
+# Timed after every run of every case; cases are compared relative to it, so
+# a machine that is faster or slower than when the baseline was recorded
+# (another computer, CPU throttling, a busy CI host) is not a regression.
+CALIBRATION = Case("calibration", _calibration, number=20)
+
+
+# ---- calculations and PAN validation ----
+
+@case("calc.individual_scalar", number=5000)
+def _calc_scalar(tmpdir):
+    return lambda: calculate_individual_tax(1_850_000, 75_000, 35)
+
+
+@case("calc.pan_results_bulk", number=5)
+def _calc_bulk(tmpdir):
+    records = synthetic_records(10_000)
+    return lambda: [calculate_pan_results(*r) for r in records]
+
+
+@case("pan.validate_bulk", number=5)
+def _pan_bulk(tmpdir):
+    pans = synthetic_pans(10_000)
+    return lambda: [validate_pan(p) and get_pan_entity_type(p) for p in pans]
+
+
+@case("calc.inverse_take_home_bulk", number=20)
+def _inverse_bulk(tmpdir):
+    from taxlib.rates import gross_for_take_home
+    targets = [income * 0.8 for _, income, *_ in synthetic_records(10_000)]
+    return lambda: gross_for_take_home(targets, 75_000, 10_000)
+
+
+@case("calc.compare_regimes_bulk", number=20)
+def _compare_bulk(tmpdir):
+    from taxlib import compare_regimes
+    records = synthetic_records(10_000)
+    incomes = [r[1] for r in records]
+    deductions = [r[2] * 2 for r in records]
+    ages = [r[4] for r in records]
+    return lambda: compare_regimes(incomes, deductions, ages, new_deductions=75_000)
+
+
+@case("calc.deductions_bulk", number=20)
+def _deductions_bulk(tmpdir):
+    from taxlib.deductions import allowed_deductions
+    rng = random.Random(SEED)
+    n = 10_000
+    claims = {section: [rng.randrange(0, 2 * cap, 1_000) for _ in range(n)]
+              for section, cap in (("80C", 150_000), ("80CCD(1B)", 50_000), ("80D", 25_000), ("24b", 200_000))}
+    ages = [r[4] for r in synthetic_records(n)]
+    return lambda: allowed_deductions(claims, age=ages)
+
+
+@case("calc.optimize_investments_bulk", number=20)
+def _optimize_investments_bulk(tmpdir):
+    from taxlib.deductions import optimize_investments
+    records = synthetic_records(10_000)
+    incomes = [r[1] for r in records]
+    budgets = [r[1] // 10 for r in records]
+    claims = {"80C": [min(r[2], 150_000) for r in records]}
+    ages = [r[4] for r in records]
+    return lambda: optimize_investments(incomes, budgets, claims, age=ages)
+
+
+@case("calc.projection_scenarios", number=20)
+def _projection_scenarios(tmpdir):
+    from taxlib.projection import project
+    rng = random.Random(SEED)
+    records = synthetic_records(500)
+    incomes = [r[1] for r in records]
+    deductions = [r[2] for r in records]
+    ages = [r[4] for r in records]
+    growth = [rng.uniform(0.0, 0.15) for _ in records]
+    return lambda: project(incomes, deductions, 10_000, ages, years=10, salary_growth=growth, regime="old")
+
+
+@case("calc.simulate_income", number=3)
+def _simulate_income(tmpdir):
+    from taxlib.simulation import simulate
+    return lambda: simulate("lognormal", {"median": 1_200_000, "sigma": 0.3}, 1_000_000, 75_000, seed=SEED)
+
+
+@case("calc.tax_grid_500", number=10)
+def _tax_grid_500(tmpdir):
+    from taxlib.calculations import tax_grid
+    # Uncached: each run evaluates a fresh 500 x 500 grid
+    return lambda: tax_grid.__wrapped__(0, 5_000_000, 500, 0, 500_000, 500, "Individual", "new", 30, 10_000.0)
+
+
+def _synthetic_loans(n):
+    rng = random.Random(SEED)
+    return ([rng.randrange(100_000, 10_000_000, 10_000) for _ in range(n)],
+            [rng.uniform(0.06, 0.12) for _ in range(n)],
+            [rng.choice((60, 120, 180, 240, 300, 360)) for _ in range(n)])
+
+
+@case("loans.financial_years_bulk", number=3)
+def _loans_financial_years(tmpdir):
+    from taxlib.loans import by_financial_year
+    principal, rate, months = _synthetic_loans(100_000)
+    return lambda: by_financial_year(principal, rate, months)
+
+
+@case("loans.amortize_bulk", number=3)
+def _loans_amortize(tmpdir):
+    from taxlib.loans import amortize
+    principal, rate, months = _synthetic_loans(10_000)
+    return lambda: amortize(principal, rate, months)
+
+
+# ---- database ----
+
+def _use_db(tmpdir, name):
+    db.DB_FILE = os.path.join(tmpdir, name)
+
+
+@case("db.upsert_single", number=50)
+def _db_single(tmpdir):
+    _use_db(tmpdir, "single.db")
+    pan, income, deductions, emi, age, _ = synthetic_records(1)[0]
+    return lambda: db.save_pan_data_db(pan, income, deductions, emi, age)
+
+
+@case("db.upsert_bulk", number=2)
+def _db_bulk(tmpdir):
+    _use_db(tmpdir, "bulk.db")
+    records = synthetic_records(500)
+    return lambda: [db.save_pan_data_db(*r[:5]) for r in records]
+
+
+# ---- exports ----
+
+def _sample_results():
+    return calculate_pan_results("ABCPD1234F", 1_850_000, 75_000, 15_000, 35)
+
+
+def _dashboard_figures(results, dpi=80):
+    """The dashboard tabs as offscreen figures with their chart tracks."""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    from taxlib import charts
+
+    figs = []
+    steps, emi = results["steps"], results["emi"]
+    builders = (
+        ((231, 232, 233, 212), lambda axes: charts.income_tracks(axes, steps, emi)),
+        ((221, 222, 223, 224), lambda axes: charts.tax_tracks(axes, steps, results["entity"],
+                                                                    results["age"], results["regime"])),
+        ((221, 222, 223, 224), lambda axes: charts.insights_tracks(axes, steps, emi)),
+        ((121, 122), lambda axes: charts.whatif_tracks(axes, steps, emi, results["entity"], results["age"])),
+    )
+    for grid, build in builders:
+        fig = Figure(figsize=(16, 10), dpi=dpi)
+        fig.patch.set_facecolor('#f8f9fa')
+        FigureCanvasAgg(fig)
+        fig.tracks = build([fig.add_subplot(g) for g in grid])
+        figs.append(fig)
+    return figs
+
+
+def _final_frame(fig):
+    from taxlib import charts
+    anim = charts.BlitAnimation(fig.canvas, fig.tracks)
+    anim.setup()
+    anim.stop(redraw=False)
+
+
+def _export_case(exporter_name, figures=False, **extra):
+    def setup(tmpdir):
+        from taxlib import export
+        exporter = getattr(export, exporter_name)
+        results = _sample_results()
+        figs = None
+        if figures:
+            figs = _dashboard_figures(results)
+            for fig in figs:
+                _final_frame(fig)
+        path = os.path.join(tmpdir, "report" + (".pdf" if exporter_name.endswith("pdf") else ".xlsx"))
+        # No cache key: every run rasterizes the figures, as the first export does
+        return lambda: exporter(results, path, figs=figs, **extra)
+    return setup
+
+
+for _name, _exporter, _figures, _extra, _requires in (
+    ("export.pdf", "export_report_pdf", False, {}, ("reportlab",)),
+    ("export.pdf_vector_charts", "export_report_pdf", False, {"vector_charts": True}, ("reportlab",)),
+    ("export.pdf_figures", "export_report_pdf", True, {}, ("reportlab", "matplotlib")),
+    ("export.pdf_projection", "export_report_pdf", False, {"projection": True}, ("reportlab", "numpy")),
+    ("export.excel", "export_report_excel", False, {}, ("reportlab", "openpyxl")),
+    ("export.excel_figures", "export_report_excel", True, {}, ("reportlab", "openpyxl", "matplotlib")),
+):
+    case(_name, number=1, requires=_requires)(_export_case(_exporter, _figures, **_extra))
+
+
+# ---- dashboard rendering (Agg) ----
+
+def _render_tab_case(index):
+    def setup(tmpdir):
+        fig = _dashboard_figures(_sample_results())[index]
+
+        def render():
+            _final_frame(fig)
+            fig.canvas.draw()
+        return render
+    return setup
+
+
+for _index, _tab in enumerate(("income", "tax", "insights", "whatif")):
+    case(f"dashboard.render_{_tab}", number=1, requires=("matplotlib",))(_render_tab_case(_index))
+
+
+# ---- runner ----
+
+def _time_ms(op: Callable[[], object], number: int) -> float:
+    start = time.perf_counter()
+    for _ in range(number):
+        op()
+    return (time.perf_counter() - start) / number * 1000
+
+
+def measure(c: Case, repeat: int, calibration: Optional[Case] = CALIBRATION) -> Dict[str, float]:
+    """Best and median milliseconds per operation over `repeat` runs.
+
+    The `calibration` case is timed after each run as well and its
+    best time is reported as ``calibration_ms``.
+    """
+    tmpdir = tempfile.mkdtemp(prefix="taxflow-bench-")
+    saved_db = db.DB_FILE
+    try:
+        op = c.setup(tmpdir)
+        op()  # warm up: imports, caches, first-touch allocations
+        reference = calibration.setup(tmpdir) if calibration else None
+        times, reference_times = [], []
+        for _ in range(repeat):
+            times.append(_time_ms(op, c.number))
+            if reference:
+                reference_times.append(_time_ms(reference, calibration.number))
+    finally:
+        db.DB_FILE = saved_db
+        shutil.rmtree(tmpdir, ignore_errors=True)
+    result = {"ms": min(times), "median_ms": statistics.median(times)}
+    if reference_times:
+        result["calibration_ms"] = min(reference_times)
+    return result
+
+
+def speed_ratio(result: dict, base: dict) -> float:
+    """How much slower the calibration case ran for `result` than for its
+    baseline entry `base` (1.0 if either was measured without it)."""
+    if "calibration_ms" in result and "calibration_ms" in base:
+        return result["calibration_ms"] / base["calibration_ms"]
+    return 1.0
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], tolerance: float,
+            min_delta_ms: float = MIN_DELTA_MS) -> List[str]:
+    """Names of cases more than `tolerance` (a fraction) slower than baseline.
+
+    Baseline times are first scaled by each case's `speed_ratio`, so cases
+    are judged relative to the calibration case timed alongside them.
+    """
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        expected = base["ms"] * speed_ratio(result, base)
+        limit = expected * (1 + base.get("tolerance", tolerance))
+        if result["ms"] > limit and result["ms"] - expected > min_delta_ms:
+            regressions.append(name)
+    return regressions
+
+
+def load_baseline(path: Path = BASELINE_FILE) -> dict:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_baseline(results: Dict[str, dict], path: Path = BASELINE_FILE, previous: Optional[dict] = None):
+    """Write `results`, keeping per-case ``tolerance`` overrides from `previous`."""
+    previous = previous or {}
+    entries = {}
+    for name, r in sorted(results.items()):
+        entries[name] = {"ms": round(r["ms"], 4)}
+        if "calibration_ms" in r:
+            entries[name]["calibration_ms"] = round(r["calibration_ms"], 4)
+        if "tolerance" in previous.get(name, {}):
+            entries[name]["tolerance"] = previous[name]["tolerance"]
+    data = {
+        "machine": {"python": platform.python_version(), "platform": platform.platform(),
+                    "processor": platform.machine()},
+        "results": entries,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+        f.write("\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run TaxFlow performance benchmarks.")
+    parser.add_argument("-k", dest="pattern", default="", help="only run cases whose name contains this")
+    parser.add_argument("--repeat", type=int, default=5, help="measurements per case (best is kept)")
+    parser.add_argument("--tolerance", type=float,
+                        default=float(os.environ.get(TOLERANCE_ENV, DEFAULT_TOLERANCE)),
+                        help="allowed slowdown as a fraction of the baseline (default 0.5)")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE, help="baseline JSON file")
+    parser.add_argument("--update-baseline", action="store_true", help="store these results as the baseline")
+    args = parser.parse_args(argv)
+
+    stored = load_baseline(args.baseline)
+    baseline = stored.get("results", {})
+    results = {}
+    print(f"{'case':<32}{'ms/op':>12}{'median':>12}{'baseline':>12}{'change':>10}")
+    for c in CASES:
+        if args.pattern not in c.name:
+            continue
+        missing = c.missing()
+        if missing:
+            print(f"{c.name:<32}{'skipped (no ' + missing + ')':>46}")
+            continue
+        r = results[c.name] = measure(c, args.repeat)
+        base = baseline.get(c.name)
+        change = f"{(r['ms'] / (base['ms'] * speed_ratio(r, base)) - 1) * 100:+.0f}%" if base else "new"
+        base_ms = f"{base['ms']:.3f}" if base else "-"
+        print(f"{c.name:<32}{r['ms']:>12.3f}{r['median_ms']:>12.3f}{base_ms:>12}{change:>10}")
+
+    if args.update_baseline:
+        merged = {**baseline, **results} if args.pattern else results
+        save_baseline(merged, args.baseline, previous=baseline)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.tolerance:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
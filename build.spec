@@ -8,6 +8,8 @@ Output: dist/tax_calculator.exe
 import os
 import sys
 
+from PyInstaller.utils.hooks import collect_submodules
+
 # Determine paths
 if getattr(sys, 'frozen', False):
     # Running as compiled
@@ -17,6 +19,8 @@ else:
     script_dir = os.getcwd()
 
 tax_calc_dir = os.path.join(script_dir, "Tax calc")
+# collect_submodules('taxlib') below imports from here
+sys.path.insert(0, tax_calc_dir)
 
 block_cipher = None
 
@@ -25,10 +29,18 @@ a = Analysis(
     pathex=[tax_calc_dir],
     binaries=[],
     datas=[],
+    # The dashboard and exporters are imported by name on first use
+    # (tax_calculator._load_charting / _load_export), so PyInstaller cannot
+    # see them; list them and the libraries they pull in explicitly.
     hiddenimports=[
         'ttkbootstrap',
         'matplotlib',
+        'matplotlib.figure',
+        'matplotlib.backends.backend_tkagg',
         'taxlib',
+        *collect_submodules('taxlib'),
+        *collect_submodules('reportlab'),
+        *collect_submodules('openpyxl'),
     ],
     hookspath=[],
     hooksconfig={},
@@ -0,0 +1,88 @@
+"""
+Unit tests for the benchmark runner.
+
+Tests for:
+- Deterministic synthetic inputs
+- Regression detection against a baseline and its tolerance
+- Scaling baselines by the calibration case timed in the same run
+- Measuring a case
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Add the benchmarks directory to path to import the runner
+sys.path.insert(0, str(Path(__file__).parent.parent / "benchmarks"))
+
+import bench
+from taxlib import validate_pan
+
+
+class TestSyntheticInputs:
+    """Test that inputs are reproducible."""
+
+    def test_same_seed_same_records(self):
+        assert bench.synthetic_records(50) == bench.synthetic_records(50)
+        assert bench.synthetic_records(50, seed=1) != bench.synthetic_records(50)
+
+    def test_pans_are_valid_and_mixed(self):
+        pans = bench.synthetic_pans(200)
+        assert all(validate_pan(p) for p in pans)
+        assert {p[3] for p in pans} == set(bench.ENTITY_CODES)
+
+
+class TestCompare:
+    """Test regression detection."""
+
+    BASELINE = {"calc": {"ms": 10.0}, "export": {"ms": 100.0, "tolerance": 1.0}}
+
+    def test_within_tolerance_passes(self):
+        assert bench.compare({"calc": {"ms": 12.0}}, self.BASELINE, tolerance=0.25) == []
+
+    def test_slowdown_beyond_tolerance_fails(self):
+        assert bench.compare({"calc": {"ms": 13.0}}, self.BASELINE, tolerance=0.25) == ["calc"]
+
+    def test_per_case_tolerance_overrides(self):
+        assert bench.compare({"export": {"ms": 190.0}}, self.BASELINE, tolerance=0.25) == []
+
+    def test_new_case_and_noise_are_ignored(self):
+        assert bench.compare({"new": {"ms": 1.0}}, self.BASELINE, tolerance=0.25) == []
+        tiny = {"fast": {"ms": 0.001}}
+        assert bench.compare({"fast": {"ms": 0.003}}, tiny, tolerance=0.25) == []
+
+    def test_slower_machine_is_not_a_regression(self):
+        baseline = {"calc": {"ms": 10.0, "calibration_ms": 2.0}}
+        slow = {"calc": {"ms": 19.0, "calibration_ms": 4.0}}
+        assert bench.compare(slow, baseline, tolerance=0.25) == []
+        assert bench.speed_ratio(slow["calc"], baseline["calc"]) == pytest.approx(2.0)
+
+    def test_regression_relative_to_calibration_fails(self):
+        baseline = {"calc": {"ms": 10.0, "calibration_ms": 2.0}}
+        assert bench.compare({"calc": {"ms": 13.0, "calibration_ms": 2.0}}, baseline, tolerance=0.25) == ["calc"]
+        assert bench.compare({"calc": {"ms": 13.0, "calibration_ms": 1.0}}, baseline, tolerance=0.25) == ["calc"]
+
+    def test_without_calibration_times_are_compared_directly(self):
+        assert bench.speed_ratio({"ms": 1.0, "calibration_ms": 3.0}, {"ms": 1.0}) == 1.0
+
+
+class TestMeasure:
+    """Test running a case."""
+
+    def test_measure_reports_per_operation_time(self):
+        c = bench.Case("noop", lambda tmpdir: (lambda: None), number=10)
+        result = bench.measure(c, repeat=3)
+        assert 0 <= result["ms"] <= result["median_ms"]
+        assert result["calibration_ms"] > 0
+        assert "calibration_ms" not in bench.measure(c, repeat=3, calibration=None)
+
+    def test_baseline_round_trip_keeps_tolerance(self, tmp_path):
+        path = tmp_path / "baseline.json"
+        bench.save_baseline({"export": {"ms": 123.45678, "calibration_ms": 1.23456}}, path,
+                            previous=TestCompare.BASELINE)
+        saved = bench.load_baseline(path)["results"]
+        assert saved == {"export": {"ms": 123.4568, "calibration_ms": 1.2346, "tolerance": 1.0}}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,168 @@
+"""
+Unit tests for bulk statement generation.
+
+Tests for:
+- Generating statements in-process and in a process pool
+- Resuming an interrupted run
+- Reading batch records from the database and CSV files
+- Skipping and reporting malformed batch rows
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Add parent directory to path to import taxlib
+sys.path.insert(0, str(Path(__file__).parent.parent / "Tax calc"))
+
+pytest.importorskip("reportlab")
+pytest.importorskip("openpyxl")
+
+from unittest.mock import patch
+
+from taxlib import calculate_pan_results
+from taxlib import bulk, db
+
+
+def _records(n):
+    for i in range(n):
+        yield calculate_pan_results(f"ABCPD{i:04d}F", 600_000 + i * 100_000, 75_000, 5_000, 30)
+
+
+class TestGenerateStatements:
+    """Test bulk PDF generation."""
+
+    def test_in_process_writes_one_pdf_per_record(self, tmp_path):
+        summary = bulk.generate_statements(_records(3), str(tmp_path), workers=0)
+        assert summary["written"] == 3
+        assert summary["failed"] == 0
+        pdfs = sorted(p.name for p in tmp_path.glob("*.pdf"))
+        assert pdfs == ["ABCPD0000F.pdf", "ABCPD0001F.pdf", "ABCPD0002F.pdf"]
+        assert not list(tmp_path.glob("*" + bulk.PART_SUFFIX))
+
+    def test_process_pool_with_bounded_queue(self, tmp_path):
+        progress = []
+        summary = bulk.generate_statements(_records(6), str(tmp_path), workers=2, max_pending=2,
+                                           progress=lambda *counts: progress.append(counts))
+        assert summary["written"] == 6
+        assert len(list(tmp_path.glob("*.pdf"))) == 6
+        assert len(progress) == 6
+        assert progress[-1] == (6, 0, 0)
+
+    def test_resume_skips_existing_statements(self, tmp_path):
+        bulk.generate_statements(_records(2), str(tmp_path), workers=0)
+        summary = bulk.generate_statements(_records(4), str(tmp_path), workers=0)
+        assert summary["skipped"] == 2
+        assert summary["written"] == 2
+
+    def test_overwrite_rebuilds_existing_statements(self, tmp_path):
+        bulk.generate_statements(_records(2), str(tmp_path), workers=0)
+        summary = bulk.generate_statements(_records(2), str(tmp_path), workers=0, overwrite=True)
+        assert summary["written"] == 2
+        assert summary["skipped"] == 0
+
+    def test_failures_are_reported_not_raised(self, tmp_path):
+        with patch.object(bulk, "export_report_pdf", side_effect=RuntimeError("boom")):
+            summary = bulk.generate_statements(_records(1), str(tmp_path), workers=0)
+        assert summary["failed"] == 1
+        assert summary["errors"] == [("ABCPD0000F", "boom")]
+        assert not list(tmp_path.iterdir())
+
+
+class TestRecordSources:
+    """Test batch record readers."""
+
+    def test_records_from_db(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(db, "DB_FILE", str(tmp_path / "t.db"))
+        db.save_pan_data_db("ABCPD1234F", 1_000_000, 75_000, 10_000, 30)
+        db.save_pan_data_db("ABCCD1234F", 2_000_000, 0, 0, 0)
+        records = list(bulk.records_from_db())
+        assert [r["pan"] for r in records] == ["ABCCD1234F", "ABCPD1234F"]
+        assert records[0]["entity"] == "Company"
+        assert records[1]["total_tax"] == calculate_pan_results("ABCPD1234F", 1_000_000, 75_000, 10_000, 30)["total_tax"]
+
+    def test_records_from_db_path_leaves_default_db_alone(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(db, "DB_FILE", str(tmp_path / "default.db"))
+        db.save_pan_data_db("ABCPD1234F", 1_000_000, 75_000, 10_000, 30)
+        with patch.object(db, "DB_FILE", str(tmp_path / "batch.db")):
+            db.save_pan_data_db("ABCPD9999F", 2_000_000, 0, 0, 40)
+        records = list(bulk.records_from_db(str(tmp_path / "batch.db")))
+        assert [r["pan"] for r in records] == ["ABCPD9999F"]
+        assert db.DB_FILE == str(tmp_path / "default.db")
+        assert db.get_pan_data_db("ABCPD1234F")["income"] == 1_000_000
+
+    def test_records_from_csv(self, tmp_path):
+        path = tmp_path / "batch.csv"
+        path.write_text("pan,income,deductions,emi,age,employment_type\n"
+                        "abcpd1234f,900000,0,0,40,Self Employed\n", encoding="utf-8")
+        (record,) = bulk.records_from_csv(str(path))
+        assert record["pan"] == "ABCPD1234F"
+        assert record["employment_type"] == "Self Employed"
+        assert record["steps"]["taxable"] == 900_000
+
+    def test_records_from_csv_with_section_claims(self, tmp_path):
+        path = tmp_path / "declarations.csv"
+        path.write_text("pan,income,emi,age,regime,80C,80CCD(1B),80D\n"
+                        "ABCPD1234F,1500000,0,40,old,200000,60000,10000\n"
+                        "ABCPD1234G,1500000,0,40,new,200000,60000,10000\n", encoding="utf-8")
+        old, new = bulk.records_from_csv(str(path))
+        # Standard 50K + 80C capped at 1.5L + 1B 50K + 80D 10K
+        assert old["steps"]["deductions"] == 260_000
+        assert old["total_tax"] == calculate_pan_results("ABCPD1234F", 1_500_000, 260_000, 0, 40,
+                                                         regime="old")["total_tax"]
+        # The New Regime only allows the standard deduction
+        assert new["steps"]["deductions"] == 75_000
+
+    def test_records_from_csv_with_home_loan(self, tmp_path):
+        from taxlib.loans import loan_inputs
+        path = tmp_path / "loans.csv"
+        path.write_text("pan,income,emi,age,regime,80C,loan_amount,loan_rate,loan_months\n"
+                        "ABCPD1234F,2000000,,35,old,60000,5000000,0.085,240\n", encoding="utf-8")
+        (record,) = bulk.records_from_csv(str(path))
+        loan = loan_inputs(5_000_000, 0.085, 240)
+        assert record["emi"] == pytest.approx(loan["emi"])
+        # Interest above the 2L 24(b) cap; principal tops 80C up to 1.5L
+        assert record["steps"]["deductions"] == 50_000 + 150_000 + 200_000
+
+
+class TestMalformedRows:
+    """Test that bad batch rows are reported without aborting the run."""
+
+    def _csv(self, tmp_path):
+        path = tmp_path / "batch.csv"
+        path.write_text("pan,income,deductions,emi,age\n"
+                        "ABCPD0001F,900000,0,0,40\n"
+                        "ABCPD0002F,900000,0,0,forty\n"
+                        ",900000,0,0,40\n"
+                        "ABCPD0004F,1200000,0,0,35\n", encoding="utf-8")
+        return str(path)
+
+    def test_csv_bad_rows_are_collected_and_skipped(self, tmp_path):
+        errors = []
+        records = list(bulk.records_from_csv(self._csv(tmp_path), errors))
+        assert [r["pan"] for r in records] == ["ABCPD0001F", "ABCPD0004F"]
+        assert [pan for pan, _ in errors] == ["ABCPD0002F", None]
+        assert errors[0][1].startswith("line 3: ")
+        assert errors[1][1].startswith("line 4: ")
+
+    def test_db_bad_rows_are_collected_and_skipped(self, tmp_path):
+        path = str(tmp_path / "t.db")
+        with patch.object(db, "DB_FILE", path):
+            db.save_pan_data_db("ABCPD1234F", None, 0, 0, 30)
+            db.save_pan_data_db("ABCPD5678F", 1_000_000, 0, 0, 30)
+        errors = []
+        records = list(bulk.records_from_db(path, errors=errors))
+        assert [r["pan"] for r in records] == ["ABCPD5678F"]
+        assert [pan for pan, _ in errors] == ["ABCPD1234F"]
+
+    def test_main_reports_bad_rows_as_failed(self, tmp_path, capsys):
+        out = tmp_path / "out"
+        assert bulk.main([str(out), "--csv", self._csv(tmp_path), "--workers", "0", "--no-charts"]) == 1
+        assert sorted(p.name for p in out.glob("*.pdf")) == ["ABCPD0001F.pdf", "ABCPD0004F.pdf"]
+        captured = capsys.readouterr()
+        assert "2 written, 0 skipped, 2 failed" in captured.out
+        assert "ABCPD0002F: line 3" in captured.err
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -6,6 +6,10 @@ Tests for:
 - Rebate under Section 87A
 - Health and Education Cess (4%)
 - Corporate tax calculations
+- Vectorized tax curves (tax, effective and marginal rate)
+- Income x deductions what-if grids
+- Old Tax Regime with age-based exemption limits
+- Old vs New Regime comparison
 """
 
 import pytest
@@ -15,7 +19,9 @@ from pathlib import Path
 # Add parent directory to path to import taxlib
 sys.path.insert(0, str(Path(__file__).parent.parent / "Tax calc"))
 
-from taxlib import calculate_individual_tax, calculate_corporate_tax
+from taxlib import calculate_individual_tax, calculate_corporate_tax, calculate_pan_results
+from taxlib import compare_regimes
+from taxlib.calculations import tax_curve, tax_for_incomes, tax_grid
 
 
 class TestIndividualTaxCalculations:
@@ -183,6 +189,24 @@ class TestCorporateTaxCalculations:
         assert tax == 0.0
 
 
+class TestPanResults:
+    """Test the combined PAN result record."""
+
+    def test_individual_pan_uses_individual_calculator(self):
+        """Test that a 'P' PAN is taxed with the individual slabs."""
+        results = calculate_pan_results("abcpd1234f", 1_000_000, 0, 10_000, 30)
+        assert results["pan"] == "ABCPD1234F"
+        assert results["entity"] == "Individual"
+        assert results["total_tax"] == 15_600
+        assert results["take_home"] == 1_000_000 - 15_600 - 10_000
+
+    def test_company_pan_uses_corporate_calculator(self):
+        """Test that a 'C' PAN is taxed at the corporate rate."""
+        results = calculate_pan_results("ABCCD1234F", 500_000, 0, 0, 0)
+        assert results["entity"] == "Company"
+        assert results["total_tax"] == 114_400
+
+
 class TestEdgeCases:
     """Test edge cases and boundary conditions."""
 
@@ -213,5 +237,147 @@ class TestEdgeCases:
         assert "0–7L" in slabs
 
 
+
+class TestTaxGrid:
+    """Test the income x deductions grid against the scalar calculator."""
+
+    @pytest.mark.parametrize("pan", ["ABCPD1234F", "ABCCD1234F", "ABCFD1234F"])
+    def test_matches_calculator_per_cell(self, pan):
+        entity = calculate_pan_results(pan, 0, 0, 0, 30)["entity"]
+        grid = tax_grid(0, 8_000_000, 41, 0, 1_000_000, 11, entity, emi=5_000.0)
+        assert grid.tax.shape == (11, 41)
+        for i, deductions in enumerate(grid.deductions):
+            for j, income in enumerate(grid.income):
+                r = calculate_pan_results(pan, income, deductions, 5_000, 30)
+                assert grid.tax[i, j] == pytest.approx(r["total_tax"], abs=0.01)
+                assert grid.take_home[i, j] == pytest.approx(r["take_home"], abs=0.01)
+
+    def test_old_regime_uses_age_band(self):
+        grid = tax_grid(0, 2_000_000, 21, 0, 500_000, 6, regime="old", age=65)
+        for i, deductions in enumerate(grid.deductions):
+            for j, income in enumerate(grid.income):
+                r = calculate_pan_results("ABCPD1234F", income, deductions, 0, 65, regime="old")
+                assert grid.tax[i, j] == pytest.approx(r["total_tax"], abs=0.01)
+
+    def test_effective_rate_is_tax_over_income(self):
+        grid = tax_grid(0, 3_000_000, 4, 0, 100_000, 2)
+        assert list(grid.effective[:, 0]) == [0, 0]
+        assert grid.effective[1, 3] == pytest.approx(grid.tax[1, 3] / 3_000_000)
+
+    def test_repeated_grid_is_cached_and_read_only(self):
+        first = tax_grid(0, 5_000_000, 500, 0, 500_000, 500)
+        assert tax_grid(0, 5_000_000, 500, 0, 500_000, 500) is first
+        assert first.tax.shape == (500, 500)
+        with pytest.raises(ValueError):
+            first.take_home[0, 0] = 1
+
+
+class TestTaxCurve:
+    """Test the vectorized tax curve against the scalar calculators."""
+
+    @pytest.mark.parametrize("entity, deductions", [
+        ("Individual", 0), ("Individual", 75_000), ("Company", 10_000), ("Other", 0),
+    ])
+    def test_matches_scalar_calculators(self, entity, deductions):
+        incomes = [i * 7_919.0 for i in range(1_000)]
+        curve = tax_for_incomes(incomes, deductions, entity)
+        for income, tax in zip(incomes, curve.tax):
+            if entity == "Individual":
+                expected = calculate_individual_tax(income, deductions, 30)[0]
+            else:
+                expected = calculate_corporate_tax(income, deductions, entity)[0]
+            assert tax == pytest.approx(expected, abs=0.01)
+
+    def test_marginal_rate_follows_slabs(self):
+        curve = tax_for_incomes([600_000, 800_000, 1_200_000, 3_000_000], 0)
+        assert list(curve.marginal) == pytest.approx([0, 0.052, 0.104, 0.312])
+
+    def test_company_rate_changes_above_limit(self):
+        curve = tax_for_incomes([4_000_000, 6_000_000], 0, "Company")
+        assert list(curve.marginal) == pytest.approx([0.2288, 0.312])
+
+    def test_effective_rate_is_tax_over_income(self):
+        curve = tax_for_incomes([0, 1_500_000], 75_000)
+        assert curve.effective[0] == 0
+        assert curve.effective[1] == pytest.approx(curve.tax[1] / 1_500_000)
+
+    def test_repeated_range_is_cached_and_read_only(self):
+        first = tax_curve(0, 2_000_000, 500, 75_000)
+        assert tax_curve(0, 2_000_000, 500, 75_000) is first
+        assert len(first.income) == 500
+        with pytest.raises(ValueError):
+            first.tax[0] = 1
+
+    def test_unknown_regime(self):
+        with pytest.raises(ValueError):
+            tax_for_incomes([1_000_000], regime="flat")
+
+
+
+class TestOldRegime:
+    """Test Old Regime slabs, age bands and the 87A rebate."""
+
+    @pytest.mark.parametrize("age, exempt", [(30, 250_000), (65, 300_000), (85, 500_000)])
+    def test_exemption_limit_by_age(self, age, exempt):
+        _, slabs, steps = calculate_individual_tax(exempt + 100_000, 0, age, regime="old")
+        # Income above the exemption starts at 5% (20% above 5L)
+        expected = 100_000 * (0.05 if exempt < 500_000 else 0.20)
+        assert steps["tax_before"] == pytest.approx(expected)
+
+    def test_rebate_up_to_5l(self):
+        tax, _, steps = calculate_individual_tax(500_000, 0, 30, regime="old")
+        assert steps["tax_before"] == 12_500
+        assert steps["rebate"] == 12_500
+        assert tax == 0
+
+    def test_rebate_cliff_above_5l(self):
+        tax, _, _ = calculate_individual_tax(550_000, 0, 30, regime="old")
+        assert tax == pytest.approx((12_500 + 10_000) * 1.04)
+
+    def test_high_income_slabs(self):
+        tax, slabs, steps = calculate_individual_tax(1_500_000, 200_000, 40, regime="old")
+        # Taxable 13L: 12.5K + 1L + 30% of 3L
+        assert steps["tax_before"] == pytest.approx(12_500 + 100_000 + 90_000)
+        assert list(slabs) == ["0–2.5L", "2.5L–5L", "5L–10L", "Above 10L"]
+
+    def test_pan_results_pass_regime(self):
+        old = calculate_pan_results("ABCPD1234F", 1_500_000, 200_000, 0, 40, regime="old")
+        new = calculate_pan_results("ABCPD1234F", 1_500_000, 200_000, 0, 40)
+        assert old["total_tax"] != new["total_tax"]
+
+    def test_unknown_regime(self):
+        with pytest.raises(ValueError):
+            calculate_individual_tax(1_000_000, 0, 30, regime="flat")
+
+
+class TestRegimeComparison:
+    """Test comparing both regimes for the same inputs."""
+
+    def test_scalar_comparison(self):
+        result = compare_regimes(1_500_000, 200_000, 40)
+        old = calculate_individual_tax(1_500_000, 200_000, 40, regime="old")[0]
+        new = calculate_individual_tax(1_500_000, 200_000, 40)[0]
+        assert (result.old_tax, result.new_tax) == (old, new)
+        assert result.cheaper == ("old" if old < new else "new")
+        assert result.difference == pytest.approx(abs(old - new))
+
+    def test_separate_new_regime_deductions(self):
+        result = compare_regimes(1_000_000, 400_000, 30, new_deductions=75_000)
+        assert result.new_tax == calculate_individual_tax(1_000_000, 75_000, 30)[0]
+        assert result.old_tax == calculate_individual_tax(1_000_000, 400_000, 30, regime="old")[0]
+
+    def test_payroll_matches_scalar(self):
+        incomes = [300_000 + i * 23_456.0 for i in range(300)]
+        deductions = [(i % 4) * 60_000.0 for i in range(300)]
+        ages = [25 + i % 65 for i in range(300)]
+        result = compare_regimes(incomes, deductions, ages, new_deductions=75_000)
+        for i in range(300):
+            old = calculate_individual_tax(incomes[i], deductions[i], ages[i], regime="old")[0]
+            new = calculate_individual_tax(incomes[i], 75_000, ages[i])[0]
+            assert result.old_tax[i] == pytest.approx(old, abs=0.01)
+            assert result.new_tax[i] == pytest.approx(new, abs=0.01)
+            assert result.cheaper[i] == ("old" if old < new else "new")
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,310 @@
+"""
+Unit tests for the dashboard charts and blitting animation engine.
+
+Tests for:
+- Tracks creating artists once and updating them in place
+- Final frames matching the result data
+- What-if heatmaps
+- Frame timing, blitting and finishing of BlitAnimation
+- Per-size caching of tight_layout results
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Add parent directory to path to import taxlib
+sys.path.insert(0, str(Path(__file__).parent.parent / "Tax calc"))
+
+matplotlib = pytest.importorskip("matplotlib")
+matplotlib.use("Agg")
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from taxlib import calculate_pan_results
+from taxlib.calculations import regime_rules
+from taxlib import charts
+from taxlib.charts import BarTrack, BlitAnimation, HeatmapTrack, LayoutCache, LineTrack, PieTrack
+
+
+def _steps():
+    return calculate_pan_results("ABCPD1234F", 2_500_000, 75_000, 10_000, 30)["steps"]
+
+
+def _canvas(grid=(221, 222, 223, 224)):
+    fig = Figure(figsize=(8, 5), dpi=50)
+    canvas = FigureCanvasAgg(fig)
+    return canvas, [fig.add_subplot(g) for g in grid]
+
+
+class BlitCountingCanvas(FigureCanvasAgg):
+    """Agg canvas that counts full draws and blits."""
+
+    def __init__(self, figure):
+        super().__init__(figure)
+        self.draws = 0
+        self.blitted = 0
+
+    def draw(self):
+        self.draws += 1
+        super().draw()
+
+    def blit(self, bbox=None):
+        self.blitted += 1
+
+
+class TestTracks:
+    """Test that tracks mutate their artists instead of rebuilding them."""
+
+    def test_pie_reuses_wedges_and_reaches_final_shares(self):
+        canvas, (ax, *_) = _canvas()
+        track = PieTrack(ax, "Pie", [100, 300], ["r", "g"], ["A", "B"])
+        track.setup()
+        artists = list(track.artists)
+        children = len(ax.get_children())
+        for frame in range(track.frames):
+            track.update(frame)
+        assert track.artists == artists
+        assert len(ax.get_children()) == children
+        spans = [w.theta2 - w.theta1 for w in track.wedges]
+        assert spans == pytest.approx([90, 270])
+        assert [t.get_text() for t in track.autotexts] == ["25.0%", "75.0%"]
+
+    def test_pie_ignores_negative_amounts(self):
+        canvas, (ax, *_) = _canvas()
+        track = PieTrack(ax, "Pie", [100, -50], ["r", "g"])
+        track.setup()
+        track.update(track.frames - 1)
+        assert track.wedges[0].theta2 - track.wedges[0].theta1 == pytest.approx(360)
+
+    def test_bars_grow_and_label(self):
+        canvas, (ax, *_) = _canvas()
+        track = BarTrack(ax, "Bars", ["a", "b", "c"], [10, 0, 30], "b")
+        track.setup()
+        track.update(1)
+        assert [b.get_height() for b in track.bars] == [10, 0, 0]
+        track.update(3)
+        assert [b.get_height() for b in track.bars] == [10, 0, 30]
+        assert [t.get_visible() for t in track.value_texts] == [True, False, True]
+        assert track.value_texts[2].get_text() == "₹30"
+
+    def test_line_extends_and_shows_marker_last(self):
+        canvas, (ax, *_) = _canvas()
+        track = LineTrack(ax, "Line", ["Jan", "Feb", "Mar"], [1, 2, 3], "g",
+                          fill=True, marker=(1, 2, "You"))
+        track.setup()
+        track.update(2)
+        assert list(track.line.get_ydata()) == [1, 2]
+        assert not track.point.get_visible()
+        track.update(3)
+        assert list(track.line.get_xdata()) == [0, 1, 2]
+        assert track.point.get_visible()
+        assert [t.get_text() for t in ax.get_xticklabels()] == ["Jan", "Feb", "Mar"]
+
+    def test_dense_line_is_revealed_in_fixed_frames(self):
+        canvas, (ax, *_) = _canvas()
+        track = LineTrack(ax, "Curve", list(range(1000)), list(range(1000)), "r",
+                          style="-", reveal_frames=8, marker=(500, 500, "You"))
+        track.setup()
+        assert track.frames == 9
+        track.update(4)
+        assert len(track.line.get_xdata()) == 500
+        assert not track.point.get_visible()
+        track.update(8)
+        assert len(track.line.get_xdata()) == 1000
+        assert track.point.get_visible()
+
+    @pytest.mark.parametrize("mode", ["Pie", "Bar", "Line"])
+    def test_income_tab_modes(self, mode):
+        canvas, axes = _canvas((231, 232, 233, 212))
+        tracks = charts.income_tracks(axes, _steps(), 10_000, mode)
+        assert len(tracks) == 4
+        anim = BlitAnimation(canvas, tracks)
+        anim.start(now=0, timer=False)
+        anim.stop()
+        canvas.draw()
+
+    def test_tax_and_insights_tabs_for_zero_income(self):
+        steps = calculate_pan_results("ABCPD1234F", 0, 0, 0, 30)["steps"]
+        for tracks in (lambda axes: charts.tax_tracks(axes, steps, "Individual"),
+                       lambda axes: charts.insights_tracks(axes, steps, 0)):
+            canvas, axes = _canvas()
+            anim = BlitAnimation(canvas, tracks(axes))
+            anim.start(now=0, timer=False)
+            anim.stop()
+            canvas.draw()
+
+    @pytest.mark.parametrize("regime, age", [("new", 30), ("old", 30), ("old", 85)])
+    def test_slab_bars_follow_the_regime(self, regime, age):
+        steps = calculate_pan_results("ABCPD1234F", 1_800_000, 75_000, 0, age, regime=regime)["steps"]
+        _, axes = _canvas()
+        breakdown = charts.tax_tracks(axes, steps, "Individual", age, regime)[0]
+        rules = regime_rules(regime, age)
+        assert len(breakdown.labels) == len(rules["slabs"])
+        for label, band, (_, rate) in zip(breakdown.labels, rules["labels"], rules["slabs"]):
+            assert label == f"{band}\n{rate:.0%}"
+        assert sum(breakdown.values) == pytest.approx(steps["taxable"])
+
+    def test_rates_and_curve_follow_the_regime_and_age(self):
+        # An Old Regime super senior is exempt up to 5L, so there is no 5% slab
+        results = calculate_pan_results("ABCPD1234F", 1_200_000, 75_000, 0, 85, regime="old")
+        steps = results["steps"]
+        _, axes = _canvas()
+        _, rates, curve, _ = charts.tax_tracks(axes, steps, "Individual", 85, "old")
+        assert rates.values == pytest.approx([0, 20, 30])
+        at_gross = np.interp(steps["gross"], curve.x, curve.y)
+        assert at_gross == pytest.approx(results["total_tax"], abs=1)
+        assert curve.marker[1] == pytest.approx(at_gross, abs=1)
+
+    def test_recommended_investments_follow_the_user(self):
+        steps = calculate_pan_results("ABCPD1234F", 560_000, 50_000, 0, 30, regime="old")["steps"]
+        _, axes = _canvas()
+        investments = charts.insights_tracks(axes, steps, 0)[1]
+        assert investments.labels == ["NPS"]
+        assert investments.values == [10_000]
+        assert "Old Regime: saves ₹15,080 tax" in investments.title
+        steps = calculate_pan_results("ABCPD1234F", 300_000, 50_000, 0, 30)["steps"]
+        _, axes = _canvas()
+        assert charts.insights_tracks(axes, steps, 0)[1].labels == ["No further tax saving"]
+
+    def test_no_investment_saving_when_new_regime_is_cheaper(self):
+        # Investing would cut the Old Regime tax, but not below the New Regime tax paid
+        steps = calculate_pan_results("ABCPD1234F", 1_500_000, 75_000, 0, 30)["steps"]
+        _, axes = _canvas()
+        investments = charts.insights_tracks(axes, steps, 0)[1]
+        assert investments.labels == ["New Regime is cheaper"]
+        assert "saves" not in investments.title
+
+    def test_projection_is_year_by_year_take_home(self):
+        results = calculate_pan_results("ABCPD1234F", 1_500_000, 75_000, 10_000, 30)
+        _, axes = _canvas()
+        projection = charts.insights_tracks(axes, results["steps"], 10_000)[3]
+        assert len(projection.y) == 10
+        assert projection.y[0] == pytest.approx(results["take_home"])
+        assert projection.y[-1] > projection.y[0]
+
+    def test_heatmap_reveals_columns_and_keeps_one_colorbar(self):
+        canvas, (ax, *_) = _canvas()
+        values = [[1, 2, 3, 4], [5, 6, 7, 8]]
+        track = HeatmapTrack(ax, "Heat", [0, 1, 2, 3], [0, 1], values, reveal_frames=2, marker=(1, 1, "You"))
+        for _ in range(2):
+            track.setup()
+        assert len(ax.child_axes) == 1
+        track.update(1)
+        shown = track.image.get_array()
+        assert shown[:, :2].tolist() == [[1, 2], [5, 6]]
+        assert shown[:, 2:].mask.all()
+        assert not track.point.get_visible()
+        track.update(2)
+        assert track.image.get_array().tolist() == values
+        assert track.point.get_visible()
+
+    def test_whatif_tab(self):
+        results = calculate_pan_results("ABCPD1234F", 1_500_000, 75_000, 10_000, 30)
+        canvas, axes = _canvas((121, 122))
+        tax, saving = charts.whatif_tracks(axes, results["steps"], 10_000, "Individual")
+        assert tax.values.shape == (charts.WHATIF_POINTS, charts.WHATIF_POINTS)
+        assert tax.marker[:2] == (1_500_000, 75_000)
+        assert tax.x[-1] >= 3_000_000
+        # 30% slab, cess included
+        assert saving.values[0, -1] == pytest.approx(0.312, abs=0.001)
+        assert saving.values.min() >= 0 and saving.values.max() <= 1
+        anim = BlitAnimation(canvas, [tax, saving])
+        anim.start(now=0, timer=False)
+        anim.stop()
+        canvas.draw()
+
+
+class TestBlitAnimation:
+    """Test frame timing, blitting and finishing."""
+
+    def _anim(self):
+        fig = Figure(figsize=(8, 5), dpi=50)
+        canvas = BlitCountingCanvas(fig)
+        axes = [fig.add_subplot(g) for g in (221, 222, 223, 224)]
+        return canvas, BlitAnimation(canvas, charts.tax_tracks(axes, _steps(), "Individual"))
+
+    def test_one_full_draw_then_blits_only_on_frame_changes(self):
+        canvas, anim = self._anim()
+        anim.start(now=0, timer=False)
+        assert canvas.draws == 1
+        assert anim.advance(0.01)
+        assert canvas.blitted == 0  # no track reached its next frame yet
+        assert anim.advance(0.45)
+        assert canvas.blitted == 1
+        assert canvas.draws == 1
+
+    def test_runs_to_completion_and_releases_artists(self):
+        canvas, anim = self._anim()
+        anim.start(now=0, timer=False)
+        t = 0.0
+        while anim.advance(t):
+            t += 0.033
+        assert t == pytest.approx(anim.duration, abs=0.05)
+        assert all(f == track.frames - 1 for f, track in zip(anim.frames, anim.tracks))
+        assert not any(a.get_animated() for a in anim.artists)
+        assert not anim.advance(t + 1)
+
+    def test_stop_jumps_to_final_frame(self):
+        canvas, anim = self._anim()
+        anim.start(now=0, timer=False)
+        anim.stop()
+        assert not anim.running
+        components = anim.tracks[3]
+        assert components.bars[-1].get_height() == _steps()["total"]
+
+    def test_redraw_recaptures_background(self):
+        canvas, anim = self._anim()
+        anim.start(now=0, timer=False)
+        first = anim._background
+        canvas.figure.set_size_inches(6, 4)
+        canvas.draw()
+        assert anim._background is not first
+        assert anim.advance(0.45)
+
+
+class TestLayoutCache:
+    """Test that tight_layout runs once per canvas size and content key."""
+
+    def test_layout_computed_once_per_size(self):
+        canvas, axes = _canvas()
+        tracks = charts.tax_tracks(axes, _steps(), "Individual")
+        for track in tracks:
+            track.setup()
+        layout = LayoutCache(canvas.figure)
+        assert layout.apply() is True
+        assert layout.apply() is False
+        assert layout.computed == 1
+
+        canvas.figure.set_size_inches(10, 6)
+        assert layout.apply() is True
+        canvas.figure.set_size_inches(8, 5)
+        assert layout.apply() is True  # restored from cache, not recomputed
+        assert layout.computed == 2
+
+    def test_key_and_invalidate_force_recompute(self):
+        canvas, axes = _canvas()
+        layout = LayoutCache(canvas.figure)
+        layout.apply("Pie")
+        layout.apply("Bar")
+        assert layout.computed == 2
+        layout.invalidate()
+        layout.apply("Pie")
+        assert layout.computed == 3
+
+    def test_cached_params_match_tight_layout(self):
+        canvas, axes = _canvas()
+        for track in charts.insights_tracks(axes, _steps(), 10_000):
+            track.setup()
+        layout = LayoutCache(canvas.figure)
+        layout.apply()
+        expected = layout._current()
+        canvas.figure.subplots_adjust(left=0.3)
+        layout.apply()
+        assert layout._current() == expected
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
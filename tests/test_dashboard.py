@@ -0,0 +1,135 @@
+"""
+Unit tests for the dashboard lifecycle manager.
+
+Tests for:
+- Reusing one dashboard and pushing results into it
+- Releasing the dashboard when it is closed
+- Figure/artist counts staying flat over repeated recalculations
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Add parent directory to path to import taxlib
+sys.path.insert(0, str(Path(__file__).parent.parent / "Tax calc"))
+
+from taxlib import calculate_pan_results
+from taxlib.dashboard import DashboardManager, figure_stats
+
+
+class FakeDashboard:
+    """Dashboard without a window that records calls."""
+
+    def __init__(self, results):
+        self.results = results
+        self.closed = False
+        self.shown = 0
+
+    def update(self, results):
+        self.results = results
+
+    def show(self):
+        self.shown += 1
+
+    def close(self):
+        self.closed = True
+
+    def figures(self):
+        return []
+
+
+class AggDashboard(FakeDashboard):
+    """Offscreen dashboard redrawing the real chart tracks on Agg figures."""
+
+    def __init__(self, results):
+        super().__init__(results)
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+        self.figs = []
+        self.axes = []
+        for grid in ((231, 232, 233, 212), (221, 222, 223, 224), (221, 222, 223, 224)):
+            fig = Figure(figsize=(8, 5), dpi=40)
+            FigureCanvasAgg(fig)
+            self.figs.append(fig)
+            self.axes.append([fig.add_subplot(g) for g in grid])
+        self.update(results)
+
+    def update(self, results):
+        from taxlib import charts
+        super().update(results)
+        steps, emi = results["steps"], results["emi"]
+        for fig, tracks in zip(self.figs, (
+            charts.income_tracks(self.axes[0], steps, emi),
+            charts.tax_tracks(self.axes[1], steps, results["entity"], results["age"], results["regime"]),
+            charts.insights_tracks(self.axes[2], steps, emi),
+        )):
+            anim = charts.BlitAnimation(fig.canvas, tracks)
+            anim.setup()
+            anim.stop(redraw=False)
+
+    def figures(self):
+        return self.figs
+
+
+def _results(income=1_200_000):
+    return calculate_pan_results("ABCPD1234F", income, 75_000, 5_000, 30)
+
+
+class TestDashboardManager:
+    """Test single-instance reuse and closing."""
+
+    def test_open_reuses_the_open_dashboard(self):
+        manager = DashboardManager(FakeDashboard)
+        first = manager.open(_results(1_000_000))
+        second = manager.open(_results(2_000_000))
+        assert first is second
+        assert first.results["steps"]["gross"] == 2_000_000
+        assert first.shown == 1
+        assert manager.stats()["created"] == 1
+
+    def test_push_only_updates_an_open_dashboard(self):
+        manager = DashboardManager(FakeDashboard)
+        assert manager.push(_results()) is False
+        dash = manager.open(_results(1_000_000))
+        assert manager.push(_results(3_000_000)) is True
+        assert dash.results["steps"]["gross"] == 3_000_000
+
+    def test_closed_window_is_released(self):
+        manager = DashboardManager(FakeDashboard)
+        first = manager.open(_results())
+        first.close()  # user closed the window
+        assert manager.current is None
+        assert manager.stats()["open"] is False
+        second = manager.open(_results())
+        assert second is not first
+        manager.close()
+        assert second.closed
+        assert manager.stats()["created"] == 2
+
+
+class TestMemoryStaysFlat:
+    """Test that recalculating does not accumulate figures or artists."""
+
+    def test_counts_flat_over_many_updates(self):
+        pytest.importorskip("matplotlib")
+        manager = DashboardManager(AggDashboard)
+        manager.open(_results())
+        manager.push(_results(1_500_000))
+        baseline = manager.stats()
+        assert baseline["figures"] == 3
+        assert baseline["axes"] == 12
+
+        for i in range(21):
+            manager.push(_results(1_500_000 + (i % 2) * 10_000))
+        stats = manager.stats()
+        assert (stats["figures"], stats["axes"], stats["artists"]) == \
+            (baseline["figures"], baseline["axes"], baseline["artists"])
+        assert stats["updates"] == 22
+
+    def test_figure_stats_empty(self):
+        assert figure_stats([]) == {"figures": 0, "axes": 0, "artists": 0}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -226,6 +226,17 @@ class TestDatabaseEdgeCases:
             # Database stores as-is; validation is app responsibility
             assert data["income"] == -100_000
 
+    def test_iter_pan_data_streams_all_rows(self):
+        """Test iterating over every saved record in small batches."""
+        from taxlib import db
+        
+        with patch.object(db, 'DB_FILE', self.temp_db_path):
+            for i in range(5):
+                db.save_pan_data_db(f"ABCPD{i:04d}F", 100_000 * i, 0, 0, 30)
+            rows = list(db.iter_pan_data_db(batch_size=2))
+            assert [r["pan"] for r in rows] == [f"ABCPD{i:04d}F" for i in range(5)]
+            assert rows[3]["income"] == 300_000
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,168 @@
+"""
+Unit tests for the deduction catalogue.
+
+Tests for:
+- Section caps and the standard deduction per regime
+- Interactions (NPS spill-over into 80C, age-based 80D limits)
+- Vectorized processing of many taxpayers
+- Savings headroom used by the dashboard
+- Investment optimizer (lowest tax for the least money, batches)
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Add parent directory to path to import taxlib
+sys.path.insert(0, str(Path(__file__).parent.parent / "Tax calc"))
+
+from taxlib.calculations import calculate_individual_tax
+from taxlib.deductions import (allowed_deductions, max_deductions, optimize_investments, savings_headroom,
+                               section_caps, split_deductions)
+
+
+class TestSectionCaps:
+    """Test caps for one taxpayer."""
+
+    def test_claims_are_capped(self):
+        allowed = allowed_deductions({"80C": 200_000, "80D": 40_000, "80D_parents": 60_000, "24b": 350_000})
+        assert allowed["standard"] == 50_000
+        assert allowed["80C"] == 150_000
+        assert allowed["80D"] == 25_000
+        assert allowed["80D_parents"] == 25_000
+        assert allowed["24b"] == 200_000
+        assert allowed["total"] == 450_000
+
+    def test_claims_below_caps_pass_through(self):
+        allowed = allowed_deductions({"80C": 80_000, "80D": 12_000}, employment_type="Self Employed")
+        assert allowed["standard"] == 0
+        assert allowed["total"] == 92_000
+
+    def test_nps_beyond_1b_counts_towards_80c(self):
+        allowed = allowed_deductions({"80C": 120_000, "80CCD(1B)": 90_000})
+        assert allowed["80CCD(1B)"] == 50_000
+        assert allowed["80C"] == 150_000  # 1.2L + 40K spill-over, capped
+
+    def test_senior_80d_limits(self):
+        allowed = allowed_deductions({"80D": 60_000, "80D_parents": 60_000}, age=65, parents_senior=True)
+        assert allowed["80D"] == 50_000
+        assert allowed["80D_parents"] == 50_000
+
+    def test_new_regime_allows_only_standard_deduction(self):
+        allowed = allowed_deductions({"80C": 150_000, "24b": 100_000}, regime="new")
+        assert allowed["total"] == 75_000
+
+    def test_negative_claims_count_as_zero(self):
+        assert allowed_deductions({"80C": -5_000}, employment_type="Self Employed")["total"] == 0
+
+    def test_unknown_section(self):
+        with pytest.raises(ValueError):
+            allowed_deductions({"80G": 10_000})
+
+    def test_caps(self):
+        assert section_caps()["80C"] == 150_000
+        assert max_deductions() == 50_000 + 150_000 + 50_000 + 25_000
+        assert max_deductions("new") == 75_000
+
+
+class TestVectorized:
+    """Test many taxpayers in one call."""
+
+    def test_matches_scalar(self):
+        claims = {"80C": [0, 90_000, 200_000], "80CCD(1B)": [70_000, 0, 10_000], "80D": [30_000, 30_000, 30_000]}
+        ages = [30, 62, 45]
+        employment = ["Salaried", "Self Employed", "Salaried"]
+        allowed = allowed_deductions(claims, age=ages, employment_type=employment)
+        for i in range(3):
+            one = allowed_deductions({s: v[i] for s, v in claims.items()}, age=ages[i],
+                                     employment_type=employment[i])
+            for section, value in one.items():
+                assert allowed[section][i] == value
+        assert allowed["24b"].shape == (3,)
+
+
+class TestHeadroom:
+    """Test the savings potential shown in the dashboard."""
+
+    def test_headroom(self):
+        assert savings_headroom(75_000) == 200_000
+        assert savings_headroom(500_000) == 0
+
+    def test_headroom_limited_by_income(self):
+        assert savings_headroom(50_000, income=120_000) == 70_000
+
+
+class TestOptimizeInvestments:
+    """Test the investment allocation that minimizes tax."""
+
+    @staticmethod
+    def _old_tax(income, deductions, age=30):
+        return calculate_individual_tax(income, deductions, age, regime="old")[0]
+
+    def test_fills_caps_when_tax_keeps_falling(self):
+        plan = optimize_investments(1_000_000, 500_000)
+        assert plan.amounts == {"NPS": 50_000, "PPF": 150_000, "ELSS": 0, "Health Insurance": 25_000}
+        assert plan.invested == 225_000
+        assert plan.tax_before == self._old_tax(1_000_000, 50_000)
+        assert plan.tax_after == self._old_tax(1_000_000, 275_000)
+        assert plan.saving == plan.tax_before - plan.tax_after
+
+    def test_stops_at_rebate_limit(self):
+        # Taxable 5.1L: 10K of investment brings it to the 5L rebate limit
+        plan = optimize_investments(560_000, 500_000)
+        assert plan.invested == 10_000
+        assert plan.tax_after == 0
+
+    def test_no_investment_below_exemption(self):
+        plan = optimize_investments(300_000, 100_000)
+        assert plan.invested == 0
+        assert plan.saving == 0
+
+    def test_budget_and_existing_claims_limit_allocation(self):
+        assert optimize_investments(2_000_000, 30_000).invested == 30_000
+        plan = optimize_investments(1_000_000, 500_000, {"80C": 150_000})
+        assert plan.amounts["PPF"] == plan.amounts["ELSS"] == 0
+        assert plan.invested == 75_000
+
+    def test_new_regime_allocates_nothing(self):
+        plan = optimize_investments(1_000_000, 500_000, regime="new")
+        assert plan.invested == 0
+        assert plan.tax_after == plan.tax_before
+
+    @pytest.mark.parametrize("age", [30, 65])
+    def test_matches_brute_force(self, age):
+        cap = int(max_deductions("old", age=age)) - 50_000
+        for income in range(250_000, 1_600_000, 45_000):
+            for budget in (0, 40_000, 120_000, 400_000):
+                plan = optimize_investments(income, budget, age=age)
+                taxes = [self._old_tax(income, 50_000 + x, age) for x in range(0, min(budget, cap) + 1, 1000)]
+                best = min(taxes)
+                assert plan.tax_after == pytest.approx(best, abs=0.01)
+                # Never more money than the first amount reaching the lowest tax
+                assert plan.invested <= 1000 * next(i for i, t in enumerate(taxes) if t - best < 0.01)
+
+    def test_batch_matches_scalar(self):
+        incomes = [1_000_000, 600_000, 560_000, 2_000_000, 300_000]
+        budgets = [500_000, 500_000, 500_000, 30_000, 100_000]
+        ages = [30, 30, 65, 85, 30]
+        plans = optimize_investments(incomes, budgets, age=ages)
+        for i in range(len(incomes)):
+            one = optimize_investments(incomes[i], budgets[i], age=ages[i])
+            assert plans.invested[i] == one.invested
+            assert plans.tax_after[i] == one.tax_after
+            for name, amount in one.amounts.items():
+                assert plans.amounts[name][i] == amount
+
+    def test_unknown_instrument_section(self):
+        from taxlib.deductions import Instrument
+        with pytest.raises(ValueError):
+            optimize_investments(1_000_000, 100_000, instruments=[Instrument("Gold", "80G", 1e9)])
+
+    def test_split_deductions(self):
+        claims = split_deductions(300_000)
+        assert claims == {"80C": 150_000, "80CCD(1B)": 50_000, "80D": 25_000, "24b": 25_000}
+        assert allowed_deductions(claims)["total"] == 300_000
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,348 @@
+"""
+Unit tests for report export helpers.
+
+Tests for:
+- Render cache keying, reuse and memory bound
+- Rendering dashboard tabs that are built lazily
+- PDF and Excel exports sharing cached figure renders
+- Streaming write-only Excel export
+- Native reportlab vector charts
+- Year-by-year projection in reports
+"""
+
+import pytest
+import sqlite3
+import sys
+from pathlib import Path
+
+# Add parent directory to path to import taxlib
+sys.path.insert(0, str(Path(__file__).parent.parent / "Tax calc"))
+
+pytest.importorskip("reportlab")
+pytest.importorskip("openpyxl")
+matplotlib = pytest.importorskip("matplotlib")
+matplotlib.use("Agg")
+
+from matplotlib.figure import Figure
+from openpyxl import load_workbook
+
+from taxlib import calculate_individual_tax, calculate_pan_results
+from taxlib import export
+from taxlib.export import RenderCache, figure_cache_key, export_rows_excel, results_rows, RESULT_COLUMNS
+from taxlib.export import build_vector_charts
+
+
+def _results():
+    total, slab, steps = calculate_individual_tax(1_200_000, 75_000, 30)
+    return {"total_tax": total, "steps": steps, "slab": slab, "emi": 10_000}
+
+
+class CountingFigure(Figure):
+    """Figure that counts how often it is rasterized."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.saves = 0
+        self.add_subplot(111).plot([0, 1], [1, 0])
+
+    def savefig(self, *args, **kwargs):
+        self.saves += 1
+        return super().savefig(*args, **kwargs)
+
+
+class TestFigureCacheKey:
+    """Test cache key derivation."""
+
+    def test_same_results_same_key(self):
+        assert figure_cache_key(_results(), "Pie") == figure_cache_key(_results(), "Pie")
+
+    def test_chart_mode_changes_key(self):
+        assert figure_cache_key(_results(), "Pie") != figure_cache_key(_results(), "Bar")
+
+    def test_results_change_key(self):
+        other = _results()
+        other["emi"] = 20_000
+        assert figure_cache_key(_results(), "Pie") != figure_cache_key(other, "Pie")
+
+
+class TestRenderCache:
+    """Test the bounded render cache."""
+
+    def test_render_once_per_key(self):
+        cache = RenderCache()
+        fig = CountingFigure(figsize=(2, 2), dpi=50)
+        key = figure_cache_key(_results(), "Pie")
+        first = cache.render(fig, 0, key)
+        second = cache.render(fig, 0, key)
+        assert first == second
+        assert first.startswith(b"\x89PNG")
+        assert fig.saves == 1
+
+    def test_figure_size_is_part_of_key(self):
+        cache = RenderCache()
+        fig = CountingFigure(figsize=(2, 2), dpi=50)
+        key = figure_cache_key(_results(), "Pie")
+        cache.render(fig, 0, key)
+        fig.set_size_inches(3, 2)
+        cache.render(fig, 0, key)
+        assert fig.saves == 2
+
+    def test_memory_bound_evicts_oldest(self):
+        cache = RenderCache(max_bytes=10)
+        cache.put(("a",), b"12345")
+        cache.put(("b",), b"12345")
+        cache.put(("c",), b"12345")
+        assert cache.get(("a",)) is None
+        assert cache.get(("c",)) == b"12345"
+        assert cache.size <= 10
+
+    def test_clear(self):
+        cache = RenderCache()
+        cache.put(("a",), b"123")
+        cache.clear()
+        assert len(cache) == 0
+        assert cache.size == 0
+
+
+class LazyDashboard:
+    """Dashboard whose tabs are built on demand, each drawing a distinct figure."""
+
+    def __init__(self, *built):
+        self.figs = [None] * 4
+        for index in built:
+            self.build(index)
+
+    def build(self, index):
+        fig = Figure(figsize=(2, 2), dpi=50)
+        fig.add_subplot(111).bar([0], [index + 1])
+        self.figs[index] = fig
+
+    def tab_figures(self):
+        return [(i, f) for i, f in enumerate(self.figs) if f is not None]
+
+    def stop_animations(self):
+        pass
+
+
+class AnimatedDashboard(LazyDashboard):
+    """Dashboard with a bar chart animation still running on tab 0."""
+
+    def __init__(self, frame):
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from taxlib.charts import BarTrack, BlitAnimation
+        super().__init__()
+        fig = Figure(figsize=(2, 2), dpi=50)
+        track = BarTrack(fig.add_subplot(111), "Bars", ["a", "b", "c"], [10, 20, 30], "b")
+        self.anim = BlitAnimation(FigureCanvasAgg(fig), [track])
+        self.anim.start(now=0, timer=False)
+        self.anim.advance(now=frame * track.interval / 1000)
+        self.figs[0] = fig
+
+    def stop_animations(self):
+        self.anim.stop()
+
+
+def _render(dashboard, key):
+    images = []
+    for step in export.dashboard_render_steps(dashboard, key, images):
+        step()
+    return images
+
+
+class TestDashboardRenders:
+    """Test rendering the figures of an open dashboard."""
+
+    def test_tab_built_between_exports_gets_its_own_image(self, monkeypatch):
+        monkeypatch.setattr(export, "render_cache", RenderCache())
+        key = figure_cache_key(_results(), "Pie")
+        dash = LazyDashboard(0, 2)
+        first = _render(dash, key)
+        dash.build(1)
+        second = _render(dash, key)
+        assert second[0] == first[0]
+        assert second[2] == first[1]
+        assert second[1] not in first
+
+    def test_running_animation_is_finished_before_rendering(self, monkeypatch):
+        monkeypatch.setattr(export, "render_cache", RenderCache())
+        midway = _render(AnimatedDashboard(1), ("k", "Pie"))
+        monkeypatch.setattr(export, "render_cache", RenderCache())
+        finished = _render(AnimatedDashboard(3), ("k", "Pie"))
+        assert midway == finished
+
+    def test_one_step_per_built_tab(self):
+        assert len(export.dashboard_render_steps(LazyDashboard(1, 3), ("k", "Pie"), [])) == 2
+
+
+class TestSharedExports:
+    """Test that PDF and Excel exports reuse one render per figure."""
+
+    def test_pdf_then_excel_renders_each_figure_once(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(export, "render_cache", RenderCache())
+        figs = {tab: CountingFigure(figsize=(2, 2), dpi=50) for tab in range(3)}
+        results = _results()
+        key = figure_cache_key(results, "Pie")
+
+        export.export_report_pdf(results, str(tmp_path / "r.pdf"), figs=figs, cache_key=key)
+        export.export_report_excel(results, str(tmp_path / "r.xlsx"), figs=figs, cache_key=key)
+
+        assert (tmp_path / "r.pdf").stat().st_size > 0
+        assert (tmp_path / "r.xlsx").stat().st_size > 0
+        assert [f.saves for f in figs.values()] == [1, 1, 1]
+
+    def test_figure_sets_are_cached_by_tab_index(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(export, "render_cache", RenderCache())
+        key = figure_cache_key(_results(), "Pie")
+        income, insights = (CountingFigure(figsize=(2, 2), dpi=50) for _ in range(2))
+        export.export_report_pdf(_results(), str(tmp_path / "a.pdf"), figs={0: income, 2: insights}, cache_key=key)
+        tax = CountingFigure(figsize=(2, 2), dpi=50)
+        export.export_report_pdf(_results(), str(tmp_path / "b.pdf"), figs={0: income, 1: tax, 2: insights},
+                                 cache_key=key)
+        assert [f.saves for f in (income, tax, insights)] == [1, 1, 1]
+
+    def test_list_positions_are_not_cached(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(export, "render_cache", RenderCache())
+        key = figure_cache_key(_results(), "Pie")
+        first, second = CountingFigure(figsize=(2, 2), dpi=50), CountingFigure(figsize=(2, 2), dpi=50)
+        export.export_report_pdf(_results(), str(tmp_path / "a.pdf"), figs=[first], cache_key=key)
+        export.export_report_pdf(_results(), str(tmp_path / "b.pdf"), figs=[second], cache_key=key)
+        assert second.saves == 1
+        assert len(export.render_cache) == 0
+
+    def test_without_cache_key_renders_every_time(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(export, "render_cache", RenderCache())
+        figs = [CountingFigure(figsize=(2, 2), dpi=50)]
+        export.export_report_pdf(_results(), str(tmp_path / "r.pdf"), figs=figs)
+        export.export_report_pdf(_results(), str(tmp_path / "r2.pdf"), figs=figs)
+        assert figs[0].saves == 2
+
+    def test_prerendered_png_bytes_are_embedded(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(export, "render_cache", RenderCache())
+        fig = CountingFigure(figsize=(2, 2), dpi=50)
+        png = export.render_cache.render(fig, 0, ("k", "Pie"))
+        export.export_report_excel(_results(), str(tmp_path / "r.xlsx"), figs=[png])
+        assert fig.saves == 1
+        assert "Dashboard_1" in load_workbook(tmp_path / "r.xlsx").sheetnames
+
+    def test_progress_reported_and_can_abort(self, tmp_path):
+        figs = [CountingFigure(figsize=(2, 2), dpi=50) for _ in range(2)]
+        calls = []
+        export.export_report_excel(_results(), str(tmp_path / "r.xlsx"), figs=figs,
+                                   progress=lambda done, total: calls.append((done, total)))
+        assert calls == [(1, 3), (2, 3), (3, 3)]
+
+        def abort(done, total):
+            raise RuntimeError("cancelled")
+
+        with pytest.raises(RuntimeError):
+            export.export_report_pdf(_results(), str(tmp_path / "r.pdf"), figs=figs, progress=abort)
+
+
+class TestStreamingExcel:
+    """Test the write-only Excel export path."""
+
+    def test_generator_rows_and_column_types(self, tmp_path):
+        path = tmp_path / "big.xlsx"
+        rows = ((i, i * 1.5, f"row {i}") for i in range(1000))
+        counts = export_rows_excel(str(path), [("Data", [("N", "int"), ("Amount", "currency"), "Label"], rows)])
+        assert counts == {"Data": 1000}
+
+        ws = load_workbook(path)["Data"]
+        assert [c.value for c in ws[1]] == ["N", "Amount", "Label"]
+        assert ws["A2"].value == 0
+        assert ws["B1001"].value == 999 * 1.5
+        assert ws["B1001"].number_format == "#,##0.00"
+        assert ws["C3"].value == "row 1"
+        assert ws.max_row == 1001
+
+    def test_multiple_sheets_from_results_and_db_cursor(self, tmp_path):
+        path = tmp_path / "multi.xlsx"
+        records = [calculate_pan_results(f"ABCPD{i:04d}F", 800_000 + i * 50_000, 75_000, 0, 30) for i in range(5)]
+        conn = sqlite3.connect(":memory:")
+        conn.execute("CREATE TABLE t (pan TEXT, income REAL)")
+        conn.executemany("INSERT INTO t VALUES (?, ?)", [(r["pan"], r["steps"]["gross"]) for r in records])
+        cursor = conn.execute("SELECT pan, income FROM t ORDER BY pan")
+
+        counts = export_rows_excel(str(path), [
+            ("Results", RESULT_COLUMNS, results_rows(records)),
+            ("Raw", [("PAN", "str"), ("Income", "float")], cursor),
+        ])
+        conn.close()
+
+        assert counts == {"Results": 5, "Raw": 5}
+        wb = load_workbook(path)
+        assert wb.sheetnames == ["Results", "Raw"]
+        assert wb["Results"].cell(row=6, column=11).value == records[4]["total_tax"]
+        assert wb["Raw"]["B2"].value == 800_000
+
+    def test_unconvertible_values_fall_back_to_text(self, tmp_path):
+        path = tmp_path / "bad.xlsx"
+        export_rows_excel(str(path), [("S", [("N", "int")], [("n/a",), (None,)])])
+        ws = load_workbook(path)["S"]
+        assert ws["A2"].value == "n/a"
+        assert ws["A3"].value is None
+
+
+
+class TestVectorCharts:
+    """Test reportlab-native charts in PDF reports."""
+
+    def test_three_charts_from_result_data(self):
+        from reportlab.graphics.shapes import Drawing
+        results = calculate_pan_results("ABCPD1234F", 2_500_000, 75_000, 10_000, 30)
+        drawings = build_vector_charts(results)
+        assert len(drawings) == 3
+        assert all(isinstance(d, Drawing) for d in drawings)
+
+    def test_zero_income_still_draws(self, tmp_path):
+        results = calculate_pan_results("ABCPD1234F", 0, 0, 0, 30)
+        # No slab is reached at zero taxable income, so that chart is skipped
+        assert len(build_vector_charts(results)) == 2
+        export.export_report_pdf(results, str(tmp_path / "zero.pdf"), vector_charts=True)
+        assert (tmp_path / "zero.pdf").stat().st_size > 0
+
+    def test_incomplete_results_skip_charts(self):
+        assert len(build_vector_charts({"slab": {"0–7L": 0.0}})) == 1
+        assert build_vector_charts({"slab": {}}) == []
+
+    def test_vector_pdf_ignores_figures(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(export, "render_cache", RenderCache())
+        figs = [CountingFigure(figsize=(2, 2), dpi=50)]
+        results = calculate_pan_results("ABCPD1234F", 1_500_000, 75_000, 0, 30)
+        export.export_report_pdf(results, str(tmp_path / "v.pdf"), figs=figs, vector_charts=True)
+        assert figs[0].saves == 0
+        assert (tmp_path / "v.pdf").read_bytes().startswith(b"%PDF")
+
+
+class TestProjectionInReports:
+    """Test the projection table in PDF and Excel reports."""
+
+    def test_excel_projection_sheet(self, tmp_path):
+        results = calculate_pan_results("ABCPD1234F", 1_500_000, 75_000, 10_000, 30)
+        export.export_report_excel(results, str(tmp_path / "p.xlsx"), projection=True)
+        rows = list(load_workbook(tmp_path / "p.xlsx")["Projection"].values)
+        assert list(rows[0]) == export.PROJECTION_HEADER
+        assert len(rows) == 11
+        assert rows[1][4] == pytest.approx(results["total_tax"])
+
+    def test_old_regime_result_is_projected_under_the_old_regime(self):
+        results = calculate_pan_results("ABCPD1234F", 1_500_000, 75_000, 10_000, 30, regime="old")
+        assert results["regime"] == "old"
+        rows = export.projection_rows(results)
+        assert rows[1][4] == pytest.approx(results["total_tax"])
+
+    def test_incomplete_results_have_no_projection(self, tmp_path):
+        assert export.projection_rows({"slab": {}}) == []
+        export.export_report_excel({"slab": {}}, str(tmp_path / "n.xlsx"), projection=True)
+        assert "Projection" not in load_workbook(tmp_path / "n.xlsx").sheetnames
+
+    def test_projection_is_opt_in(self, tmp_path, monkeypatch):
+        results = calculate_pan_results("ABCPD1234F", 1_500_000, 75_000, 10_000, 30)
+        monkeypatch.setattr(export, "projection_rows", lambda r: pytest.fail("projection built"))
+        export.export_report_excel(results, str(tmp_path / "p.xlsx"))
+        export.export_report_pdf(results, str(tmp_path / "p.pdf"))
+        assert "Projection" not in load_workbook(tmp_path / "p.xlsx").sheetnames
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,149 @@
+"""
+Unit tests for the frame clock.
+
+Tests for:
+- One pending tick driving every registered animation
+- Tweens, keyed replacement and completion
+- Dropping frames when ticks run late
+- Frame-time statistics
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Add parent directory to path to import taxlib
+sys.path.insert(0, str(Path(__file__).parent.parent / "Tax calc"))
+
+from taxlib.frames import FrameClock, linear
+
+
+class FakeTime:
+    """Manually advanced clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeScheduler:
+    """Stand-in for ``app.after`` that records pending callbacks."""
+
+    def __init__(self, time):
+        self.time = time
+        self.pending = []
+
+    def __call__(self, ms, callback):
+        self.pending.append((ms, callback))
+
+    def run_frames(self, n, frame=1 / 60):
+        for _ in range(n):
+            if not self.pending:
+                return
+            assert len(self.pending) == 1, "more than one tick queued"
+            _, callback = self.pending.pop()
+            self.time.now += frame
+            callback()
+
+
+@pytest.fixture
+def clock():
+    t = FakeTime()
+    scheduler = FakeScheduler(t)
+    return FrameClock(scheduler, fps=60, clock=t), scheduler, t
+
+
+class TestFrameClock:
+    """Test ticking and registration."""
+
+    def test_all_animations_advance_in_the_same_tick(self, clock):
+        fc, scheduler, t = clock
+        seen = []
+        fc.add(lambda now: seen.append(("a", now)) or True)
+        fc.add(lambda now: seen.append(("b", now)) or True)
+        assert len(scheduler.pending) == 1
+        scheduler.run_frames(3)
+        assert len(seen) == 6
+        assert seen[0][1] == seen[1][1]
+        assert fc.frames == 3
+
+    def test_idle_when_nothing_registered(self, clock):
+        fc, scheduler, t = clock
+        fc.add(lambda now: False)
+        scheduler.run_frames(5)
+        assert scheduler.pending == []
+        assert fc.active == 0
+        assert fc.frames == 1
+
+    def test_failing_animation_is_dropped_and_logged(self, clock, caplog):
+        fc, scheduler, t = clock
+        def broken(now):
+            raise RuntimeError("widget destroyed")
+        fc.add(broken, key="broken")
+        with caplog.at_level("ERROR", logger="taxlib.frames"):
+            scheduler.run_frames(2)
+        assert fc.active == 0
+        (record,) = caplog.records
+        assert "'broken'" in record.getMessage()
+        assert record.exc_info[1].args == ("widget destroyed",)
+
+
+class TestTweens:
+    """Test time-based tweens."""
+
+    def test_tween_reaches_one_and_finishes(self, clock):
+        fc, scheduler, t = clock
+        values, done = [], []
+        fc.tween(100, values.append, ease=linear, on_done=lambda: done.append(True))
+        scheduler.run_frames(20)
+        assert values[-1] == 1.0
+        assert values == sorted(values)
+        assert done == [True]
+        assert fc.active == 0
+
+    def test_same_key_replaces_running_tween(self, clock):
+        fc, scheduler, t = clock
+        first, second = [], []
+        fc.tween(1000, first.append, key="label")
+        scheduler.run_frames(2)
+        fc.tween(1000, second.append, key="label")
+        scheduler.run_frames(2)
+        assert len(first) == 2
+        assert len(second) == 2
+        assert fc.active == 1
+
+
+class TestFrameDropping:
+    """Test that late frames are skipped rather than queued."""
+
+    def test_late_tick_skips_ahead(self, clock):
+        fc, scheduler, t = clock
+        values = []
+        fc.tween(100, values.append, ease=linear)
+        scheduler.run_frames(1)
+        scheduler.run_frames(1, frame=0.07)  # a slow frame: ~4 frames missed
+        assert fc.dropped == 3
+        assert values[-1] == pytest.approx((1 / 60 + 0.07) / 0.1)
+        assert len(scheduler.pending) == 1
+
+    def test_frame_time_is_measured(self, clock):
+        fc, scheduler, t = clock
+
+        def slow(now):
+            t.now += 0.005  # 5 ms of work
+            return True
+
+        fc.add(slow)
+        scheduler.run_frames(4)
+        stats = fc.stats()
+        assert stats["frames"] == 4
+        assert stats["avg_ms"] == pytest.approx(5)
+        assert stats["max_ms"] == pytest.approx(5)
+        # The next tick waits only for the remainder of the frame
+        assert scheduler.pending[0][0] == int((1 / 60 - 0.005) * 1000)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,118 @@
+"""
+Unit tests for hot-path instrumentation.
+
+Tests for:
+- Spans and timed functions being no-ops while disabled
+- Recording counts, durations and failures per span
+- Recording from several threads
+- Enabling from the environment and appending the session summary
+"""
+
+import pytest
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add parent directory to path to import taxlib
+sys.path.insert(0, str(Path(__file__).parent.parent / "Tax calc"))
+
+from taxlib import instrument
+
+
+@pytest.fixture(autouse=True)
+def clean_registry():
+    instrument.registry.reset()
+    yield
+    instrument.enable(False)
+    instrument.registry.reset()
+
+
+class TestDisabled:
+    """Test that nothing is recorded by default."""
+
+    def test_span_is_shared_no_op(self):
+        instrument.enable(False)
+        assert instrument.span("a") is instrument.span("b")
+        with instrument.span("calculation"):
+            pass
+        assert instrument.registry.snapshot() == {}
+
+    def test_write_summary_skipped(self, tmp_path):
+        instrument.enable(False)
+        assert instrument.write_summary(str(tmp_path / "m.log")) is None
+        assert not (tmp_path / "m.log").exists()
+
+
+class TestRecording:
+    """Test span statistics."""
+
+    def test_span_records_duration(self):
+        instrument.enable()
+        for _ in range(3):
+            with instrument.span("calculation"):
+                time.sleep(0.002)
+        stats = instrument.registry.snapshot()["calculation"]
+        assert stats["count"] == 3
+        assert stats["min_ms"] >= 1.5
+        assert stats["min_ms"] <= stats["avg_ms"] <= stats["max_ms"]
+        assert stats["errors"] == 0
+
+    def test_failure_is_counted_and_propagates(self):
+        instrument.enable()
+        with pytest.raises(ValueError):
+            with instrument.span("db.save"):
+                raise ValueError("locked")
+        assert instrument.registry.snapshot()["db.save"]["errors"] == 1
+
+    def test_timed_decorator(self):
+        @instrument.timed("export.pdf")
+        def export(x):
+            return x * 2
+
+        assert export(2) == 4  # disabled: still works, nothing recorded
+        instrument.enable()
+        assert export(3) == 6
+        assert export.__name__ == "export"
+        assert instrument.registry.snapshot()["export.pdf"]["count"] == 1
+
+    def test_threads_record_safely(self):
+        instrument.enable()
+
+        def work():
+            for _ in range(500):
+                with instrument.span("worker"):
+                    pass
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert instrument.registry.snapshot()["worker"]["count"] == 2000
+
+
+class TestConfiguration:
+    """Test enabling and the session log."""
+
+    def test_env_var_enables(self, monkeypatch):
+        monkeypatch.setenv(instrument.ENV_VAR, "1")
+        assert instrument.configure() is True
+        assert instrument.is_enabled()
+
+    def test_summary_is_appended(self, tmp_path):
+        instrument.enable()
+        with instrument.span("details.render"):
+            pass
+        instrument.gauge("frames.dropped", 3)
+        path = str(tmp_path / "metrics.log")
+        assert instrument.write_summary(path) == path
+        assert instrument.write_summary(path) == path
+        text = (tmp_path / "metrics.log").read_text(encoding="utf-8")
+        assert text.count("TaxFlow session metrics") == 2
+        assert "details.render" in text
+        assert "frames.dropped" in text
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
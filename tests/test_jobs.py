@@ -0,0 +1,157 @@
+"""
+Unit tests for the background job manager.
+
+Tests for:
+- Running queued jobs serially on the worker thread
+- Progress and state updates delivered through the scheduler
+- UI-thread prepare steps
+- Cancelling running and queued jobs
+- Failure reporting
+"""
+
+import pytest
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add parent directory to path to import taxlib
+sys.path.insert(0, str(Path(__file__).parent.parent / "Tax calc"))
+
+from taxlib.jobs import JobManager, DONE, FAILED, CANCELLED, RUNNING
+
+
+class FakeScheduler:
+    """Stand-in for ``app.after`` that runs callbacks when pumped."""
+
+    def __init__(self):
+        self.callbacks = []
+        self.thread = threading.current_thread()
+
+    def __call__(self, ms, callback):
+        assert threading.current_thread() is self.thread, "scheduled from a worker thread"
+        self.callbacks.append(callback)
+
+    def pump(self, until, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while not until():
+            assert time.monotonic() < deadline, "timed out pumping scheduler"
+            callbacks, self.callbacks = self.callbacks, []
+            for cb in callbacks:
+                cb()
+            time.sleep(0.005)
+
+
+@pytest.fixture
+def scheduler():
+    return FakeScheduler()
+
+
+class TestJobManager:
+    """Test queuing, progress and completion."""
+
+    def test_jobs_run_serially_off_the_ui_thread(self, scheduler):
+        main = threading.current_thread()
+        order = []
+
+        def work(job):
+            assert threading.current_thread() is not main
+            order.append(job.label)
+            return job.label.upper()
+
+        manager = JobManager(scheduler)
+        jobs = [manager.submit(label, work) for label in ("a", "b", "c")]
+        scheduler.pump(lambda: all(j.state == DONE for j in jobs))
+        assert order == ["a", "b", "c"]
+        assert [j.result for j in jobs] == ["A", "B", "C"]
+        assert manager.jobs == []
+
+    def test_progress_and_callbacks_on_ui_thread(self, scheduler):
+        main = threading.current_thread()
+        updates = []
+        finished = []
+
+        def on_update(job):
+            assert threading.current_thread() is main
+            updates.append((job.state, job.progress))
+
+        def work(job):
+            for i in range(1, 4):
+                job.report(i, 3)
+
+        manager = JobManager(scheduler, on_update=on_update)
+        job = manager.submit("export", work, on_done=finished.append)
+        scheduler.pump(lambda: finished)
+        assert finished == [job]
+        assert updates[-1] == (DONE, 1.0)
+        assert (RUNNING, 0.0) in updates
+        assert any(p == pytest.approx(2 / 3) for _, p in updates)
+
+    def test_prepare_steps_run_on_ui_thread_before_work(self, scheduler):
+        main = threading.current_thread()
+        seen = []
+
+        def step(n):
+            assert threading.current_thread() is main
+            seen.append(n)
+
+        manager = JobManager(scheduler)
+        job = manager.submit("x", lambda job: list(seen),
+                             prepare=[lambda: step(1), lambda: step(2)])
+        scheduler.pump(lambda: job.state == DONE)
+        assert job.result == [1, 2]
+
+    def test_failure_is_reported(self, scheduler):
+        def work(job):
+            raise ValueError("disk full")
+
+        manager = JobManager(scheduler)
+        job = manager.submit("x", work)
+        scheduler.pump(lambda: job.state == FAILED)
+        assert isinstance(job.error, ValueError)
+
+
+class TestCancellation:
+    """Test cancelling running and queued jobs."""
+
+    def test_cancel_running_job(self, scheduler):
+        started = threading.Event()
+
+        def work(job):
+            started.set()
+            while True:
+                job.report(0)
+                time.sleep(0.01)
+
+        manager = JobManager(scheduler)
+        job = manager.submit("slow", work)
+        started.wait(2)
+        scheduler.pump(lambda: job.state == RUNNING)
+        manager.cancel()
+        scheduler.pump(lambda: job.state == CANCELLED)
+
+    def test_cancel_queued_job_never_runs(self, scheduler):
+        release = threading.Event()
+        ran = []
+
+        manager = JobManager(scheduler)
+        first = manager.submit("first", lambda job: release.wait(2))
+        second = manager.submit("second", lambda job: ran.append(True))
+        manager.cancel(second)
+        assert second.state == CANCELLED
+        release.set()
+        scheduler.pump(lambda: first.state == DONE)
+        time.sleep(0.05)
+        assert ran == []
+
+    def test_cancel_during_prepare(self, scheduler):
+        manager = JobManager(scheduler)
+        job = manager.submit("x", lambda job: "ran", prepare=[lambda: None, lambda: None])
+        manager.cancel(job)
+        scheduler.pump(lambda: not scheduler.callbacks)
+        assert job.state == CANCELLED
+        assert job.result is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
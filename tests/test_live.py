@@ -0,0 +1,138 @@
+"""
+Unit tests for debounced background recalculation.
+
+Tests for:
+- Debouncing bursts of requests into one computation
+- Computing off the UI thread and delivering on it
+- Dropping stale results
+- Error delivery and cancellation
+- Live recalculations not saving inputs to the database
+"""
+
+import pytest
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add parent directory to path to import taxlib
+sys.path.insert(0, str(Path(__file__).parent.parent / "Tax calc"))
+
+from taxlib import calculate_pan_results
+from taxlib.live import LiveCalculator
+
+
+class FakeScheduler:
+    """Stand-in for ``app.after`` that runs callbacks when pumped."""
+
+    def __init__(self):
+        self.callbacks = []
+        self.thread = threading.current_thread()
+
+    def __call__(self, ms, callback):
+        assert threading.current_thread() is self.thread, "scheduled from a worker thread"
+        self.callbacks.append(callback)
+
+    def pump(self, until, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while not until():
+            assert time.monotonic() < deadline, "timed out pumping scheduler"
+            callbacks, self.callbacks = self.callbacks, []
+            for cb in callbacks:
+                cb()
+            time.sleep(0.005)
+
+
+@pytest.fixture
+def scheduler():
+    return FakeScheduler()
+
+
+class TestLiveCalculator:
+    """Test debouncing and delivery."""
+
+    def test_burst_computes_only_the_last_request(self, scheduler):
+        main = threading.current_thread()
+        computed, results = [], []
+
+        def compute(income):
+            assert threading.current_thread() is not main
+            computed.append(income)
+            return calculate_pan_results("ABCPD1234F", income, 75_000, 0, 30)
+
+        live = LiveCalculator(scheduler, compute, results.append)
+        for income in (1, 12, 120, 1200, 1_200_000):
+            live.request(income)
+        scheduler.pump(lambda: results and not live.busy)
+        assert computed == [1_200_000]
+        assert [r["steps"]["gross"] for r in results] == [1_200_000]
+
+    def test_stale_result_is_dropped(self, scheduler):
+        release = threading.Event()
+        started = threading.Event()
+        results = []
+
+        def compute(value):
+            if value == "slow":
+                started.set()
+                release.wait(2)
+            return value
+
+        live = LiveCalculator(scheduler, compute, results.append)
+        live.request("slow")
+        scheduler.pump(lambda: started.is_set())
+        live.request("fresh")
+        release.set()
+        scheduler.pump(lambda: results and not live.busy)
+        assert results == ["fresh"]
+        assert live.dropped == 1
+
+    def test_error_reaches_on_error(self, scheduler):
+        errors = []
+
+        def compute():
+            raise ValueError("bad input")
+
+        live = LiveCalculator(scheduler, compute, lambda r: None, on_error=errors.append)
+        live.request()
+        scheduler.pump(lambda: errors)
+        assert isinstance(errors[0], ValueError)
+
+    def test_cancel_drops_pending_request(self, scheduler):
+        results = []
+        live = LiveCalculator(scheduler, lambda x: x, results.append)
+        live.request(1)
+        live.cancel()
+        scheduler.pump(lambda: not scheduler.callbacks and not live.busy)
+        assert results == []
+
+
+class TestGuiCompute:
+    """Test the GUI's worker-side calculation."""
+
+    def test_only_explicit_calculate_saves(self, monkeypatch):
+        pytest.importorskip("ttkbootstrap")
+        import tax_calculator
+
+        saved = []
+        monkeypatch.setattr(tax_calculator, "save_pan_data_db", lambda *args: saved.append(args))
+        inputs = ("ABCPD1234F", 1_200_000, 75_000, 5_000, 30, "Salaried")
+        live = tax_calculator._compute_results(*inputs)
+        assert saved == []
+        explicit = tax_calculator._compute_results(*inputs, True)
+        assert saved == [("ABCPD1234F", 1_200_000, 75_000, 5_000, 30)]
+        assert live["total_tax"] == explicit["total_tax"]
+
+    def test_income_range_is_the_lognormal_percentile_range(self):
+        pytest.importorskip("ttkbootstrap")
+        import tax_calculator
+
+        results = tax_calculator._compute_results("ABCPD1234F", 1_200_000, 75_000, 0, 30, "Self Employed")
+        income_range = results["income_range"]
+        assert income_range["sigma"] == 0.25
+        assert income_range["income_p5"] == pytest.approx(1_200_000 * 0.6628, rel=1e-3)
+        assert income_range["income_p95"] == pytest.approx(1_200_000 * 1.5086, rel=1e-3)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
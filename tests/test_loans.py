@@ -0,0 +1,137 @@
+"""
+Unit tests for loan amortization.
+
+Tests for:
+- EMI for single loans and arrays
+- Monthly schedules matching a month-by-month amortization
+- Interest and principal per financial year
+- EMI and deduction claims for the calculators
+- Loan interest in the GUI only counting where the regime allows it
+"""
+
+import numpy as np
+import pytest
+import sys
+from pathlib import Path
+
+# Add parent directory to path to import taxlib
+sys.path.insert(0, str(Path(__file__).parent.parent / "Tax calc"))
+
+from taxlib.deductions import CAP_24B
+from taxlib.loans import amortize, by_financial_year, emi, loan_inputs
+
+
+def _iterative(principal, annual_rate, months):
+    """Month-by-month schedule: (interest, principal, balance) lists."""
+    payment = emi(principal, annual_rate, months)
+    balance, rows = principal, []
+    for _ in range(months):
+        interest = balance * annual_rate / 12
+        balance -= payment - interest
+        rows.append((interest, payment - interest, balance))
+    return [list(column) for column in zip(*rows)]
+
+
+class TestEmi:
+    """Test the monthly instalment."""
+
+    def test_known_value(self):
+        assert emi(1_000_000, 0.10, 60) == pytest.approx(21_247.04, abs=0.01)
+
+    def test_zero_rate_and_zero_tenure(self):
+        assert emi(120_000, 0.0, 12) == 10_000
+        assert emi(120_000, 0.1, 0) == 0
+
+    def test_array_matches_scalar(self):
+        payments = emi([1_000_000, 500_000, 120_000], [0.10, 0.085, 0.0], [60, 240, 12])
+        for i, args in enumerate([(1_000_000, 0.10, 60), (500_000, 0.085, 240), (120_000, 0.0, 12)]):
+            assert payments[i] == pytest.approx(emi(*args))
+
+
+class TestSchedule:
+    """Test full monthly schedules."""
+
+    def test_matches_iterative_amortization(self):
+        schedule = amortize([5_000_000, 1_000_000], [0.085, 0.10], [240, 60])
+        for row, args in enumerate([(5_000_000, 0.085, 240), (1_000_000, 0.10, 60)]):
+            interest, principal, balance = _iterative(*args)
+            months = args[2]
+            np.testing.assert_allclose(schedule.interest[row, :months], interest, atol=1e-6)
+            np.testing.assert_allclose(schedule.principal[row, :months], principal, atol=1e-6)
+            np.testing.assert_allclose(schedule.balance[row, :months], balance, atol=1e-5)
+
+    def test_shorter_loans_are_padded_with_zeros(self):
+        schedule = amortize([5_000_000, 120_000], [0.085, 0.0], [240, 12])
+        assert schedule.interest.shape == (2, 240)
+        assert schedule.principal[1].sum() == pytest.approx(120_000)
+        assert not schedule.interest[1, 12:].any()
+        assert not schedule.balance[:, -1].any()
+
+
+class TestFinancialYears:
+    """Test the split per financial year."""
+
+    def test_year_totals_match_schedule(self):
+        schedule = amortize(5_000_000, 0.085, 240)
+        split = by_financial_year(5_000_000, 0.085, 240)
+        assert split.interest.shape == (1, 20)
+        yearly = schedule.interest[0].reshape(20, 12).sum(axis=1)
+        np.testing.assert_allclose(split.interest[0], yearly, rtol=1e-9)
+        assert split.principal.sum() == pytest.approx(5_000_000)
+
+    def test_start_mid_year(self):
+        # First EMI in October: 6 instalments fall in the first financial year
+        schedule = amortize(1_000_000, 0.10, 60)
+        split = by_financial_year(1_000_000, 0.10, 60, start_month=10)
+        assert split.interest.shape == (1, 6)
+        assert split.interest[0, 0] == pytest.approx(schedule.interest[0, :6].sum())
+        assert split.principal[0, -1] == pytest.approx(schedule.principal[0, -6:].sum())
+
+    def test_deductible_interest_is_capped(self):
+        split = by_financial_year(5_000_000, 0.085, 240)
+        assert split.deductible_interest[0, 0] == CAP_24B
+        assert (split.deductible_interest <= split.interest).all()
+
+
+class TestLoanInputs:
+    """Test EMI and claims for one loan."""
+
+    @pytest.mark.parametrize("start_month,year", [(4, 0), (10, 0), (1, 3)])
+    def test_matches_vectorized_split(self, start_month, year):
+        loan = loan_inputs(1_000_000, 0.10, 60, start_month, year)
+        split = by_financial_year(1_000_000, 0.10, 60, start_month)
+        assert loan["emi"] == pytest.approx(emi(1_000_000, 0.10, 60))
+        assert loan["claims"]["24b"] == pytest.approx(split.interest[0, year])
+        assert loan["claims"]["80C"] == pytest.approx(split.principal[0, year])
+
+    def test_after_repayment(self):
+        loan = loan_inputs(1_000_000, 0.10, 60, year=10)
+        assert loan["interest"] == loan["principal"] == 0
+
+
+class TestGuiLoan:
+    """Test the interest the calculator form adds to the deductions."""
+
+    def test_new_regime_calculation_ignores_loan_interest(self):
+        pytest.importorskip("ttkbootstrap")
+        import tax_calculator
+        from taxlib import calculate_pan_results
+
+        loan = loan_inputs(5_000_000, 0.085, 240)
+        assert tax_calculator.REGIME == "new"
+        interest = tax_calculator._deductible_interest(loan)
+        assert interest == 0
+        with_loan = calculate_pan_results("ABCPD1234F", 1_800_000, 75_000 + interest, loan["emi"], 35)
+        without = calculate_pan_results("ABCPD1234F", 1_800_000, 75_000, loan["emi"], 35)
+        assert with_loan["total_tax"] == without["total_tax"]
+
+    def test_old_regime_interest_is_capped(self):
+        pytest.importorskip("ttkbootstrap")
+        import tax_calculator
+
+        assert tax_calculator._deductible_interest(loan_inputs(5_000_000, 0.085, 240), "old") == CAP_24B
+        assert tax_calculator._deductible_interest({"interest": 80_000}, "old") == 80_000
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
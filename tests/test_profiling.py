@@ -0,0 +1,94 @@
+"""
+Unit tests for the opt-in profiling mode.
+
+Tests for:
+- Operations running unprofiled while disabled
+- Writing a .prof file and an allocation report per operation
+- Rotating old runs
+- Skipping nested operations
+- Enabling from the command line
+"""
+
+import pstats
+import pytest
+import sys
+import tracemalloc
+from pathlib import Path
+
+# Add parent directory to path to import taxlib
+sys.path.insert(0, str(Path(__file__).parent.parent / "Tax calc"))
+
+from taxlib import calculate_pan_results, profiling
+from taxlib.profiling import Profiler
+
+
+@pytest.fixture
+def profiler(tmp_path):
+    p = Profiler(directory=str(tmp_path / "diagnostics"), keep=2, top=10)
+    p.enabled = True
+    return p
+
+
+def work():
+    return [calculate_pan_results("ABCPD1234F", 1_000_000 + i, 75_000, 0, 30) for i in range(20)]
+
+
+class TestProfiler:
+    """Test profile output."""
+
+    def test_disabled_writes_nothing(self, tmp_path):
+        p = Profiler(directory=str(tmp_path / "diagnostics"))
+        with p.operation("calculate_tax"):
+            work()
+        assert p.files() == []
+        assert not (tmp_path / "diagnostics").exists()
+
+    def test_operation_writes_profile_and_report(self, profiler):
+        assert profiler.profiled("calculate_tax")(work)()
+        report, prof = profiler.files("calculate_tax")
+        assert prof.endswith(".prof") and report.endswith("-alloc.txt")
+        stats = pstats.Stats(prof)
+        assert any(func[2] == "calculate_pan_results" for func in stats.stats)
+        text = Path(report).read_text(encoding="utf-8")
+        assert "Peak traced memory" in text
+        assert "calculate_pan_results" in text
+        assert not tracemalloc.is_tracing()
+
+    def test_old_runs_are_rotated(self, profiler):
+        for _ in range(4):
+            with profiler.operation("open_dashboard"):
+                work()
+        with profiler.operation("export_pdf"):
+            pass
+        assert len(profiler.files("open_dashboard")) == 4  # 2 runs x 2 files
+        assert len(profiler.files("export_pdf")) == 2
+        assert profiler.runs == 5
+
+    def test_nested_operation_is_not_profiled(self, profiler):
+        with profiler.operation("open_dashboard"):
+            with profiler.operation("animate_current_tab"):
+                work()
+        assert profiler.files("animate_current_tab") == []
+        assert profiler.skipped == 1
+
+    def test_exception_still_writes_profile(self, profiler):
+        with pytest.raises(ZeroDivisionError):
+            with profiler.operation("calculate_tax"):
+                1 / 0
+        assert len(profiler.files("calculate_tax")) == 2
+
+
+class TestConfigure:
+    """Test switching profiling on."""
+
+    def test_flag_enables(self, monkeypatch):
+        monkeypatch.delenv(profiling.ENV_VAR, raising=False)
+        try:
+            assert profiling.configure(["--profile"]) is True
+            assert profiling.profiler.enabled
+        finally:
+            profiling.profiler.enabled = False
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
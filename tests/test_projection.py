@@ -0,0 +1,84 @@
+"""
+Unit tests for multi-year projections.
+
+Tests for:
+- Year-by-year tax matching the scalar calculators
+- Salary growth, deduction changes, loan payoff and inflation
+- Scenarios x years grids
+"""
+
+import numpy as np
+import pytest
+import sys
+from pathlib import Path
+
+# Add parent directory to path to import taxlib
+sys.path.insert(0, str(Path(__file__).parent.parent / "Tax calc"))
+
+from taxlib import calculate_pan_results
+from taxlib.projection import project, project_results
+
+
+class TestProject:
+    """Test a single scenario."""
+
+    def test_matches_calculator_every_year(self):
+        # Turns 60 in year 2: the Old Regime senior exemption applies from then
+        p = project(1_200_000, 75_000, 10_000, 58, years=5, salary_growth=0.07, deduction_growth=0.1,
+                    emi_years=3, regime="old")
+        for year in p.years:
+            r = calculate_pan_results("ABCPD1234F", p.income[year], p.deductions[year], p.emi[year],
+                                      58 + year, regime="old")
+            assert p.tax[year] == pytest.approx(r["total_tax"], abs=0.01)
+            assert p.take_home[year] == pytest.approx(r["take_home"], abs=0.01)
+
+    @pytest.mark.parametrize("pan", ["ABCCD1234F", "ABCFD1234F"])
+    def test_entities_match_calculator(self, pan):
+        # Income crosses the company-rate limit in year 2
+        entity = calculate_pan_results(pan, 0, 0, 0, 30)["entity"]
+        p = project(9_500_000, 200_000, 0, years=4, salary_growth=0.03, entity_type=entity)
+        for year in p.years:
+            r = calculate_pan_results(pan, p.income[year], p.deductions[year], 0, 30)
+            assert p.tax[year] == pytest.approx(r["total_tax"], abs=0.01)
+
+    def test_growth_payoff_and_inflation(self):
+        p = project(1_000_000, 100_000, 5_000, years=3, salary_growth=0.1, inflation=0.05,
+                    deduction_growth=-0.5, emi_years=1)
+        np.testing.assert_allclose(p.income, [1_000_000, 1_100_000, 1_210_000])
+        np.testing.assert_allclose(p.deductions, [100_000, 50_000, 25_000])
+        np.testing.assert_allclose(p.emi, [5_000, 0, 0])
+        np.testing.assert_allclose(p.real_take_home, p.take_home / 1.05 ** np.arange(3))
+
+    def test_project_results(self):
+        results = calculate_pan_results("ABCPD1234F", 1_500_000, 75_000, 20_000, 30)
+        p = project_results(results)
+        assert len(p.years) == 10
+        assert p.tax[0] == pytest.approx(results["total_tax"])
+        assert p.take_home[0] == pytest.approx(results["take_home"])
+
+    def test_project_results_keeps_the_regime(self):
+        results = calculate_pan_results("ABCPD1234F", 1_500_000, 75_000, 20_000, 30, regime="old")
+        p = project_results(results)
+        assert p.tax[0] == pytest.approx(results["total_tax"])
+
+
+class TestScenarios:
+    """Test many scenarios in one call."""
+
+    def test_grid_matches_single_scenarios(self):
+        incomes = [600_000, 1_500_000, 4_000_000]
+        growth = [0.0, 0.08, 0.15]
+        ages = [25, 59, 79]
+        grid = project(incomes, 50_000, 0, ages, years=6, salary_growth=growth, regime="old")
+        assert grid.tax.shape == (3, 6)
+        for i in range(3):
+            one = project(incomes[i], 50_000, 0, ages[i], years=6, salary_growth=growth[i], regime="old")
+            np.testing.assert_allclose(grid.tax[i], one.tax)
+            np.testing.assert_allclose(grid.take_home[i], one.take_home)
+
+    def test_scalar_scenario_has_no_scenario_axis(self):
+        assert project(1_000_000, years=4).tax.shape == (4,)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
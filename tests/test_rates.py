@@ -0,0 +1,184 @@
+"""
+Unit tests for precomputed rate tables.
+
+Tests for:
+- Tables matching the scalar calculators exactly
+- Marginal and effective rates
+- Breakpoints at slab edges, rebate points and cliffs
+- Vectorized lookups
+- Ends of zero-rate stretches
+- Solving for gross income from a target take-home or tax
+"""
+
+import random
+
+import pytest
+import sys
+from pathlib import Path
+
+# Add parent directory to path to import taxlib
+sys.path.insert(0, str(Path(__file__).parent.parent / "Tax calc"))
+
+from taxlib import calculate_corporate_tax, calculate_individual_tax, calculate_pan_results
+from taxlib import rates
+from taxlib.calculations import OLD_REBATE_LIMIT
+from taxlib.rates import gross_for_take_home, gross_for_tax, rate_table
+
+
+def _scalar(entity, income, deductions):
+    if entity == "Individual":
+        return calculate_individual_tax(income, deductions, 30)[0]
+    return calculate_corporate_tax(income, deductions, entity)[0]
+
+
+class TestRateTable:
+    """Test table lookups against the calculators."""
+
+    @pytest.mark.parametrize("entity", ["Individual", "Company", "Other"])
+    @pytest.mark.parametrize("deductions", [0, 75_000, 6_000_000])
+    def test_tax_matches_calculators(self, entity, deductions):
+        table = rate_table(entity, deductions)
+        rng = random.Random(7)
+        incomes = [rng.uniform(0, 9_000_000) for _ in range(500)]
+        incomes += [deductions, deductions + 700_000, 5_000_000, 5_000_001]
+        for income in incomes:
+            assert table.tax(income) == pytest.approx(_scalar(entity, income, deductions), abs=0.01)
+
+    def test_breakpoints_are_shifted_slab_edges(self):
+        table = rate_table("Individual", 75_000)
+        assert table.breakpoints[:3] == [0, 75_000, 575_000]
+        assert 775_000 in table.breakpoints  # end of the 0% slab
+
+    def test_marginal_rate_is_next_rupee(self):
+        table = rate_table("Individual")
+        assert table.marginal(700_000) == pytest.approx(0.052)
+        assert table.marginal(699_999) == 0
+        assert table.marginal(3_000_000) == pytest.approx(0.312)
+
+    def test_effective_rate(self):
+        table = rate_table("Individual")
+        assert table.effective(0) == 0
+        assert table.effective(1_500_000) == pytest.approx(table.tax(1_500_000) / 1_500_000)
+
+    def test_company_cliff(self):
+        table = rate_table("Company")
+        assert table.cliffs == [5_000_000]
+        assert table.tax(5_000_000) == pytest.approx(5_000_000 * 0.22 * 1.04)
+        assert table.tax(5_000_001) == pytest.approx(5_000_001 * 0.30 * 1.04)
+
+    def test_tables_are_cached(self):
+        assert rate_table("Individual", 50_000) is rate_table("Individual", 50_000)
+
+    def test_vectorized_matches_single_lookups(self):
+        table = rate_table("Company", 100_000)
+        incomes = [0, 50_000, 100_000, 4_999_999, 5_000_000, 5_000_001, 8_000_000]
+        assert list(table.taxes(incomes)) == [table.tax(x) for x in incomes]
+        assert list(table.marginals(incomes)) == [table.marginal(x) for x in incomes]
+        assert list(table.effectives(incomes)) == pytest.approx([table.effective(x) for x in incomes])
+
+    def test_unknown_schedule(self):
+        with pytest.raises(ValueError):
+            rate_table("Individual", regime="new", year="1999-00")
+
+
+class TestPlateau:
+    """Test the end of zero-rate stretches."""
+
+    def test_plateau_end(self):
+        table = rate_table("Individual", 0, "old")
+        assert table.plateau_end(100_000) == OLD_REBATE_LIMIT
+        assert table.plateau_end(OLD_REBATE_LIMIT) == OLD_REBATE_LIMIT
+        assert table.plateau_end(800_000) == 800_000
+
+    def test_vectorized_plateau_matches_single_lookups(self):
+        table = rate_table("Individual", 0, "new")
+        incomes = [0, 300_000, 700_000, 1_200_000, 5_000_000]
+        assert list(table.plateau_ends(incomes)) == [table.plateau_end(x) for x in incomes]
+
+
+class TestRebateBreakpoints:
+    """Test rebate handling on a schedule where the rebate matters."""
+
+    @pytest.fixture
+    def schedule(self, monkeypatch):
+        monkeypatch.setitem(rates.SCHEDULES, ("test", "rebate"), lambda age: {
+            "slabs": [(300_000, 0.0), (400_000, 0.05), (float('inf'), 0.20)],
+            "rebate_limit": 700_000,
+            "rebate_max": 12_500,
+        })
+        rates._rate_table.cache_clear()
+        yield lambda: rate_table("Individual", 0, "test", "rebate")
+        rates._rate_table.cache_clear()
+
+    def test_rebate_exhaustion_and_cliff(self, schedule):
+        table = schedule()
+        # Tax reaches the 12,500 rebate at 5.5L; the rebate stops after 7L
+        assert 550_000 in table.breakpoints
+        assert table.cliffs == [700_000]
+        assert table.tax(550_000) == 0
+        assert table.marginal(549_000) == 0
+        assert table.marginal(550_000) == pytest.approx(0.052)
+        assert table.tax(700_000) == pytest.approx(7_500 * 1.04)
+        assert table.tax(700_001) == pytest.approx((20_000 + 0.2) * 1.04)
+
+
+
+class TestInverse:
+    """Test the closed-form inverse against forward calculation."""
+
+    @pytest.mark.parametrize("pan", ["ABCPD1234F", "ABCCD1234F", "ABCFD1234F"])
+    def test_take_home_round_trip(self, pan):
+        rng = random.Random(11)
+        incomes = [rng.uniform(0, 9_000_000) for _ in range(300)] + [5_000_000, 5_000_001]
+        forward = [calculate_pan_results(pan, g, 75_000, 12_000, 30) for g in incomes]
+        entity = forward[0]["entity"]
+        solved = gross_for_take_home([r["take_home"] for r in forward], 75_000, 12_000, entity)
+        for income, result, gross in zip(incomes, forward, solved):
+            assert gross <= income + 0.01
+            again = calculate_pan_results(pan, gross, 75_000, 12_000, 30)
+            assert again["take_home"] == pytest.approx(result["take_home"], abs=0.01)
+
+    def test_tax_round_trip(self):
+        incomes = [i * 13_337.0 for i in range(500)]
+        taxes = [calculate_individual_tax(g, 50_000, 30)[0] for g in incomes]
+        for tax, gross in zip(taxes, gross_for_tax(taxes, 50_000)):
+            assert calculate_individual_tax(gross, 50_000, 30)[0] == pytest.approx(tax, abs=0.01)
+
+    def test_scalar_target_returns_float(self):
+        gross = gross_for_take_home(1_000_000, 75_000)
+        assert isinstance(gross, float)
+        assert calculate_pan_results("ABCPD1234F", gross, 75_000, 0, 30)["take_home"] == pytest.approx(1_000_000, abs=0.01)
+
+    def test_zero_tax_needs_no_income(self):
+        assert gross_for_tax(0) == 0
+        assert gross_for_take_home(-1_000) == 0
+
+    def test_take_home_just_below_company_cliff(self):
+        table = rate_table("Company")
+        at_cliff = 5_000_000 - table.tax(5_000_000)
+        # Take-home falls after the cliff; the lower income is the answer
+        assert table.income_for_take_home(at_cliff) == pytest.approx(5_000_000)
+
+    def test_tax_inside_cliff_gap_returns_cliff(self):
+        table = rate_table("Company")
+        gap = (table.tax(5_000_000) + table.tax(5_000_001)) / 2
+        assert table.income_for_tax(gap) == pytest.approx(5_000_000)
+
+    def test_rebate_cliff(self, monkeypatch):
+        monkeypatch.setitem(rates.SCHEDULES, ("test", "rebate"), lambda age: {
+            "slabs": [(300_000, 0.0), (400_000, 0.05), (float('inf'), 0.20)],
+            "rebate_limit": 700_000,
+            "rebate_max": 25_000,
+        })
+        rates._rate_table.cache_clear()
+        try:
+            table = rate_table("Individual", 0, "test", "rebate")
+            # No tax up to 7L, then 20,800 at once: 7L is the answer for 7L take-home
+            assert table.income_for_take_home(700_000) == pytest.approx(700_000)
+            assert table.income_for_take_home(700_001) > 700_000 + 20_800
+        finally:
+            rates._rate_table.cache_clear()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,98 @@
+"""
+Unit tests for the Monte Carlo income simulation.
+
+Tests for:
+- Seeded reproducibility, in-process and in a process pool
+- Percentiles of tax and take-home
+- Probability of reaching each slab
+- Parameter validation
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Add parent directory to path to import taxlib
+sys.path.insert(0, str(Path(__file__).parent.parent / "Tax calc"))
+
+pytest.importorskip("numpy")
+
+from taxlib import calculate_pan_results
+from taxlib.simulation import simulate
+
+LOGNORMAL = {"median": 1_200_000, "sigma": 0.3}
+
+
+class TestReproducibility:
+    """Test seeding."""
+
+    def test_same_seed_same_result(self):
+        assert simulate("lognormal", LOGNORMAL, 20_000, seed=7) == simulate("lognormal", LOGNORMAL, 20_000, seed=7)
+
+    def test_different_seeds_differ(self):
+        assert simulate("lognormal", LOGNORMAL, 20_000, seed=1).tax != simulate("lognormal", LOGNORMAL, 20_000,
+                                                                                seed=2).tax
+
+    def test_unseeded_run_can_be_replayed(self):
+        first = simulate("lognormal", LOGNORMAL, 5_000)
+        assert simulate("lognormal", LOGNORMAL, 5_000, seed=first.seed) == first
+
+    def test_process_pool_matches_in_process(self):
+        local = simulate("lognormal", LOGNORMAL, 30_000, seed=3, chunk=10_000)
+        pooled = simulate("lognormal", LOGNORMAL, 30_000, seed=3, chunk=10_000, workers=2)
+        assert pooled == local
+
+
+class TestSummary:
+    """Test the reported statistics."""
+
+    def test_fixed_income_matches_calculator(self):
+        sim = simulate("uniform", {"low": 1_500_000, "high": 1_500_000}, 1_000, 75_000, 10_000, seed=0)
+        r = calculate_pan_results("ABCPD1234F", 1_500_000, 75_000, 10_000, 30)
+        assert set(sim.tax.values()) == {r["total_tax"]}
+        assert sim.take_home[50] == pytest.approx(r["take_home"])
+        assert sim.mean_tax == r["total_tax"]
+
+    def test_percentiles_are_ordered(self):
+        sim = simulate("lognormal", LOGNORMAL, 50_000, seed=0)
+        taxes = [sim.tax[p] for p in (5, 25, 50, 75, 95)]
+        assert taxes == sorted(taxes)
+        assert sim.take_home[5] < sim.take_home[95]
+
+    def test_slab_probabilities(self):
+        # Uniform 0-20L with 2L deductions: taxable income passes 7L with probability 11/20
+        sim = simulate("uniform", {"low": 0, "high": 2_000_000}, 200_000, 200_000, seed=0)
+        chances = list(sim.slab_probability.values())
+        assert chances[0] == pytest.approx(0.9, abs=0.01)
+        assert chances[1] == pytest.approx(0.55, abs=0.01)
+        assert chances == sorted(chances, reverse=True)
+
+    def test_normal_draws_never_go_negative(self):
+        sim = simulate("normal", {"mean": 100_000, "std": 200_000}, 10_000, seed=0)
+        assert sim.tax[5] == 0
+        assert sim.take_home[5] == 0
+
+    def test_company_rate_probability(self):
+        sim = simulate("triangular", {"low": 0, "mode": 1_000_000, "high": 2_000_000}, 1_000,
+                       entity_type="Company", seed=0)
+        assert list(sim.slab_probability) == ["30% rate"]
+
+
+class TestValidation:
+    """Test invalid arguments."""
+
+    def test_unknown_distribution(self):
+        with pytest.raises(ValueError):
+            simulate("pareto", {"alpha": 2})
+
+    def test_missing_parameter(self):
+        with pytest.raises(ValueError):
+            simulate("lognormal", {"median": 1_000_000})
+
+    def test_no_samples(self):
+        with pytest.raises(ValueError):
+            simulate("lognormal", LOGNORMAL, 0)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,86 @@
+"""
+Unit tests for startup timing and lazy GUI imports.
+
+Tests for:
+- Recording import and phase timings
+- Report output
+- Importing the GUI module without loading charting/export dependencies
+- Lazily imported modules being bundled by the PyInstaller spec
+"""
+
+import pytest
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+# Add parent directory to path to import taxlib
+PACKAGE_PATH = Path(__file__).parent.parent / "Tax calc"
+sys.path.insert(0, str(PACKAGE_PATH))
+
+from taxlib.startup import StartupTimer
+
+
+class TestStartupTimer:
+    """Test timing collection and reporting."""
+
+    def test_phase_and_import_are_recorded(self):
+        timer = StartupTimer()
+        with timer.phase("build"):
+            pass
+        module = timer.import_module("json")
+        timer.mark("shown")
+        assert module.__name__ == "json"
+        assert [(k, n) for k, n, _ in timer.entries] == [("phase", "build"), ("import", "json"), ("mark", "shown")]
+        assert all(seconds >= 0 for _, _, seconds in timer.entries)
+
+    def test_report_lists_every_entry(self):
+        timer = StartupTimer()
+        timer.import_module("json")
+        with timer.phase("create_app"):
+            pass
+        report = timer.report()
+        assert "Imports:" in report and "json" in report
+        assert "Phases:" in report and "create_app" in report
+
+    def test_emit_only_when_enabled(self, capsys):
+        timer = StartupTimer()
+        timer.enabled = False
+        timer.emit()
+        assert capsys.readouterr().out == ""
+        timer.enabled = True
+        timer.emit()
+        assert "TaxFlow startup timing" in capsys.readouterr().out
+
+    def test_environment_variable_enables_report(self, monkeypatch):
+        monkeypatch.setenv("TAXFLOW_STARTUP_TIMING", "1")
+        assert StartupTimer().enabled
+
+
+class TestLazyImports:
+    """Test that the GUI module defers heavy imports."""
+
+    def test_gui_import_skips_charting_and_export(self):
+        pytest.importorskip("ttkbootstrap")
+        code = ("import sys, tax_calculator; "
+                "print(sorted(m for m in ('numpy', 'matplotlib', 'reportlab', 'openpyxl') if m in sys.modules))")
+        out = subprocess.run([sys.executable, "-c", code], cwd=PACKAGE_PATH,
+                             capture_output=True, text=True, timeout=60)
+        assert out.returncode == 0, out.stderr
+        assert out.stdout.strip() == "[]"
+
+    def test_lazy_imports_are_bundled(self):
+        # Modules imported by name are invisible to PyInstaller's analysis
+        gui = (PACKAGE_PATH / "tax_calculator.py").read_text(encoding="utf-8")
+        spec = (PACKAGE_PATH.parent / "build.spec").read_text(encoding="utf-8")
+        lazy = re.findall(r'import_module\("([\w.]+)"\)', gui)
+        assert lazy
+        for name in lazy:
+            package = name.split(".")[0]
+            assert f"'{name}'" in spec or f"collect_submodules('{package}')" in spec, name
+        for library in ("reportlab", "openpyxl"):
+            assert f"collect_submodules('{library}')" in spec
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])